@@ -1,38 +1,646 @@
-import requests
-import zipfile
-import io
+#!/usr/bin/env python3
+"""
+Remote ZIP Structure Lister
+Lists the contents of a remote ZIP archive without downloading it, using HTTP
+range requests for the End of Central Directory record and the central directory.
+"""
+
+import base64
+import functools
+import hashlib
+import json
+import os
+import re
+import struct
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-def list_zip_contents(url):
-    print(f"Downloading header from {url}...")
-    try:
-        r = requests.get(url, stream=True)
-        r.raise_for_status()
-        
-        # We need to download the whole file to read the central directory at the end
-        # unless we do range requests, but the file is 300MB.
-        # Let's try range request for the end of file?
-        # But we don't know the size easily without HEAD.
-        
-        # Actually, for 300MB, maybe it's better to just download it if the environment allows?
-        # Or I can try to find a smaller file or just search online.
-        # But wait, I can use range request if the server supports it.
-        
-        # Let's just try to download the first 1KB and see if it is a zip.
-        # But zip directory is at the end.
-        
-        # Let's check if we can list files without downloading everything.
-        # Since I can't easily do partial download logic here without complex code,
-        # I'll try to find a text file in the release that lists content, or guess.
-        
-        # Wait, the user said "Downloading new version".
-        # The URL is likely: https://github.com/Alex313031/Thorium-Win/releases/download/M138.0.7204.300/Thorium_AVX2_138.0.7204.300.zip
-        
-        pass
+# Optional compact listing cache; without these the central directory is re-parsed on 304
+try:
+    import msgpack  # type: ignore
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover - optional dependencies
+    msgpack = None
+    zstandard = None
+
+if TYPE_CHECKING:  # requests is imported lazily; listings served from the Scoop cache never load it
+    import ssl
+
+    import requests
+
+DEFAULT_TIMEOUT = 30  # seconds
+MAX_WORKERS = 8  # concurrent archives when listing several URLs
+OUTPUT_CHUNK_SIZE = 64 * 1024  # listing output is flushed to stdout in chunks of this size
+
+# End of Central Directory record: fixed 22 bytes followed by an optional comment
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+MAX_COMMENT_SIZE = 0xFFFF
+TAIL_SIZE = EOCD_STRUCT.size + MAX_COMMENT_SIZE  # 65557 bytes always contain the EOCD
+
+# Zip64 end of central directory record and its locator, which sits just before the EOCD
+ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP64_EXTRA_ID = 0x0001
+ZIP64_MARKER = 0xFFFFFFFF
+
+# Central directory file header: fixed 46 bytes, then name, extra field and comment
+CD_SIGNATURE = 0x02014B50
+CD_STRUCT = struct.Struct("<IHHHHHHIIIHHHHHII")
+# Only the fields the walker needs: signature, flags, uncompressed size, name/extra/comment lengths
+CD_FIELDS_STRUCT = struct.Struct("<I4xH14xI3H")
+UTF8_FLAG = 0x800
+
+# Per-URL cache of central directory bytes, revalidated with If-None-Match
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "scoop-alts" / "zipmeta"
+
+# Scoop's download cache: $SCOOP_CACHE, else $SCOOP\cache, else ~/scoop/cache
+SCOOP_CACHE_DIR = Path(
+    os.environ.get("SCOOP_CACHE") or Path(os.environ.get("SCOOP") or Path.home() / "scoop") / "cache"
+)
+
+
+# AEAD suites only: AES-GCM runs on AES-NI/PCLMULQDQ in OpenSSL, ChaCha20 covers CPUs without them
+TLS_CIPHERS = "ECDHE+AESGCM:ECDHE+CHACHA20"
+
+
+def _tls_context() -> "ssl.SSLContext":
+    """TLS context for range reads: TLS 1.2+ with hardware-friendly AEAD ciphers."""
+    import ssl
+
+    context = ssl.create_default_context()
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.set_ciphers(TLS_CIPHERS)  # TLS 1.3 suites are AEAD already and keep OpenSSL's order
+    return context
+
+
+def _make_session() -> "requests.Session":
+    """Create a keep-alive session so the probe and range reads reuse pooled TLS connections."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    class TLSAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+            kwargs["ssl_context"] = _tls_context()
+            super().init_poolmanager(*args, **kwargs)
+
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset(["HEAD", "GET"]),
+    )
+    adapter = TLSAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> "requests.Session":
+    """Return the shared session, creating it (and importing requests) on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _make_session()
+    return _session
+
+
+class RangeNotSupportedError(RuntimeError):
+    """Raised when a server answers a Range request with the full body."""
+
+
+def _require_partial(response: Any, url: str, max_full_body: int = 0) -> None:
+    """Refuse to read a full-body response to a Range request.
+
+    The body is never touched, so a server without range support costs only
+    its response headers instead of a multi-hundred-MB download. A full body
+    whose Content-Length is at most max_full_body is let through.
+    """
+    if response.status_code == 200:
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) <= max_full_body:
+            return
+        response.close()
+        raise RangeNotSupportedError(f"{url} does not support range requests; refusing full download")
+
+
+def fetch_range(url: str, start: int, end: int) -> bytes:
+    """Fetch the inclusive byte range [start, end] of a remote file."""
+    response = get_session().get(url, headers={"Range": f"bytes={start}-{end}"}, stream=True, timeout=DEFAULT_TIMEOUT)
+    try:
+        response.raise_for_status()
+        _require_partial(response, url)
+        return response.content
+    finally:
+        response.close()
+
+
+def _parse_content_range(content_range: str) -> Tuple[int, int, int]:
+    """Parse 'bytes start-end/total' into (start, end, total)."""
+    span, _, total = content_range.split()[1].partition("/")
+    start, _, end = span.partition("-")
+    if not total or total == "*":
+        raise ValueError(f"Unknown total size in Content-Range: {content_range}")
+    return int(start), int(end), int(total)
+
+
+def parse_byteranges(body: bytes, content_type: str) -> List[Tuple[int, int, bytes]]:
+    """Split a multipart/byteranges body into (start, total_size, data) parts."""
+    boundary = content_type.split("boundary=", 1)[1].split(";", 1)[0].strip().strip('"')
+    delimiter = b"--" + boundary.encode("ascii")
+    parts: List[Tuple[int, int, bytes]] = []
+    pos = body.find(delimiter)
+    while pos != -1 and not body.startswith(b"--", pos + len(delimiter)):
+        header_end = body.find(b"\r\n\r\n", pos)
+        if header_end == -1:
+            break
+        content_range = ""
+        for line in body[pos + len(delimiter):header_end].decode("latin-1").split("\r\n"):
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-range":
+                content_range = value.strip()
+        start, end, total = _parse_content_range(content_range)
+        data_start = header_end + 4
+        parts.append((start, total, body[data_start:data_start + end - start + 1]))
+        # Part lengths come from Content-Range, so binary data is never scanned for the boundary
+        pos = body.find(delimiter, data_start + end - start + 1)
+    return parts
+
+
+def fetch_tail(
+    url: str, etag: Optional[str] = None, extra_range: Optional[Tuple[int, int]] = None
+) -> Optional[Tuple[List[Tuple[int, int, bytes]], Optional[str]]]:
+    """Fetch the archive tail with a suffix range, conditional on etag.
+
+    The tail request doubles as the size probe (via Content-Range) and as the
+    cache revalidation. extra_range is requested in the same GET when given.
+    Returns None on 304, else ((start, total_size, data) parts, etag).
+    """
+    spec = f"-{TAIL_SIZE}" if extra_range is None else f"{extra_range[0]}-{extra_range[1]},-{TAIL_SIZE}"
+    headers = {"Range": f"bytes={spec}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    response = get_session().get(url, headers=headers, stream=True, timeout=DEFAULT_TIMEOUT)
+    try:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        if response.status_code == 200 and extra_range is not None:
+            # Some servers ignore multi-range requests entirely; retry with the tail alone
+            response.close()
+            return fetch_tail(url, etag)
+        # An archive smaller than the tail may come back whole; that body is the tail
+        _require_partial(response, url, max_full_body=TAIL_SIZE)
+        content_type = response.headers.get("Content-Type", "")
+        if response.status_code == 200:
+            parts = [(0, len(response.content), response.content)]
+        elif content_type.startswith("multipart/byteranges"):
+            parts = parse_byteranges(response.content, content_type)
+        else:
+            start, _, total = _parse_content_range(response.headers.get("Content-Range", ""))
+            parts = [(start, total, response.content)]
+        return parts, response.headers.get("ETag")
+    finally:
+        response.close()
+
+
+def find_eocd(tail: bytes, end: Optional[int] = None) -> Tuple[int, int, int]:
+    """Locate the EOCD record in the archive tail.
+
+    Only tail[:end] is searched when end is given, so reused buffers need no copy.
+    Returns (eocd_index, cd_offset, cd_size) where eocd_index is relative to tail
+    and points at the zip64 EOCD record for zip64 archives.
+    """
+    end = len(tail) if end is None else end
+    # bytes.rfind is CPython's vectorised fastsearch; a candidate only counts when its
+    # comment length reaches exactly to the end, so signatures inside comments are skipped
+    search_end = end
+    while True:
+        eocd_index = tail.rfind(EOCD_SIGNATURE, 0, search_end)
+        if eocd_index == -1:
+            raise ValueError("End of Central Directory record not found")
+        if end - eocd_index >= EOCD_STRUCT.size:
+            _, _, _, _, _, cd_size, cd_offset, comment_len = EOCD_STRUCT.unpack_from(tail, eocd_index)
+            if eocd_index + EOCD_STRUCT.size + comment_len == end:
+                locator_index = eocd_index - ZIP64_LOCATOR_STRUCT.size
+                if locator_index >= 0 and tail[locator_index:eocd_index].startswith(ZIP64_LOCATOR_SIGNATURE):
+                    return _find_zip64_eocd(tail, locator_index)
+                return eocd_index, cd_offset, cd_size
+        search_end = eocd_index + len(EOCD_SIGNATURE) - 1
+
+
+def _find_zip64_eocd(tail: bytes, locator_index: int) -> Tuple[int, int, int]:
+    """Read cd_offset/cd_size from the zip64 EOCD record preceding the locator."""
+    record_index = locator_index - ZIP64_EOCD_STRUCT.size
+    if record_index < 0 or tail[record_index:record_index + 4] != ZIP64_EOCD_SIGNATURE:
+        raise ValueError("Zip64 end of central directory record not found next to its locator")
+    fields = ZIP64_EOCD_STRUCT.unpack_from(tail, record_index)
+    cd_size, cd_offset = fields[8], fields[9]
+    return record_index, cd_offset, cd_size
+
+
+def _cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def load_cached_meta(url: str) -> Optional[Dict[str, Any]]:
+    """Return cached archive metadata for url if present and readable."""
+    try:
+        return json.loads(_cache_path(url).read_text("utf-8"))
+    except Exception:
+        return None
+
+
+def save_cached_meta(url: str, etag: str, size: int, cd_offset: int, cd_bytes: bytes, eocd_bytes: bytes) -> None:
+    """Persist archive metadata atomically; failures only cost a future refetch."""
+    meta = {
+        "etag": etag,
+        "size": size,
+        "cd_offset": cd_offset,
+        "cd_size": len(cd_bytes),
+        "cd_bytes_b64": base64.b64encode(cd_bytes).decode("ascii"),
+        "eocd_bytes_b64": base64.b64encode(eocd_bytes).decode("ascii"),
+    }
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_name, _cache_path(url))
+    except Exception as e:
+        print(f"⚠️  Could not write zip metadata cache: {e}", file=sys.stderr)
+
+
+def _listing_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.listing.zst"
+
+
+def load_cached_listing(url: str, etag: str) -> Optional[List[Tuple[str, int]]]:
+    """Return the cached parsed listing for url if it was stored for etag."""
+    if msgpack is None or zstandard is None:
+        return None
+    try:
+        with open(_listing_path(url), "rb") as f:
+            payload = msgpack.unpackb(zstandard.ZstdDecompressor().decompress(f.read()), use_list=False)
+    except Exception:
+        return None
+    if payload.get("etag") != etag:
+        return None
+    return list(payload["entries"])
+
+
+def save_cached_listing(url: str, etag: str, entries: List[Tuple[str, int]]) -> None:
+    """Persist the parsed listing as zstd-compressed MessagePack, if available."""
+    if msgpack is None or zstandard is None:
+        return
+    try:
+        data = zstandard.ZstdCompressor(level=3).compress(msgpack.packb({"etag": etag, "entries": entries}))
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, _listing_path(url))
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"⚠️  Could not write zip listing cache: {e}", file=sys.stderr)
+
+
+def _read_central_directory(url: str) -> Tuple[bytes, bytes, Optional[str], bool]:
+    """Return (cd_bytes, eocd_bytes, etag, from_cache) for a remote archive."""
+    cached = load_cached_meta(url)
+    etag = cached.get("etag") if cached else None
+
+    # A re-uploaded asset usually keeps its layout, so the previously seen central
+    # directory prefix rides along with the tail request
+    extra_range = None
+    if etag:
+        cached_tail_start = max(0, cached["size"] - TAIL_SIZE)
+        if 0 < cached["cd_size"] and cached["cd_offset"] < cached_tail_start:
+            extra_range = (cached["cd_offset"], min(cached["cd_offset"] + cached["cd_size"], cached_tail_start) - 1)
+
+    result = fetch_tail(url, etag, extra_range)
+    if result is None:
+        cd_bytes = base64.b64decode(cached["cd_bytes_b64"])
+        return cd_bytes, base64.b64decode(cached["eocd_bytes_b64"]), etag, True
+    parts, etag = result
+
+    size = parts[0][1]
+    tail_start, _, tail = next(part for part in parts if part[0] + len(part[2]) == size)
+    eocd_index, cd_offset, cd_size = find_eocd(tail)
+
+    # Small archives: the central directory is already inside the fetched tail
+    cd_end = cd_offset + cd_size
+    if cd_offset >= tail_start:
+        cd_start = cd_offset - tail_start
+        cd_bytes = tail[cd_start:cd_start + cd_size]
+    else:
+        # Only the part of the central directory before the tail still needs fetching
+        head_len = min(cd_end, tail_start) - cd_offset
+        cd_head = next(
+            (data[cd_offset - start:cd_offset - start + head_len] for start, _, data in parts
+             if start <= cd_offset and start + len(data) >= cd_offset + head_len),
+            None,
+        )
+        if cd_head is None:
+            cd_head = fetch_range(url, cd_offset, cd_offset + head_len - 1)
+        cd_bytes = cd_head + tail[:max(0, cd_end - tail_start)]
+
+    eocd_bytes = tail[eocd_index:]
+    if etag:
+        save_cached_meta(url, etag, size, cd_offset, cd_bytes, eocd_bytes)
+    return cd_bytes, eocd_bytes, etag, False
+
+
+def _cache_suffixes(url: str) -> Tuple[str, ...]:
+    """File name suffixes Scoop uses for a cached download of url.
+
+    Older Scoop sanitizes the whole URL; newer releases use a short SHA-256 of it
+    plus the original extension.
+    """
+    sanitized = re.sub(r"[^\w\.\-]+", "_", url)
+    ext = os.path.splitext(url.split("?", 1)[0].split("#", 1)[0])[1]
+    short_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()[:7]
+    return f"#{sanitized}", f"#{short_hash}{ext}"
+
+
+@functools.lru_cache(maxsize=None)
+def _scoop_cache_index(cache_dir: str) -> Dict[str, str]:
+    """Map '#<url-suffix>' to file path for every cached download, in one scandir pass."""
+    index: Dict[str, str] = {}
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if "#" in entry.name and entry.is_file():
+                    index["#" + entry.name.rsplit("#", 1)[1]] = entry.path
+    except OSError:
+        pass
+    return index
+
+
+def find_cached_download(url: str) -> Optional[Path]:
+    """Return the local Scoop cache file for url, if one exists."""
+    index = _scoop_cache_index(str(SCOOP_CACHE_DIR))
+    for suffix in _cache_suffixes(url):
+        path = index.get(suffix)
+        if path is not None:
+            return Path(path)
+    return None
+
+
+def _pread(fd: int, length: int, offset: int) -> bytes:
+    """Positional read; falls back to seek+read where os.pread is missing (Windows)."""
+    if hasattr(os, "pread"):
+        return os.pread(fd, length, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, length)
+
+
+# One tail buffer per thread, reused for every local archive instead of a fresh 64 KiB allocation
+_buffers = threading.local()
+
+
+def _tail_buffer() -> bytearray:
+    buf = getattr(_buffers, "tail", None)
+    if buf is None:
+        buf = _buffers.tail = bytearray(TAIL_SIZE)
+    return buf
+
+
+def _pread_into(fd: int, buf: bytearray, length: int, offset: int) -> int:
+    """Fill buf[:length] from offset without allocating; returns bytes read."""
+    view = memoryview(buf)[:length]
+    if hasattr(os, "preadv"):
+        return os.preadv(fd, [view], offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    with os.fdopen(fd, "rb", buffering=0, closefd=False) as f:
+        filled = 0
+        while filled < length:
+            n = f.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        return filled
+
+
+def read_local_central_directory(path: Path) -> Tuple[bytes, bytes]:
+    """Return (cd_bytes, eocd_bytes) from a local archive with at most two reads."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        tail_start = max(0, size - TAIL_SIZE)
+        tail = _tail_buffer()
+        tail_len = _pread_into(fd, tail, size - tail_start, tail_start)
+        eocd_index, cd_offset, cd_size = find_eocd(tail, tail_len)
+        if cd_offset >= tail_start:
+            cd_start = cd_offset - tail_start
+            cd_bytes = bytes(tail[cd_start:cd_start + cd_size])
+        else:
+            cd_bytes = _pread(fd, cd_size, cd_offset)
+        return cd_bytes, bytes(tail[eocd_index:tail_len])
+    finally:
+        os.close(fd)
+
+
+def entry_count(eocd_bytes: bytes) -> int:
+    """Total number of central directory records declared by the end records."""
+    if eocd_bytes.startswith(ZIP64_EOCD_SIGNATURE):
+        return ZIP64_EOCD_STRUCT.unpack_from(eocd_bytes)[7]
+    return EOCD_STRUCT.unpack_from(eocd_bytes)[4]
+
+
+def iter_central_directory(
+    cd_bytes: bytes, zip64: bool = False, count: Optional[int] = None
+) -> Iterator[Tuple[str, int]]:
+    """Yield (name, uncompressed_size) for each central directory record.
+
+    Archives without a zip64 locator (every typical release asset) take the
+    walker that only inspects extra fields of records whose size reads 0xFFFFFFFF.
+    When count is given (from the EOCD), exactly that many records are read and
+    a short directory is an error.
+    """
+    if zip64:
+        return _iter_central_directory_zip64(cd_bytes, count)
+    return _iter_central_directory(cd_bytes, count)
+
+
+def _iter_central_directory(cd_bytes: bytes, count: Optional[int]) -> Iterator[Tuple[str, int]]:
+    unpack_from = CD_FIELDS_STRUCT.unpack_from
+    header_size = CD_STRUCT.size
+    last_header = len(cd_bytes) - header_size
+    offset = 0
+    for _ in range(len(cd_bytes) // header_size if count is None else count):
+        if offset > last_header:
+            if count is None:
+                break
+            raise ValueError(f"Central directory truncated at offset {offset}")
+        signature, flags, file_size, name_len, extra_len, comment_len = unpack_from(cd_bytes, offset)
+        if signature != CD_SIGNATURE:
+            raise ValueError(f"Bad central directory record at offset {offset}")
+        name_start = offset + header_size
+        offset = name_start + name_len
+        if file_size == ZIP64_MARKER:
+            # zip64 entry without zip64 end records; rare enough to leave the fast path
+            file_size = _zip64_extra_size(cd_bytes, offset, extra_len)
+        # Same decoding rule as zipfile: UTF-8 when flagged, cp437 otherwise
+        yield cd_bytes[name_start:offset].decode("utf-8" if flags & UTF8_FLAG else "cp437", "replace"), file_size
+        offset += extra_len + comment_len
+
+
+def _zip64_extra_size(cd_bytes: bytes, extra_start: int, extra_len: int) -> int:
+    """Uncompressed size from a record's zip64 extra block, where it is the first field."""
+    pos, extra_end = extra_start, extra_start + extra_len
+    while pos + 4 <= extra_end:
+        extra_id, size = struct.unpack_from("<HH", cd_bytes, pos)
+        if extra_id == ZIP64_EXTRA_ID and size >= 8:
+            return struct.unpack_from("<Q", cd_bytes, pos + 4)[0]
+        pos += 4 + size
+    raise ValueError(f"zip64 size marker without a zip64 extra field at offset {extra_start}")
+
+
+def _iter_central_directory_zip64(cd_bytes: bytes, count: Optional[int]) -> Iterator[Tuple[str, int]]:
+    unpack_from = CD_FIELDS_STRUCT.unpack_from
+    header_size = CD_STRUCT.size
+    last_header = len(cd_bytes) - header_size
+    offset = 0
+    for _ in range(len(cd_bytes) // header_size if count is None else count):
+        if offset > last_header:
+            if count is None:
+                break
+            raise ValueError(f"Central directory truncated at offset {offset}")
+        signature, flags, file_size, name_len, extra_len, comment_len = unpack_from(cd_bytes, offset)
+        if signature != CD_SIGNATURE:
+            raise ValueError(f"Bad central directory record at offset {offset}")
+        name_start = offset + header_size
+        extra_start = name_start + name_len
+        if file_size == ZIP64_MARKER:
+            file_size = _zip64_extra_size(cd_bytes, extra_start, extra_len)
+        yield cd_bytes[name_start:extra_start].decode("utf-8" if flags & UTF8_FLAG else "cp437", "replace"), file_size
+        offset = extra_start + extra_len + comment_len
+
+
+def iter_zip_contents(url: str) -> Iterator[Tuple[str, int]]:
+    """Yield (name, uncompressed_size) for every member of a remote ZIP archive.
+
+    Entries are produced while the central directory is walked, so callers that
+    stream them never hold the whole listing in memory.
+    """
+    local_path = find_cached_download(url)
+    if local_path is not None:
+        print(f"📁 Reading central directory from Scoop cache {local_path}...", file=sys.stderr)
+        cd_bytes, eocd_bytes = read_local_central_directory(local_path)
+        zip64 = eocd_bytes.startswith(ZIP64_EOCD_SIGNATURE)
+        yield from iter_central_directory(cd_bytes, zip64, entry_count(eocd_bytes))
+        return
+
+    print(f"🔍 Reading central directory from {url}...", file=sys.stderr)
+    cd_bytes, eocd_bytes, etag, from_cache = _read_central_directory(url)
+    zip64 = eocd_bytes.startswith(ZIP64_EOCD_SIGNATURE)
+    if etag and from_cache:
+        entries = load_cached_listing(url, etag)
+        if entries is not None:
+            yield from entries
+            return
+    if not etag or msgpack is None or zstandard is None:
+        yield from iter_central_directory(cd_bytes, zip64, entry_count(eocd_bytes))
+        return
+    # The listing cache needs every entry, so collect while streaming
+    collected: List[Tuple[str, int]] = []
+    for entry in iter_central_directory(cd_bytes, zip64, entry_count(eocd_bytes)):
+        collected.append(entry)
+        yield entry
+    save_cached_listing(url, etag, collected)
+
+
+def list_zip_contents(url: str) -> List[Tuple[str, int]]:
+    """Return (name, uncompressed_size) for every member of a remote ZIP archive."""
+    return list(iter_zip_contents(url))
+
+
+def list_many(urls: List[str], max_workers: int = MAX_WORKERS) -> List[Tuple[str, Any]]:
+    """List several remote archives concurrently over the shared session.
+
+    Returns (url, entries) pairs in input order; entries is the raised exception
+    for archives that could not be read.
+    """
+    def _safe_list(url: str) -> Any:
+        try:
+            return list_zip_contents(url)
+        except Exception as e:
+            return e
+
+    if len(urls) <= 1:
+        return [(url, _safe_list(url)) for url in urls]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(zip(urls, executor.map(_safe_list, urls)))
+
+
+def write_listing(entries: Iterable[Tuple[str, int]]) -> None:
+    """Write 'size<TAB>name' lines to stdout, batched into os.write calls.
+
+    Bypasses per-line print() overhead for archives with many thousands of entries.
+    """
+    sys.stdout.flush()
+    encoding = sys.stdout.encoding or "utf-8"
+    try:
+        fd: Optional[int] = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = None  # stdout replaced by an in-memory stream
+
+    def _emit(data: bytes) -> None:
+        if fd is None:
+            sys.stdout.write(data.decode(encoding))
+            return
+        while data:
+            data = data[os.write(fd, data):]
+
+    out = bytearray()
+    try:
+        for name, size in entries:
+            out += f"{size}\t{name}\n".encode(encoding, "replace")
+            if len(out) >= OUTPUT_CHUNK_SIZE:
+                _emit(bytes(out))
+                out.clear()
+    finally:
+        _emit(bytes(out))
+
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 2:
+        print("Usage: python list_zip_structure.py <zip-url> [<zip-url> ...]")
+        sys.exit(1)
+    urls = sys.argv[1:]
+    if len(urls) == 1:
+        try:
+            write_listing(iter_zip_contents(urls[0]))
+        except Exception as e:
+            print(f"❌ Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    failed = False
+    for url, entries in list_many(urls):
+        if isinstance(entries, Exception):
+            print(f"❌ Error: {url}: {entries}", file=sys.stderr)
+            failed = True
+            continue
+        print(f"📦 {url}")
+        write_listing(entries)
+    if failed:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
-    url = "https://github.com/Alex313031/Thorium-Win/releases/download/M138.0.7204.300/Thorium_AVX2_138.0.7204.300.zip"
-    # I won't actually run this as it might be too heavy.
-    print("URL:", url)
+    main()
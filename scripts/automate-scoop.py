@@ -4,50 +4,515 @@ Scoop Automation Suite
 Complete automation for Scoop manifest and update script generation.
 """
 
+from __future__ import annotations
+
 import argparse
+import codecs
+import functools
+import hashlib
+import importlib
+import itertools
+import mmap
+import os
 import sys
 from pathlib import Path
 import subprocess
 import json
-import importlib.util
 import re
-import requests
 import tempfile
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
-from version_detector import SoftwareConfig
 
 # Add current directory to path for imports
 scripts_dir = Path(__file__).parent
 sys.path.append(str(scripts_dir))
 
+# version_detector pulls in requests (~100 ms), and the generators import it in turn.
+# They are imported on first use, so local-only commands like audit-providers skip them.
+_LAZY_IMPORTS = {
+    "SoftwareConfig": "version_detector",
+    "VersionDetector": "version_detector",
+    "get_session": "version_detector",
+    "_load_disk_cache": "version_detector",
+    "_save_disk_cache": "version_detector",
+    "ManifestGenerator": "manifest_generator",
+    "load_software_configs": "manifest_generator",
+    "UpdateScriptGenerator": "update_script_generator",
+}
+
+if TYPE_CHECKING:
+    from version_detector import SoftwareConfig, VersionDetector
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve a lazy import on first attribute access (PEP 562) and keep it as a global."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str) -> Any:
+    """Module-internal access to a lazy import; bare global names bypass __getattr__."""
+    return globals().get(name) or __getattr__(name)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_software_configs_cached(path: str, mtime_ns: int, size: int) -> tuple:
+    return tuple(_lazy("load_software_configs")(Path(path)))
+
+
+def load_software_configs_cached(config_file: Path) -> List[SoftwareConfig]:
+    """load_software_configs memoized on (path, mtime, size); edits to the file invalidate it."""
+    st = config_file.stat()
+    return list(_load_software_configs_cached(str(config_file), st.st_mtime_ns, st.st_size))
+
+
+# Optional C JSON codec for bucket manifests and the config file; stdlib json otherwise
 try:
-    # Load manifest_generator module
-    manifest_spec = importlib.util.spec_from_file_location(
-        "manifest_generator",
-        scripts_dir / "manifest-generator.py"
-    )
-    manifest_module = importlib.util.module_from_spec(manifest_spec)
-    manifest_spec.loader.exec_module(manifest_module)
-    ManifestGenerator = manifest_module.ManifestGenerator
-    load_software_configs = manifest_module.load_software_configs
-
-    # Load update_script_generator module
-    update_spec = importlib.util.spec_from_file_location(
-        "update_script_generator",
-        scripts_dir / "update-script-generator.py"
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _loads_json(data: bytes) -> Any:
+    """Parse UTF-8 JSON bytes. Decode errors are json.JSONDecodeError either way."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)  # bytes in: the C scanner decodes, no intermediate str
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a UTF-8 JSON file."""
+    return _loads_json(path.read_bytes())
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write data as 2-space indented UTF-8 JSON (same layout as json.dump(indent=2))."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# Optional BLAKE3 for local cache fingerprints; BLAKE2b from hashlib otherwise. Scoop
+# manifest hashes stay SHA256 (see version_detector.calculate_hash).
+try:
+    from blake3 import blake3 as _blake3  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _blake3 = None
+
+
+def _fingerprint(data: bytes) -> str:
+    """128-bit content fingerprint for local caches; not a Scoop manifest hash."""
+    if _blake3 is not None:
+        return _blake3(data).hexdigest(16)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# Manifests are read and checked concurrently; reports are printed in input order
+VALIDATE_WORKERS = 8
+
+# Manifests that passed validation, as path -> [manifest fingerprint, schema fingerprint]; a manifest
+# is only re-validated when its bytes or the schema change. Lives in scripts_dir.
+VALIDATION_CACHE_NAME = ".validation_cache.json"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_manifest_validator(path: str, mtime_ns: int):
+    try:
+        from jsonschema import Draft202012Validator  # type: ignore
+        return Draft202012Validator(_read_json(Path(path)))
+    except Exception:
+        return None
+
+
+def load_manifest_validator(schema_path: Path):
+    """Draft 2020-12 validator for schema_path, built once per schema revision.
+
+    Returns None when jsonschema is not installed or the schema is missing or unreadable.
+    """
+    try:
+        mtime_ns = schema_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    return _load_manifest_validator(str(schema_path), mtime_ns)
+
+
+def _validate_manifest(manifest_path: Path, validator, schema_digest: str = "", passed: Optional[Dict[str, List[str]]] = None) -> tuple:
+    """Validate one manifest file. Returns (ok, report_lines, content_digest).
+
+    Manifests whose (content, schema) digests match an entry in passed are not re-checked.
+    """
+    ok = True
+    report: List[str] = []
+    digest = None
+    try:
+        data = manifest_path.read_bytes()
+        digest = _fingerprint(data)
+        if passed and passed.get(str(manifest_path)) == [digest, schema_digest]:
+            return True, [f"✅ {manifest_path.name}: Valid"], digest
+        manifest = _loads_json(data)
+
+        if validator:
+            errors = list(validator.iter_errors(manifest))
+            if errors:
+                ok = False
+                report.append(f"❌ {manifest_path.name}: Schema validation failed")
+                for e in errors[:5]:
+                    report.append(f"   - {e.message}")
+            else:
+                report.append(f"✅ {manifest_path.name}: Valid")
+        else:
+            # Basic validation without schema: accept either top-level url/hash
+            # or architecture-specific url/hash entries
+            base_required = ['version', 'description', 'homepage']
+            base_missing = [f for f in base_required if f not in manifest]
+
+            has_top_level = ('url' in manifest) and ('hash' in manifest)
+            has_arch = False
+            if not has_top_level and isinstance(manifest.get('architecture'), dict):
+                arch = manifest['architecture']
+                # Consider valid if any architecture entry has both url and hash
+                for k, v in arch.items():
+                    if isinstance(v, dict) and ('url' in v) and ('hash' in v):
+                        has_arch = True
+                        break
+
+            if base_missing:
+                report.append(f"❌ {manifest_path.name}: Missing fields: {', '.join(base_missing)}")
+                ok = False
+            elif not (has_top_level or has_arch):
+                report.append(f"❌ {manifest_path.name}: Missing fields: url, hash (top-level or per-architecture)")
+                ok = False
+            else:
+                report.append(f"✅ {manifest_path.name}: Valid")
+
+    except json.JSONDecodeError as e:
+        report.append(f"❌ {manifest_path.name}: Invalid JSON: {e}")
+        ok = False
+    except Exception as e:
+        report.append(f"❌ {manifest_path.name}: Validation error: {e}")
+        ok = False
+    return ok, report, digest
+
+
+def _file_contains(path: Path, needle: bytes) -> bool:
+    """Search a file's bytes for needle through mmap, without reading or decoding it."""
+    with open(path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(needle) != -1
+        except ValueError:  # empty files cannot be mapped
+            return False
+
+
+def _scan_update_scripts(scripts_dir: Path) -> List[os.DirEntry]:
+    """update-*.py entries in scripts_dir (without update-all.py), sorted by name.
+
+    DirEntry keeps the stat data from the directory listing, so callers can fingerprint
+    scripts without a second stat() per file where the platform provides it (Windows).
+    """
+    with os.scandir(scripts_dir) as it:
+        entries = [
+            e for e in it
+            if e.name.startswith("update-") and e.name.endswith(".py")
+            and e.name != "update-all.py" and e.is_file()
+        ]
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
+# HTTP session shared by the wizard and automation: pooled, retried, and backed by an
+# on-disk requests-cache (when installed) so repeated homepage/GitHub GETs skip the network
+HTTP_CACHE_NAME = '.scoop_http_cache'
+HTTP_CACHE_TTL = 600  # seconds; applies when the server sends no usable Cache-Control
+
+
+def _make_http_session():
+    return _lazy("get_session")(
+        retries=3,
+        pool_connections=16,
+        pool_maxsize=32,
+        use_cache=True,
+        cache_expire_seconds=HTTP_CACHE_TTL,
+        cache_name=HTTP_CACHE_NAME,
+        cache_control=True,
     )
-    update_module = importlib.util.module_from_spec(update_spec)
-    update_spec.loader.exec_module(update_module)
-    UpdateScriptGenerator = update_module.UpdateScriptGenerator
 
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-    print("Make sure all required modules are in the same directory")
-    sys.exit(1)
+
+def _make_homepage_session():
+    """Pooled, retried session without requests-cache, for fetch_homepage_text.
+
+    A caching session reads every body to the end to store it, which defeats stop_at.
+    """
+    return _lazy("get_session")(retries=3, pool_connections=16, pool_maxsize=32)
+
+
+# GitHub discovery: one search shared by the REST and GraphQL code paths
+GITHUB_TRENDING_QUERY = "stars:>1000 pushed:>2024-01-01 language:C language:C++ language:Go language:Rust"
+GITHUB_TRENDING_COUNT = 20
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+GITHUB_TRENDING_GRAPHQL = """
+query($q: String!, $first: Int!) {
+  search(query: $q, type: REPOSITORY, first: $first) {
+    nodes {
+      ... on Repository {
+        name
+        nameWithOwner
+        description
+        licenseInfo { spdxId }
+        latestRelease { tagName }
+      }
+    }
+  }
+}
+"""
 
 
-# SoftwareConfig and VersionDetector are now imported from version_detector.py
+# Validators and bodies of polled homepages, so unchanged pages come back as bodiless 304s.
+# One file per URL in version_detector's pruned disk cache format, written atomically.
+# This is the only cache on fetch_homepage_text: it runs on the uncached homepage session.
+HOMEPAGE_CACHE_DIR = Path(__file__).parent / ".cache" / "homepages"
+HOMEPAGE_CACHE_MAX_BODY = 1 << 20  # characters; larger pages are refetched rather than stored
+
+
+def _settled_match(pattern, text: str, complete: bool):
+    """Return pattern's first match in text unless it runs into the end of a partial read."""
+    match = pattern.search(text)
+    if match and (complete or match.end() < len(text)):
+        return match
+    return None
+
+
+def _read_text(response, stop_at=None) -> tuple:
+    """Decode a streamed body, stopping early once stop_at has a settled match.
+
+    Returns (text, complete) where complete is False if reading stopped early.
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    text = ''
+    for chunk in response.iter_content(chunk_size=65536):
+        text += decoder.decode(chunk)
+        if stop_at is not None and _settled_match(stop_at, text, False):
+            return text, False
+    return text + decoder.decode(b'', final=True), True
+
+
+def fetch_homepage_text(http, url: str, timeout: int = 10, stop_at=None) -> str:
+    """GET a homepage with If-None-Match/If-Modified-Since from the per-URL cache.
+
+    A 304 returns the stored body; a fresh body is stored when the server sent validators.
+    With stop_at (a compiled regex) the body is streamed and only read up to its first match.
+    Pass a session from _make_homepage_session so the early stop saves the rest of the download.
+    """
+    entry = _lazy("_load_disk_cache")(HOMEPAGE_CACHE_DIR, url) or {}
+    body = entry.get('body')
+    headers = {}
+    # A body cut short for another pattern is only reusable if it also settles this one
+    if body is not None and (entry.get('complete', True) or (stop_at is not None and _settled_match(stop_at, body, False))):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = http.get(url, timeout=timeout, headers=headers, stream=True)
+    try:
+        if response.status_code == 304 and headers:
+            return body
+        response.raise_for_status()
+        text, complete = _read_text(response, stop_at)
+        etag = response.headers.get('ETag', '')
+        last_modified = response.headers.get('Last-Modified', '')
+    finally:
+        response.close()  # releases the connection even when reading stopped early
+
+    if (etag or last_modified) and len(text) <= HOMEPAGE_CACHE_MAX_BODY:
+        _lazy("_save_disk_cache")(
+            HOMEPAGE_CACHE_DIR, url,
+            {'etag': etag, 'last_modified': last_modified, 'body': text, 'complete': complete},
+        )
+    return text
+
+
+# Optional semantic version parsing for picking the highest suggested version
+try:
+    from packaging.version import Version as _PVersion, InvalidVersion as _PInvalid
+except Exception:  # pragma: no cover
+    _PVersion = None
+    _PInvalid = Exception
+
+
+def _version_sort_key(value: str):
+    """Sort key for version strings; unparsable versions sort lowest."""
+    if _PVersion is not None:
+        try:
+            return _PVersion(value)
+        except _PInvalid:
+            return _PVersion('0')
+    return [int(x) for x in value.split('.') if x.isdigit()]
+
+
+# Optional linear-time regex engine (google-re2) for scanning arbitrary HTML
+try:
+    import re2 as _re2  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _re2 = None
+
+
+def _compile_scan_pattern(pattern: str):
+    """Compile a case-insensitive page-scan pattern, preferring RE2 when installed.
+
+    Patterns using constructs RE2 rejects (backreferences, lookaround) fall back to re.
+    """
+    if _re2 is not None:
+        try:
+            return _re2.compile(f"(?i){pattern}")
+        except Exception:
+            pass
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# Version patterns offered by the wizard, compiled once per process
+_WIZARD_VERSION_PATTERNS = tuple((pattern, _compile_scan_pattern(pattern), description) for pattern, description in [
+    (r'Version\s+([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Version X.Y.Z'),
+    (r'v([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'vX.Y.Z'),
+    (r'tag_name":\s*"v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"', 'GitHub releases API'),
+    (r'([0-9]+\.[0-9]+(?:\.[0-9]+)?)/', 'Version in URL path'),
+    (r'Release\s+([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Release X.Y.Z'),
+    (r'Download\s+([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Download X.Y.Z'),
+])
+
+# Headings are located first and only their (bounded) text is searched for a version,
+# instead of nesting lazy .*? scans across the whole page
+_HEADING_BODY = re.compile(r'<h[1-6][^>]*>([^<]{0,200})</h[1-6]>', re.IGNORECASE)
+_HEADING_VERSION = re.compile(r'v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)')
+_HEADING_PATTERN = r'<h[1-6][^>]*>[^<]{0,200}?v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)[^<]{0,200}</h[1-6]>'
+
+
+class _HeadingVersionScan:
+    """finditer()/findall()-compatible scanner for versions inside <h1>..<h6> headings."""
+
+    pattern = _HEADING_PATTERN
+
+    def finditer(self, content: str):
+        for heading in _HEADING_BODY.finditer(content):
+            match = _HEADING_VERSION.search(heading.group(1))
+            if match:
+                yield match
+
+    def findall(self, content: str) -> List[str]:
+        return [match.group(1) for match in self.finditer(content)]
+
+
+# Matches considered per pattern when picking the highest suggested version; pages full of
+# version-shaped strings are not scanned to the end
+SUGGEST_MATCH_LIMIT = 64
+
+# Enhanced patterns used by ScoopAutomation.suggest_version_patterns, each with the
+# literal anchors (groups of _SUGGEST_ANCHORS) it cannot match without
+_SUGGEST_VERSION_PATTERNS = tuple(
+    (
+        pattern,
+        _HeadingVersionScan() if pattern == _HEADING_PATTERN else _compile_scan_pattern(pattern),
+        description,
+        frozenset(anchors),
+    )
+    for pattern, description, anchors in [
+        # GitHub API patterns
+        (r'tag_name":\s*"v?([0-9]+\.[0-9]+(?:\.[0-9]+)?(?:-[a-zA-Z0-9]+)?)"', 'GitHub API with pre-release', ['tag']),
+        (r'tag_name":\s*"v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"', 'GitHub API stable', ['tag']),
+
+        # Version in text patterns
+        (r'Version\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Version prefix', ['version']),
+        (r'Release\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Release prefix', ['release']),
+        (r'Download\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Download prefix', ['download']),
+
+        # URL path patterns
+        (r'/v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)/[^/]*\.(?:exe|msi|zip|7z)', 'Version in download URL', ['ext']),
+        (r'([0-9]+\.[0-9]+(?:\.[0-9]+)?)\.(?:exe|msi|zip|7z)', 'Version in filename', ['ext']),
+
+        # HTML patterns
+        (_HEADING_PATTERN, 'Version in heading', ['heading']),
+        (r'data-version="v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"', 'Version in data attribute', ['data']),
+
+        # Semantic versioning with build metadata
+        (r'v?([0-9]+\.[0-9]+\.[0-9]+(?:\+[a-zA-Z0-9.-]+)?)', 'Semantic versioning with build', ['semver']),
+        (r'v?([0-9]+\.[0-9]+\.[0-9]+(?:-[a-zA-Z0-9.-]+)?)', 'Semantic versioning with pre-release', ['semver']),
+    ]
+)
+
+# One alternation pass finds which anchors occur, so patterns that cannot match are never
+# run. Full patterns are not alternated directly: finditer consumes each match, so
+# overlapping patterns (both tag_name variants, both semver variants) would be lost.
+_SUGGEST_ANCHORS = re.compile(
+    r'(?P<tag>tag_name)|(?P<data>data-version)|(?P<version>version)|(?P<release>release)'
+    r'|(?P<download>download)|(?P<heading><h[1-6])|(?P<ext>\.(?:exe|msi|zip|7z))'
+    r'|(?P<semver>[0-9]+\.[0-9]+\.[0-9])',
+    re.IGNORECASE,
+)
+_ALL_SUGGEST_ANCHORS = frozenset(_SUGGEST_ANCHORS.groupindex)
+
+
+# Pages larger than RELEVANT_FULL_SIZE are cut down before the suggest patterns run: a
+# RELEVANT_WINDOW each side of the first landmark, else the first RELEVANT_FULL_SIZE chars
+RELEVANT_FULL_SIZE = 32 * 1024
+RELEVANT_WINDOW = 8 * 1024
+_RELEVANT_LANDMARKS = ('<main', '<article', 'id="download', "id='download", 'class="release', "class='release")
+
+
+def _extract_relevant(content: str) -> str:
+    """Slice of a page most likely to hold its version; returns content itself when small."""
+    if len(content) <= RELEVANT_FULL_SIZE:
+        return content
+    lowered = content.lower()
+    hits = [i for i in (lowered.find(landmark) for landmark in _RELEVANT_LANDMARKS) if i >= 0]
+    if not hits:
+        return content[:RELEVANT_FULL_SIZE]
+    start = min(hits)
+    return content[max(0, start - RELEVANT_WINDOW):start + RELEVANT_WINDOW]
+
+
+def _present_anchors(content: str) -> set:
+    """Return the _SUGGEST_ANCHORS group names found in content, in a single scan."""
+    found = set()
+    for match in _SUGGEST_ANCHORS.finditer(content):
+        found.add(match.lastgroup)
+        if match.lastgroup == 'data':
+            found.add('version')  # 'data-version' hides the 'version' inside it
+        if len(found) == len(_ALL_SUGGEST_ANCHORS):
+            break
+    return found
+
+
+# Scoop package names: lowercase letters, digits and hyphens
+_NAME_RE = re.compile(r'[a-z0-9-]+')
+
+
+# Provider markers for audit-providers, scanned in one pass over the raw head of each
+# script. api.github.com and storage.googleapis.com are covered by github.com and googleapis.com.
+PROVIDER_SCAN_BYTES = 4096
+PROVIDER_CACHE_NAME = ".providers-cache.json"  # in scripts_dir, see audit-providers
+_PROVIDER_MARKERS = re.compile(
+    rb'(?P<github>github\.com)'
+    rb'|(?P<microsoft>(?:learn|go|download|visualstudio)\.microsoft\.com)'
+    rb'|(?P<google>googleapis\.com|dl\.google\.com|cloudfront\.net)'
+)
+_PROVIDER_PRIORITY = ("github", "microsoft", "google")
+
+
+def _classify_provider(content: bytes) -> str:
+    """Provider for script content: GitHub over Microsoft over Google, wherever each marker occurs."""
+    found = set()
+    for match in _PROVIDER_MARKERS.finditer(content):
+        if match.lastgroup == "github":
+            return "github"
+        found.add(match.lastgroup)
+    return next((provider for provider in _PROVIDER_PRIORITY if provider in found), "other")
 
 
 class ConfigWizard:
@@ -56,6 +521,8 @@ class ConfigWizard:
     def __init__(self, keep_json: bool = False):
         self.config_file = Path(__file__).parent / "software-configs.json"
         self.keep_json = keep_json
+        self.http = _make_http_session()
+        self.homepage_http = _make_homepage_session()
 
     def run(self) -> None:
         """Run the interactive configuration wizard."""
@@ -101,7 +568,7 @@ class ConfigWizard:
         # Package name
         while True:
             name = input("📦 Package name (e.g., 'my-awesome-app'): ").strip().lower()
-            if re.match(r'^[a-z0-9-]+$', name):
+            if _NAME_RE.fullmatch(name):
                 break
             print("❌ Name must contain only lowercase letters, numbers, and hyphens")
 
@@ -123,7 +590,7 @@ class ConfigWizard:
         if not license_type:
             license_type = "Unknown"
 
-        return SoftwareConfig(
+        return _lazy("SoftwareConfig")(
             name=name,
             description=description,
             homepage=homepage,
@@ -140,7 +607,7 @@ class ConfigWizard:
         # Test homepage and suggest patterns
         print(f"🌐 Checking {config.homepage}...")
         try:
-            response = requests.get(config.homepage, timeout=10)
+            response = self.http.get(config.homepage, timeout=10)
             content = response.text[:2000]  # First 2KB for analysis
 
             # Suggest common patterns
@@ -197,20 +664,10 @@ class ConfigWizard:
         """Suggest version regex patterns based on content analysis."""
         patterns = []
 
-        # Common version patterns
-        test_patterns = [
-            (r'Version\s+([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Version X.Y.Z'),
-            (r'v([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'vX.Y.Z'),
-            (r'tag_name":\s*"v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"', 'GitHub releases API'),
-            (r'([0-9]+\.[0-9]+(?:\.[0-9]+)?)/', 'Version in URL path'),
-            (r'Release\s+([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Release X.Y.Z'),
-            (r'Download\s+([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Download X.Y.Z'),
-        ]
-
-        for pattern, description in test_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                patterns.append((pattern, f"{description} → {matches[0]}"))
+        for pattern, compiled, description in _WIZARD_VERSION_PATTERNS:
+            match = compiled.search(content)
+            if match:
+                patterns.append((pattern, f"{description} → {match.group(1)}"))
 
         return patterns[:5]  # Return top 5 suggestions
 
@@ -220,8 +677,8 @@ class ConfigWizard:
 
         try:
             # Test web-based version detection first
-            response = requests.get(config.homepage, timeout=10)
-            matches = re.findall(config.version_regex, response.text)
+            version_re = re.compile(config.version_regex)
+            matches = version_re.findall(fetch_homepage_text(self.homepage_http, config.homepage, stop_at=version_re))
 
             version = None
             if matches:
@@ -232,7 +689,7 @@ class ConfigWizard:
                 print("🔄 Trying executable metadata detection as fallback...")
 
                 # Fallback: Try executable metadata detection
-                detector = VersionDetector()
+                detector: VersionDetector = _lazy("VersionDetector")()
 
                 # Try with a sample version (1.0.0) to test the URL pattern
                 sample_url = config.download_url_template.replace('$version', '1.0.0')
@@ -258,7 +715,7 @@ class ConfigWizard:
                 download_url = config.download_url_template.replace('$version', version)
                 print(f"🔗 Testing download URL: {download_url}")
 
-                head_response = requests.head(download_url, timeout=10, allow_redirects=True)
+                head_response = self.http.head(download_url, timeout=10, allow_redirects=True)
                 if head_response.status_code == 200:
                     print("✅ Download URL is accessible")
                     return True
@@ -276,8 +733,7 @@ class ConfigWizard:
         """Save the configuration to the JSON file."""
         # Load existing configurations
         if self.config_file.exists():
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(self.config_file)
         else:
             data = {}
 
@@ -288,12 +744,11 @@ class ConfigWizard:
         config_dict = asdict(config)
         config_dict = {k: v for k, v in config_dict.items() if v is not None}
 
-        # Check if software already exists
-        existing_index = None
+        # Check if software already exists (first entry wins if a name is duplicated)
+        index = {}
         for i, software in enumerate(data['software']):
-            if software.get('name') == config.name:
-                existing_index = i
-                break
+            index.setdefault(software.get('name'), i)
+        existing_index = index.get(config.name)
 
         if existing_index is not None:
             if input(f"⚠️  '{config.name}' already exists. Overwrite? (y/N): ").strip().lower() == 'y':
@@ -305,8 +760,7 @@ class ConfigWizard:
             data['software'].append(config_dict)
 
         # Save to file
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_json(self.config_file, data)
 
         print(f"✅ Configuration saved to {self.config_file}")
 
@@ -346,8 +800,33 @@ class ScoopAutomation:
         self.scripts_dir = scripts_dir or Path(__file__).parent
         self.config_file = self.scripts_dir / "software-configs.json"
 
-        self.manifest_generator = ManifestGenerator(self.bucket_dir)
-        self.script_generator = UpdateScriptGenerator(self.bucket_dir, self.scripts_dir)
+    # The session and generators are built on first use, which also defers their imports
+
+    @functools.cached_property
+    def http(self):
+        """Shared keep-alive session for homepage scans and GitHub discovery."""
+        return _make_http_session()
+
+    @functools.cached_property
+    def homepage_http(self):
+        """Uncached session for streamed homepage reads that stop at the version match."""
+        return _make_homepage_session()
+
+    @functools.cached_property
+    def manifest_generator(self):
+        return _lazy("ManifestGenerator")(self.bucket_dir)
+
+    @functools.cached_property
+    def script_generator(self):
+        return _lazy("UpdateScriptGenerator")(self.bucket_dir, self.scripts_dir)
+
+    @functools.cached_property
+    def update_scripts(self) -> List[Path]:
+        """Sorted update-*.py scripts in scripts_dir (without update-all.py), listed once.
+
+        generate_update_scripts drops the cached listing, since it may add scripts.
+        """
+        return [Path(e.path) for e in _scan_update_scripts(self.scripts_dir)]
 
     def generate_manifests(self, software_names: list = None) -> list:
         """Generate manifests for specified software or all configured software"""
@@ -357,7 +836,7 @@ class ScoopAutomation:
             return []
 
         print(f"📋 Loading configurations from {self.config_file}")
-        configs = load_software_configs(self.config_file)
+        configs = load_software_configs_cached(self.config_file)
 
         if software_names:
             # Filter configs to only include specified software
@@ -368,21 +847,20 @@ class ScoopAutomation:
 
         generated_manifests = []
 
-        for config in configs:
-            try:
-                print(f"\\n🚀 Generating manifest for {config.name}...")
-                manifest = self.manifest_generator.generate_manifest(config)
-                manifest_path = self.manifest_generator.save_manifest(config, manifest)
+        print(f"\\n🚀 Generating manifests for {len(configs)} package(s)...")
+        for config, manifest_path, error in self.manifest_generator.generate_and_save_all(configs):
+            if error is None:
                 generated_manifests.append(manifest_path)
                 print(f"✅ Successfully generated manifest for {config.name}")
-            except Exception as e:
-                print(f"❌ Failed to generate manifest for {config.name}: {e}")
+            else:
+                print(f"❌ Failed to generate manifest for {config.name}: {error}")
             print("-" * 50)
 
         return generated_manifests
 
     def generate_update_scripts(self, manifest_names: list = None) -> list:
         """Generate update scripts for specified manifests or all manifests"""
+        self.__dict__.pop("update_scripts", None)
         if manifest_names:
             # Generate scripts for specific manifests
             generated_scripts = []
@@ -408,8 +886,7 @@ class ScoopAutomation:
         """Check that the orchestrator can auto-detect update scripts"""
         try:
             # Get all update scripts
-            update_scripts = list(self.scripts_dir.glob("update-*.py"))
-            script_names = [script.stem for script in update_scripts if script.name not in ["update-all.py", "update-script-generator.py"]]
+            script_names = [script.stem for script in self.update_scripts]
 
             # Check orchestrator exists
             orchestrator_path = self.scripts_dir / "update-all.py"
@@ -418,10 +895,7 @@ class ScoopAutomation:
                 return False
 
             # Since update-all.py now auto-detects scripts, just verify it has the discover function
-            with open(orchestrator_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            if 'discover_update_scripts' in content:
+            if _file_contains(orchestrator_path, b'discover_update_scripts'):
                 print(f"✅ Orchestrator ready - will auto-detect {len(script_names)} scripts")
                 print(f"📋 Available scripts: {', '.join(sorted(script_names))}")
                 return True
@@ -440,65 +914,34 @@ class ScoopAutomation:
 
         all_valid = True
 
-        schema = None
+        schema_path = self.scripts_dir / "manifest_schema.json"
+        validator = load_manifest_validator(schema_path)
+        schema_digest = _fingerprint(schema_path.read_bytes()) if validator else "basic"
+
+        cache_path = self.scripts_dir / VALIDATION_CACHE_NAME
         try:
-            from jsonschema import Draft202012Validator  # type: ignore
-            schema_path = self.scripts_dir / "manifest_schema.json"
-            if schema_path.exists():
-                import json as _json
-                with open(schema_path, 'r', encoding='utf-8') as f:
-                    schema = _json.load(f)
-                validator = Draft202012Validator(schema)
-            else:
-                validator = None
+            passed = _read_json(cache_path)
         except Exception:
-            validator = None
-
-        for manifest_path in manifest_paths:
-            try:
-                with open(manifest_path, 'r', encoding='utf-8') as f:
-                    manifest = json.load(f)
-
-                if validator:
-                    errors = list(validator.iter_errors(manifest))
-                    if errors:
-                        all_valid = False
-                        print(f"❌ {manifest_path.name}: Schema validation failed")
-                        for e in errors[:5]:
-                            print(f"   - {e.message}")
-                    else:
-                        print(f"✅ {manifest_path.name}: Valid")
+            passed = {}
+
+        workers = min(VALIDATE_WORKERS, len(manifest_paths)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda p: _validate_manifest(p, validator, schema_digest, passed), manifest_paths)
+            updated = dict(passed)
+            for manifest_path, (ok, report, digest) in zip(manifest_paths, results):
+                for line in report:
+                    print(line)
+                all_valid = all_valid and ok
+                if ok:
+                    updated[str(manifest_path)] = [digest, schema_digest]
                 else:
-                    # Basic validation without schema: accept either top-level url/hash
-                    # or architecture-specific url/hash entries
-                    base_required = ['version', 'description', 'homepage']
-                    base_missing = [f for f in base_required if f not in manifest]
-
-                    has_top_level = ('url' in manifest) and ('hash' in manifest)
-                    has_arch = False
-                    if not has_top_level and isinstance(manifest.get('architecture'), dict):
-                        arch = manifest['architecture']
-                        # Consider valid if any architecture entry has both url and hash
-                        for k, v in arch.items():
-                            if isinstance(v, dict) and ('url' in v) and ('hash' in v):
-                                has_arch = True
-                                break
-
-                    if base_missing:
-                        print(f"❌ {manifest_path.name}: Missing fields: {', '.join(base_missing)}")
-                        all_valid = False
-                    elif not (has_top_level or has_arch):
-                        print(f"❌ {manifest_path.name}: Missing fields: url, hash (top-level or per-architecture)")
-                        all_valid = False
-                    else:
-                        print(f"✅ {manifest_path.name}: Valid")
+                    updated.pop(str(manifest_path), None)
 
-            except json.JSONDecodeError as e:
-                print(f"❌ {manifest_path.name}: Invalid JSON: {e}")
-                all_valid = False
+        if updated != passed:
+            try:
+                _write_json(cache_path, updated)
             except Exception as e:
-                print(f"❌ {manifest_path.name}: Validation error: {e}")
-                all_valid = False
+                print(f"⚠️  Could not write validation cache: {e}")
 
         return all_valid
 
@@ -524,38 +967,23 @@ class ScoopAutomation:
     def _discover_github_trending(self) -> List[Dict[str, str]]:
         """Discover trending GitHub repositories with releases"""
         try:
-            # Search for trending repositories with recent releases
-            url = "https://api.github.com/search/repositories"
-            params = {
-                "q": "stars:>1000 pushed:>2024-01-01 language:C language:C++ language:Go language:Rust",
-                "sort": "stars",
-                "order": "desc",
-                "per_page": 20
-            }
-
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code != 200:
-                return []
+            # GraphQL returns repositories and their latest release in one round trip, but
+            # GitHub only serves it to authenticated clients; fall back to REST otherwise
+            if "Authorization" in self.http.headers:
+                repos = self._github_trending_graphql()
+            else:
+                repos = self._github_trending_rest()
 
-            repos = response.json().get("items", [])
             discovered = []
-
             for repo in repos:
-                # Check if repo has releases
-                releases_url = f"https://api.github.com/repos/{repo['full_name']}/releases"
-                releases_response = requests.get(releases_url, timeout=5)
-
-                if releases_response.status_code == 200:
-                    releases = releases_response.json()
-                    if releases:  # Has releases
-                        discovered.append({
-                            "name": repo["name"].lower().replace("_", "-"),
-                            "description": repo["description"] or f"{repo['name']} - GitHub project",
-                            "homepage": f"https://api.github.com/repos/{repo['full_name']}/releases",
-                            "license": repo.get("license", {}).get("spdx_id", "Unknown"),
-                            "suggested_regex": r'tag_name":\s*"v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"',
-                            "suggested_url_template": f"https://github.com/{repo['full_name']}/releases/download/v$version/{repo['name']}-$version.exe"
-                        })
+                discovered.append({
+                    "name": repo["name"].lower().replace("_", "-"),
+                    "description": repo["description"] or f"{repo['name']} - GitHub project",
+                    "homepage": f"https://api.github.com/repos/{repo['full_name']}/releases",
+                    "license": repo["license"] or "Unknown",
+                    "suggested_regex": r'tag_name":\s*"v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"',
+                    "suggested_url_template": f"https://github.com/{repo['full_name']}/releases/download/v$version/{repo['name']}-$version.exe"
+                })
 
             return discovered
 
@@ -563,6 +991,72 @@ class ScoopAutomation:
             print(f"GitHub discovery error: {e}")
             return []
 
+    def _github_trending_graphql(self) -> List[Dict[str, str]]:
+        """Trending repositories that have a release, from a single GraphQL search."""
+        response = self.http.post(
+            GITHUB_GRAPHQL_URL,
+            json={
+                "query": GITHUB_TRENDING_GRAPHQL,
+                "variables": {"q": f"{GITHUB_TRENDING_QUERY} sort:stars-desc", "first": GITHUB_TRENDING_COUNT},
+            },
+            timeout=10,
+        )
+        if response.status_code != 200:
+            return []
+
+        nodes = ((response.json().get("data") or {}).get("search") or {}).get("nodes") or []
+        return [
+            {
+                "name": node["name"],
+                "full_name": node["nameWithOwner"],
+                "description": node.get("description"),
+                "license": (node.get("licenseInfo") or {}).get("spdxId"),
+            }
+            for node in nodes
+            if node and node.get("latestRelease")
+        ]
+
+    def _github_trending_rest(self) -> List[Dict[str, str]]:
+        """Trending repositories that have a release, via REST search plus per-repo release lookups."""
+        params = {
+            "q": GITHUB_TRENDING_QUERY,
+            "sort": "stars",
+            "order": "desc",
+            "per_page": GITHUB_TRENDING_COUNT
+        }
+
+        response = self.http.get("https://api.github.com/search/repositories", params=params, timeout=10)
+        if response.status_code != 200:
+            return []
+
+        repos = response.json().get("items", [])
+
+        # Release lookups are independent network waits; run them concurrently on the pooled session
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            has_releases = list(executor.map(self._repo_has_releases, [repo["full_name"] for repo in repos]))
+
+        return [
+            {
+                "name": repo["name"],
+                "full_name": repo["full_name"],
+                "description": repo.get("description"),
+                "license": (repo.get("license") or {}).get("spdx_id"),
+            }
+            for repo, has_release in zip(repos, has_releases)
+            if has_release
+        ]
+
+    def _repo_has_releases(self, full_name: str) -> bool:
+        """Return True if the GitHub repository has at least one release."""
+        try:
+            # One release is enough to answer; the default page would carry 30 full release objects
+            releases_response = self.http.get(
+                f"https://api.github.com/repos/{full_name}/releases", params={"per_page": 1}, timeout=5
+            )
+            return releases_response.status_code == 200 and bool(releases_response.json())
+        except Exception:
+            return False
+
     def _discover_chocolatey_popular(self) -> List[Dict[str, str]]:
         """Discover popular Chocolatey packages that might have direct downloads"""
         # This would require Chocolatey API access or web scraping
@@ -591,41 +1085,14 @@ class ScoopAutomation:
     def suggest_version_patterns(self, url: str) -> List[tuple]:
         """Enhanced version pattern detection with more sophisticated patterns"""
         try:
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             content = response.text
 
-            patterns = []
-
-            # Enhanced pattern detection
-            test_patterns = [
-                # GitHub API patterns
-                (r'tag_name":\s*"v?([0-9]+\.[0-9]+(?:\.[0-9]+)?(?:-[a-zA-Z0-9]+)?)"', 'GitHub API with pre-release'),
-                (r'tag_name":\s*"v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"', 'GitHub API stable'),
-
-                # Version in text patterns
-                (r'Version\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Version prefix'),
-                (r'Release\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Release prefix'),
-                (r'Download\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)', 'Download prefix'),
-
-                # URL path patterns
-                (r'/v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)/[^/]*\.(?:exe|msi|zip|7z)', 'Version in download URL'),
-                (r'([0-9]+\.[0-9]+(?:\.[0-9]+)?)\.(?:exe|msi|zip|7z)', 'Version in filename'),
-
-                # HTML patterns
-                (r'<h[1-6][^>]*>.*?v?([0-9]+\.[0-9]+(?:\.[0-9]+)?).*?</h[1-6]>', 'Version in heading'),
-                (r'data-version="v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"', 'Version in data attribute'),
-
-                # Semantic versioning with build metadata
-                (r'v?([0-9]+\.[0-9]+\.[0-9]+(?:\+[a-zA-Z0-9.-]+)?)', 'Semantic versioning with build'),
-                (r'v?([0-9]+\.[0-9]+\.[0-9]+(?:-[a-zA-Z0-9.-]+)?)', 'Semantic versioning with pre-release'),
-            ]
-
-            for pattern, description in test_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if matches:
-                    # Get the most recent/highest version
-                    version = max(matches, key=lambda v: [int(x) for x in v.split('.') if x.isdigit()])
-                    patterns.append((pattern, f"{description} → {version}"))
+            # Scan the content-bearing region first; the whole page only if it finds nothing
+            relevant = _extract_relevant(content)
+            patterns = self._match_suggest_patterns(relevant)
+            if not patterns and relevant is not content:
+                patterns = self._match_suggest_patterns(content)
 
             return patterns[:8]  # Return top 8 suggestions
 
@@ -633,6 +1100,25 @@ class ScoopAutomation:
             print(f"Pattern suggestion error: {e}")
             return []
 
+    def _match_suggest_patterns(self, content: str) -> List[tuple]:
+        """(pattern, "description → highest version") for each suggest pattern matching content."""
+        patterns = []
+
+        present = _present_anchors(content)
+        for pattern, compiled, description, anchors in _SUGGEST_VERSION_PATTERNS:
+            if not anchors <= present:
+                continue
+            # Keep a running maximum (the most recent/highest version) over the first matches
+            version = best = None
+            for match in itertools.islice(compiled.finditer(content), SUGGEST_MATCH_LIMIT):
+                key = _version_sort_key(match.group(1))
+                if best is None or key > best:
+                    version, best = match.group(1), key
+            if version is not None:
+                patterns.append((pattern, f"{description} → {version}"))
+
+        return patterns
+
     def run_tests(self) -> bool:
         """Run comprehensive tests on the automation system"""
         print("🧪 Running Automation Tests...")
@@ -644,7 +1130,7 @@ class ScoopAutomation:
         config_file = self.scripts_dir / "software-configs.json"
         if config_file.exists():
             try:
-                configs = load_software_configs(config_file)
+                configs = load_software_configs_cached(config_file)
                 print(f"✅ Configuration file valid ({len(configs)} software entries)")
             except Exception as e:
                 print(f"❌ Configuration file invalid: {e}")
@@ -662,7 +1148,7 @@ class ScoopAutomation:
             print("⚠️  No manifests found in bucket directory")
 
         # Test 3: Check update scripts
-        update_scripts = list(self.scripts_dir.glob("update-*.py"))
+        update_scripts = self.update_scripts
         if update_scripts:
             print(f"\n🔄 Found {len(update_scripts)} update scripts")
         else:
@@ -675,10 +1161,10 @@ class ScoopAutomation:
         """Enhanced version detection with executable metadata fallback"""
         try:
             # Primary: Web-based regex detection
-            response = requests.get(config.homepage, timeout=10)
-            response.raise_for_status()
+            version_re = re.compile(config.version_regex, re.IGNORECASE)
+            content = fetch_homepage_text(self.homepage_http, config.homepage, stop_at=version_re)
 
-            match = re.search(config.version_regex, response.text, re.IGNORECASE)
+            match = version_re.search(content)
             if match:
                 version = match.group(1)
                 print(f"✅ Version detected via web regex: {version}")
@@ -687,7 +1173,7 @@ class ScoopAutomation:
             print("⚠️  Web regex detection failed, trying executable metadata...")
 
            # Fallback: Executable metadata detection
-            detector = VersionDetector()
+            detector: VersionDetector = _lazy("VersionDetector")()
 
             # Try to construct download URL with a placeholder version
             test_version = "1.0.0"  # Placeholder for URL construction
@@ -722,14 +1208,216 @@ class ScoopAutomation:
         wizard = ConfigWizard(keep_json)
         wizard.run()
 
+def _cmd_generate_manifests(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🚀 Generating manifests...")
+    manifests = automation.generate_manifests(args.software)
+    print(f"\\n✅ Generated {len(manifests)} manifests")
+
+
+def _cmd_generate_scripts(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🚀 Generating update scripts...")
+    scripts = automation.generate_update_scripts(args.software)
+    print(f"\\n✅ Generated {len(scripts)} update scripts")
+
+
+def _cmd_generate_all(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🚀 Generating manifests and update scripts...")
+    manifests = automation.generate_manifests(args.software)
+    scripts = automation.generate_update_scripts(args.software)
+    automation.update_orchestrator()
+    print(f"\\n✅ Generated {len(manifests)} manifests and {len(scripts)} scripts")
+
+
+def _cmd_validate(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🔍 Validating manifests...")
+    valid = automation.validate_manifests()
+    if valid:
+        print("✅ All manifests are valid")
+    else:
+        print("❌ Some manifests have validation errors")
+        sys.exit(1)
+
+
+def _cmd_test(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🧪 Testing update scripts...")
+    success = automation.run_tests()
+    if not success:
+        sys.exit(1)
+
+
+def _cmd_update_orchestrator(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🔄 Updating orchestrator...")
+    success = automation.update_orchestrator()
+    if not success:
+        sys.exit(1)
+
+
+def _cmd_wizard(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🧙‍♂️ Starting Configuration Wizard...")
+    automation.wizard(keep_json=args.keep_json)
+
+
+def _cmd_auto_discover(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🔍 Auto-discovering software...")
+    sources = args.sources or ["github", "chocolatey"]
+    discovered = automation.auto_discover_software(sources)
+    if discovered:
+        print(f"\\n✅ Discovered {len(discovered)} software packages:")
+        for software in discovered[:10]:  # Show first 10
+            print(f"  • {software['name']}: {software['description']}")
+        if len(discovered) > 10:
+            print(f"  ... and {len(discovered) - 10} more")
+    else:
+        print("❌ No software discovered")
+
+
+def _cmd_suggest_patterns(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    if not args.url:
+        print("❌ --url argument is required for suggest-patterns command")
+        sys.exit(1)
+    print(f"🔍 Analyzing URL for version patterns: {args.url}")
+    patterns = automation.suggest_version_patterns(args.url)
+    if patterns:
+        print(f"\\n✅ Found {len(patterns)} potential version patterns:")
+        for pattern, confidence in patterns:
+            print(f"  • {pattern} (confidence: {confidence:.1%})")
+    else:
+        print("❌ No version patterns found")
+
+
+def _cmd_test_version(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🔍 Testing enhanced version detection...")
+    config_file = automation.scripts_dir / "software-configs.json"
+    if not config_file.exists():
+        print("❌ No software-configs.json found. Run 'wizard' command first.")
+        sys.exit(1)
+    
+    try:
+        configs = load_software_configs_cached(config_file)
+        if args.software:
+            # Test specific software
+            configs = [c for c in configs if c.name in args.software]
+            if not configs:
+                print(f"❌ No configurations found for: {', '.join(args.software)}")
+                sys.exit(1)
+        
+        for config in configs:
+            print(f"\\n🔍 Testing {config.name}...")
+            version = automation.detect_version_enhanced(config)
+            if version:
+                print(f"✅ Successfully detected version: {version}")
+            else:
+                print(f"❌ Failed to detect version for {config.name}")
+                
+    except Exception as e:
+        print(f"❌ Error testing version detection: {e}")
+        sys.exit(1)
+
+
+def _cmd_audit_providers(automation: ScoopAutomation, args: argparse.Namespace) -> None:
+    print("🔎 Auditing provider classification for update scripts...")
+    providers_path = automation.scripts_dir / "providers.json"
+    try:
+        existing = {}
+        if providers_path.exists():
+            existing = _read_json(providers_path)
+    except Exception:
+        existing = {}
+
+    # Content-inferred providers from earlier audits, as name -> [mtime_ns, size, provider];
+    # unchanged scripts are answered from a stat() alone
+    cache_path = automation.scripts_dir / PROVIDER_CACHE_NAME
+    cache = {}
+    if not args.refresh:
+        try:
+            cache = _read_json(cache_path)
+        except Exception:
+            cache = {}
+
+    def lookup(e: os.DirEntry) -> Optional[tuple]:
+        """Answer from providers.json or an unchanged cache entry; None if the script must be read."""
+        name = e.name
+        pkg = name.replace("update-", "").replace(".py", "")
+        mapped = existing.get(name) or existing.get(pkg)
+        if isinstance(mapped, str) and mapped:
+            return name, mapped, None
+        cached = cache.get(name)
+        if cached:
+            try:
+                st = e.stat()
+            except OSError:
+                return None
+            if cached[:2] == [st.st_mtime_ns, st.st_size]:
+                return name, cached[2], cached
+        return None
+
+    def classify(e: os.DirEntry) -> tuple:
+        name = e.name
+        try:
+            st = e.stat()  # reuses the listing's (or lookup's) stat data
+            with open(e.path, "rb") as f:
+                head = f.read(PROVIDER_SCAN_BYTES)
+            prov = _classify_provider(head)
+            return name, prov, [st.st_mtime_ns, st.st_size, prov]
+        except Exception:
+            return name, "other", None
+
+    # A fresh listing (not automation.update_scripts) so every DirEntry carries current stat data
+    scripts = _scan_update_scripts(automation.scripts_dir)
+    known = {e.name: lookup(e) for e in scripts}
+    uncached = [e for e in scripts if known[e.name] is None]
+    # Only unseen or changed scripts are read; overlap those reads and merge in script order
+    if uncached:
+        with ThreadPoolExecutor(max_workers=min(32, len(uncached))) as executor:
+            known.update((e.name, hit) for e, hit in zip(uncached, executor.map(classify, uncached)))
+    classified = [known[e.name] for e in scripts]
+    print(f"Scanned: {len(uncached)} / Cached: {len(scripts) - len(uncached)}")
+
+    fresh_cache = {name: entry for name, _, entry in classified if entry}
+    if fresh_cache != cache:
+        try:
+            _write_json(cache_path, fresh_cache)
+        except Exception as e:
+            print(f"⚠️  Could not write provider cache: {e}")
+
+    inferred = {}
+    counts = {"github": 0, "microsoft": 0, "google": 0, "other": 0}
+    for name, prov, _ in classified:
+        inferred[name] = prov
+        counts[prov] += 1
+        print(f"  • {name}: {prov}")
+    print(f"\nTotals → GitHub: {counts['github']} | Microsoft: {counts['microsoft']} | Google: {counts['google']} | Other: {counts['other']}")
+
+    if args.write_map:
+        try:
+            merged = dict(existing)
+            merged.update(inferred)
+            _write_json(providers_path, merged)
+            print(f"✅ Wrote providers map: {providers_path}")
+        except Exception as e:
+            print(f"⚠️  Failed to write providers map: {e}")
+
+
+# argparse restricts the command to these keys, so main() dispatches with a plain lookup
+COMMANDS = {
+    "generate-manifests": _cmd_generate_manifests,
+    "generate-scripts": _cmd_generate_scripts,
+    "generate-all": _cmd_generate_all,
+    "validate": _cmd_validate,
+    "test": _cmd_test,
+    "update-orchestrator": _cmd_update_orchestrator,
+    "wizard": _cmd_wizard,
+    "auto-discover": _cmd_auto_discover,
+    "suggest-patterns": _cmd_suggest_patterns,
+    "test-version": _cmd_test_version,
+    "audit-providers": _cmd_audit_providers,
+}
+
+
 def main():
     """Main function with CLI interface"""
     parser = argparse.ArgumentParser(description="Scoop Automation Suite")
-    parser.add_argument("command", choices=[
-        "generate-manifests", "generate-scripts", "generate-all",
-        "validate", "test", "update-orchestrator", "wizard",
-        "auto-discover", "suggest-patterns", "test-version", "audit-providers"
-    ], help="Command to execute")
+    parser.add_argument("command", choices=list(COMMANDS), help="Command to execute")
     parser.add_argument("--software", nargs="+", help="Specific software names to process")
     parser.add_argument("--bucket-dir", type=Path, help="Bucket directory path")
     parser.add_argument("--scripts-dir", type=Path, help="Scripts directory path")
@@ -738,156 +1426,14 @@ def main():
                        help="Sources for auto-discovery (auto-discover command)")
     parser.add_argument("--url", type=str, help="URL to analyze for version patterns (suggest-patterns command)")
     parser.add_argument("--write-map", action="store_true", help="Write inferred provider map to scripts/providers.json (audit-providers)")
+    parser.add_argument("--refresh", action="store_true", help="Re-read every unmapped script instead of trusting the provider cache (audit-providers)")
 
     args = parser.parse_args()
 
     # Initialize automation
     automation = ScoopAutomation(args.bucket_dir, args.scripts_dir)
 
-    if args.command == "generate-manifests":
-        print("🚀 Generating manifests...")
-        manifests = automation.generate_manifests(args.software)
-        print(f"\\n✅ Generated {len(manifests)} manifests")
-
-    elif args.command == "generate-scripts":
-        print("🚀 Generating update scripts...")
-        scripts = automation.generate_update_scripts(args.software)
-        print(f"\\n✅ Generated {len(scripts)} update scripts")
-
-    elif args.command == "generate-all":
-        print("🚀 Generating manifests and update scripts...")
-        manifests = automation.generate_manifests(args.software)
-        scripts = automation.generate_update_scripts(args.software)
-        automation.update_orchestrator()
-        print(f"\\n✅ Generated {len(manifests)} manifests and {len(scripts)} scripts")
-
-    elif args.command == "validate":
-        print("🔍 Validating manifests...")
-        valid = automation.validate_manifests()
-        if valid:
-            print("✅ All manifests are valid")
-        else:
-            print("❌ Some manifests have validation errors")
-            sys.exit(1)
-
-    elif args.command == "test":
-        print("🧪 Testing update scripts...")
-        success = automation.run_tests()
-        if not success:
-            sys.exit(1)
-
-    elif args.command == "update-orchestrator":
-        print("🔄 Updating orchestrator...")
-        success = automation.update_orchestrator()
-        if not success:
-            sys.exit(1)
-
-    elif args.command == "wizard":
-        print("🧙‍♂️ Starting Configuration Wizard...")
-        automation.wizard(keep_json=args.keep_json)
-
-    elif args.command == "auto-discover":
-        print("🔍 Auto-discovering software...")
-        sources = args.sources or ["github", "chocolatey"]
-        discovered = automation.auto_discover_software(sources)
-        if discovered:
-            print(f"\\n✅ Discovered {len(discovered)} software packages:")
-            for software in discovered[:10]:  # Show first 10
-                print(f"  • {software['name']}: {software['description']}")
-            if len(discovered) > 10:
-                print(f"  ... and {len(discovered) - 10} more")
-        else:
-            print("❌ No software discovered")
-
-    elif args.command == "suggest-patterns":
-        if not args.url:
-            print("❌ --url argument is required for suggest-patterns command")
-            sys.exit(1)
-        print(f"🔍 Analyzing URL for version patterns: {args.url}")
-        patterns = automation.suggest_version_patterns(args.url)
-        if patterns:
-            print(f"\\n✅ Found {len(patterns)} potential version patterns:")
-            for pattern, confidence in patterns:
-                print(f"  • {pattern} (confidence: {confidence:.1%})")
-        else:
-            print("❌ No version patterns found")
-
-    elif args.command == "test-version":
-        print("🔍 Testing enhanced version detection...")
-        config_file = automation.scripts_dir / "software-configs.json"
-        if not config_file.exists():
-            print("❌ No software-configs.json found. Run 'wizard' command first.")
-            sys.exit(1)
-        
-        try:
-            configs = load_software_configs(config_file)
-            if args.software:
-                # Test specific software
-                configs = [c for c in configs if c.name in args.software]
-                if not configs:
-                    print(f"❌ No configurations found for: {', '.join(args.software)}")
-                    sys.exit(1)
-            
-            for config in configs:
-                print(f"\\n🔍 Testing {config.name}...")
-                version = automation.detect_version_enhanced(config)
-                if version:
-                    print(f"✅ Successfully detected version: {version}")
-                else:
-                    print(f"❌ Failed to detect version for {config.name}")
-                    
-        except Exception as e:
-            print(f"❌ Error testing version detection: {e}")
-            sys.exit(1)
-
-    elif args.command == "audit-providers":
-        print("🔎 Auditing provider classification for update scripts...")
-        providers_path = automation.scripts_dir / "providers.json"
-        try:
-            existing = {}
-            if providers_path.exists():
-                import json as _json
-                existing = _json.loads(providers_path.read_text("utf-8"))
-        except Exception:
-            existing = {}
-
-        def classify(p: Path) -> str:
-            name = p.name
-            pkg = name.replace("update-", "").replace(".py", "")
-            mapped = existing.get(name) or existing.get(pkg)
-            if isinstance(mapped, str) and mapped:
-                return mapped
-            try:
-                content = p.read_text("utf-8", errors="ignore")[:4000]
-                if ("github.com" in content) or ("api.github.com" in content):
-                    return "github"
-                if ("learn.microsoft.com" in content) or ("go.microsoft.com" in content) or ("download.microsoft.com" in content) or ("visualstudio.microsoft.com" in content):
-                    return "microsoft"
-                if ("googleapis.com" in content) or ("storage.googleapis.com" in content) or ("dl.google.com" in content) or ("cloudfront.net" in content):
-                    return "google"
-                return "other"
-            except Exception:
-                return "other"
-
-        scripts = sorted([p for p in automation.scripts_dir.glob("update-*.py") if p.name != "update-all.py"])
-        inferred = {}
-        counts = {"github": 0, "microsoft": 0, "google": 0, "other": 0}
-        for p in scripts:
-            prov = classify(p)
-            inferred[p.name] = prov
-            counts[prov] += 1
-            print(f"  • {p.name}: {prov}")
-        print(f"\nTotals → GitHub: {counts['github']} | Microsoft: {counts['microsoft']} | Google: {counts['google']} | Other: {counts['other']}")
-
-        if args.write_map:
-            try:
-                import json as _json
-                merged = dict(existing)
-                merged.update(inferred)
-                providers_path.write_text(_json.dumps(merged, indent=2, ensure_ascii=False), encoding="utf-8")
-                print(f"✅ Wrote providers map: {providers_path}")
-            except Exception as e:
-                print(f"⚠️  Failed to write providers map: {e}")
+    COMMANDS[args.command](automation, args)
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,17 @@
 import requests
 import re
+from requests.adapters import HTTPAdapter
+
+# One pooled session, so re-running the lookup (e.g. from a REPL) reuses the TLS connection
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = "scoop-alts"
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 url = "https://github.com/Alex313031/Thorium-Win/releases"
-response = requests.get(url)
-content = response.text
+response = SESSION.get(url, timeout=15)
+content = response.content  # raw bytes: the page is never decoded to str
 
-regex = r"releases/tag/M([\d.]+)"
-matches = re.findall(regex, content)
+# Tags are ASCII; a bytes pattern scans the body as-is
+TAG_PATTERN = re.compile(rb"releases/tag/M([\d.]+)", re.ASCII)
+matches = [m.decode("ascii") for m in TAG_PATTERN.findall(content)]
 print("Matches:", matches)
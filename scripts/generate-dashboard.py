@@ -3,6 +3,12 @@ import json
 import sys
 from pathlib import Path
 
+# Optional C JSON parser for large summaries
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 
 def main():
     if len(sys.argv) < 3:
@@ -13,27 +19,27 @@ def main():
     if not summary_path.exists():
         print(f"Summary not found: {summary_path}")
         sys.exit(1)
-    data = json.loads(summary_path.read_text("utf-8"))
-    lines = []
-    lines.append("# Update Health Dashboard")
-    lines.append("")
+    data = orjson.loads(summary_path.read_bytes()) if orjson else json.loads(summary_path.read_text("utf-8"))
     counts = data.get("counts", {})
-    lines.append(f"- Total: {counts.get('total', 0)}")
-    lines.append(f"- Successful: {counts.get('successful', 0)}")
-    lines.append(f"- Failed: {counts.get('failed', 0)}")
-    lines.append(f"- Updated: {counts.get('updated', 0)}")
-    lines.append("")
-    lines.append("| Package | Version | Success | Updated | Duration (s) |")
-    lines.append("|---|---|---|---|---|")
-    for r in data.get("results", []):
-        pkg = r.get("package", "")
-        version = r.get("version", "")
-        success = str(r.get("success", False))
-        updated = str(r.get("updated", False))
-        dur = r.get("duration_seconds", 0)
-        lines.append(f"| {pkg} | {version} | {success} | {updated} | {dur} |")
+    header = "\n".join([
+        "# Update Health Dashboard",
+        "",
+        f"- Total: {counts.get('total', 0)}",
+        f"- Successful: {counts.get('successful', 0)}",
+        f"- Failed: {counts.get('failed', 0)}",
+        f"- Updated: {counts.get('updated', 0)}",
+        "",
+        "| Package | Version | Success | Updated | Duration (s) |",
+        "|---|---|---|---|---|",
+    ])
+    rows = (
+        f"| {r.get('package', '')} | {r.get('version', '')} | "
+        f"{'True' if r.get('success') else 'False'} | {'True' if r.get('updated') else 'False'} | "
+        f"{r.get('duration_seconds', 0)} |"
+        for r in data.get("results", [])
+    )
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    output_path.write_bytes("\n".join([header, *rows]).encode("utf-8"))
     print(f"Wrote: {output_path}")
 
 
@@ -9,7 +9,13 @@ import subprocess
 from pathlib import Path
 import json
 import logging
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+# Optional C JSON parser for manifest reads
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -48,32 +54,60 @@ REPO_ROOT = _detect_repo_root()
 BUCKET_DIR = REPO_ROOT / 'bucket'
 MANIFEST_EXTENSION = '.json'
 
-def run_git_command(args, cwd: Path = None):
-    """Run a git command and return (returncode, stdout, stderr)."""
+def run_git_command(args, cwd: Path = None, input: Optional[str] = None, discard_stdout: bool = False):
+    """Run a git command and return (returncode, stdout, stderr). input is fed to stdin.
+
+    discard_stdout sends stdout to DEVNULL (returned as "") for commands whose output is
+    never read; stderr is always captured for diagnostics.
+    """
     if cwd is None:
         cwd = REPO_ROOT
     try:
         result = subprocess.run(
             args,
-            capture_output=True,
+            stdout=subprocess.DEVNULL if discard_stdout else subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
             cwd=str(cwd),
+            input=input,
             encoding="utf-8",
             errors="replace"  # Handle encoding errors gracefully
         )
-        return result.returncode, result.stdout.strip(), result.stderr.strip()
+        return result.returncode, (result.stdout or "").strip(), result.stderr.strip()
     except Exception as e:
         logger.error(f"Git command failed: {e}")
         return 1, "", str(e)
 
+def _porcelain_status(out: str) -> Optional[str]:
+    """Status of the first entry in `git status --porcelain=v2` output.
+
+    "?" untracked, "A" staged as new, "M" any other change, None when clean.
+    """
+    lines = out.strip().splitlines()
+    if not lines:
+        return None
+    line = lines[0]
+    if line.startswith("?"):
+        return "?"
+    fields = line.split(" ", 2)
+    return "A" if line[0] in "12u" and len(fields) > 1 and fields[1].startswith("A") else "M"
+
+def _manifest_commit_message(app_name: str, new_file: bool, version_str: str) -> str:
+    if new_file:
+        return f"{app_name}: Add version {version_str}" if version_str else f"{app_name}: Add manifest"
+    return f"{app_name}: Update to version {version_str}" if version_str else f"{app_name}: Update manifest"
+
 def get_manifest_version_from_file(manifest_path: Path) -> str:
     """Read version field from a manifest JSON file."""
     try:
-        with open(manifest_path, "r", encoding="utf-8") as f:
-            manifest = json.load(f)
-            version = str(manifest.get("version", "")).strip()
-            logger.debug(f"Found version '{version}' in {manifest_path}")
-            return version
+        if orjson is not None:
+            manifest = orjson.loads(Path(manifest_path).read_bytes())
+        else:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        version = str(manifest.get("version", "")).strip()
+        logger.debug(f"Found version '{version}' in {manifest_path}")
+        return version
     except FileNotFoundError:
         logger.error(f"Manifest file not found: {manifest_path}")
         return ""
@@ -94,33 +128,27 @@ def commit_manifest_change(app_name: str, manifest_path: str, push: bool = False
         print(f"⚠️  Auto-commit skipped: manifest not found: {manifest_path}")
         return False
 
-    # Stage the manifest file
-    rc, out, err = run_git_command(["git", "add", str(p)])
+    # One status call tells clean / new / modified; only untracked files need a git add,
+    # since a commit limited to a tracked path takes its working-tree content directly
+    rc, st_out, st_err = run_git_command(["git", "status", "--porcelain=v2", "--", str(p)])
     if rc != 0:
-        print(f"⚠️  git add failed: {err or out}")
-        return False
-
-    # Check if there are staged changes for this path
-    rc, ns_out, ns_err = run_git_command(["git", "diff", "--cached", "--name-status", "--", str(p)])
-    if rc != 0:
-        print(f"⚠️  git diff --cached failed: {ns_err or ns_out}")
+        print(f"⚠️  git status failed: {st_err or st_out}")
         return False
 
-    if not ns_out.strip():
-        print(f"ℹ️  No staged changes for {app_name}, skipping commit.")
+    status = _porcelain_status(st_out)
+    if status is None:
+        print(f"ℹ️  No changes for {app_name}, skipping commit.")
         return False
 
-    status_line = ns_out.strip().splitlines()[0]
-    status_code = status_line.split("\t", 1)[0] if "\t" in status_line else ""
-    new_file = status_code.startswith("A")
+    if status == "?":
+        rc, out, err = run_git_command(["git", "add", "--", str(p)], discard_stdout=True)
+        if rc != 0:
+            print(f"⚠️  git add failed: {err or out}")
+            return False
 
-    version_str = get_manifest_version_from_file(p)
-    if new_file:
-        msg = f"{app_name}: Add version {version_str}" if version_str else f"{app_name}: Add manifest"
-    else:
-        msg = f"{app_name}: Update to version {version_str}" if version_str else f"{app_name}: Update manifest"
+    msg = _manifest_commit_message(app_name, status in ("?", "A"), get_manifest_version_from_file(p))
 
-    rc, out, err = run_git_command(["git", "commit", "-m", msg])
+    rc, out, err = run_git_command(["git", "commit", "-q", "-F", "-", "--", str(p)], input=msg)
     if rc != 0:
         reason = err or out
         if "nothing to commit" in reason.lower():
@@ -135,9 +163,70 @@ def commit_manifest_change(app_name: str, manifest_path: str, push: bool = False
 
     return True
 
+def stage_manifests(paths: List[Path]) -> Dict[Path, str]:
+    """Stage manifests with one git add and report them with one git diff-index --cached.
+
+    Returns {path: status letter ("A", "M", ...)} for the given paths that have staged changes.
+    """
+    if not paths:
+        return {}
+    names = [str(p) for p in paths]
+
+    rc, out, err = run_git_command(["git", "add", "--", *names], discard_stdout=True)
+    if rc != 0:
+        print(f"⚠️  git add failed: {err or out}")
+        return {}
+
+    rc, out, err = run_git_command(["git", "diff-index", "--cached", "--name-status", "HEAD", "--", *names])
+    if rc != 0:
+        print(f"⚠️  git diff-index --cached failed: {err or out}")
+        return {}
+
+    # diff paths are relative to the repository root; map them back to the caller's paths
+    wanted = {Path(p).resolve(): Path(p) for p in paths}
+    staged: Dict[Path, str] = {}
+    for line in out.splitlines():
+        parts = line.strip().split("\t")
+        if len(parts) >= 2 and (p := wanted.get((REPO_ROOT / parts[-1]).resolve())) is not None:
+            staged[p] = parts[0][:1]
+    return staged
+
+def commit_many(entries: List[Tuple[str, Path, str]], push: bool = False) -> bool:
+    """Stage and commit several manifests as one commit. Optionally push.
+
+    entries are (app_name, manifest_path, version); an empty version is read from the
+    manifest. Manifests without changes are left out. Returns True if a commit was created.
+
+    Library API for update scripts that refresh several manifests at once; update-all.py
+    builds its own batch message from stage_manifests.
+    """
+    staged = stage_manifests([Path(p) for _, p, _ in entries])
+
+    lines, committed = [], []
+    for app_name, manifest_path, version in entries:
+        status = staged.get(Path(manifest_path))
+        if status is None:
+            continue
+        version = version or get_manifest_version_from_file(Path(manifest_path))
+        lines.append(_manifest_commit_message(app_name, status == "A", version))
+        committed.append(app_name)
+
+    if not lines:
+        print("ℹ️  No staged manifest changes to commit.")
+        return False
+
+    message = lines[0] if len(lines) == 1 else "\n".join([f"update ({len(lines)}): {', '.join(committed)}", "", *lines])
+    if not commit_with_message(message, [p for p in staged]):
+        return False
+
+    if push:
+        push_changes()
+
+    return True
+
 def push_changes():
     """Push committed changes to the remote."""
-    rc, out, err = run_git_command(["git", "push"])
+    rc, out, err = run_git_command(["git", "push", "-q"], discard_stdout=True)
     if rc != 0:
         print(f"⚠️  git push failed: {err or out}")
     else:
@@ -145,7 +234,7 @@ def push_changes():
 
 def stage_bucket_changes() -> None:
     """Stage changes inside the bucket directory."""
-    rc, out, err = run_git_command(["git", "add", "bucket"])
+    rc, out, err = run_git_command(["git", "add", "bucket"], discard_stdout=True)
     if rc != 0:
         print(f"⚠️  git add failed: {err or out}")
 
@@ -200,9 +289,14 @@ def list_untracked_manifests() -> List[Tuple[str, Path]]:
                  
     return results
 
-def commit_with_message(message: str) -> bool:
-    """Create a commit with the given message. Returns True if commit succeeded."""
-    rc, out, err = run_git_command(["git", "commit", "-m", message])
+def commit_with_message(message: str, paths: Optional[List[Path]] = None) -> bool:
+    """Create a commit with the given message, limited to paths when given.
+
+    The message is passed on stdin, so multi-line messages are kept as-is.
+    Returns True if commit succeeded.
+    """
+    pathspec = ["--", *(str(p) for p in paths)] if paths else []
+    rc, out, err = run_git_command(["git", "commit", "-F", "-", *pathspec], input=message)
     if rc != 0:
         reason = err or out
         if "nothing to commit" in reason.lower():
@@ -4,24 +4,58 @@ Scoop Manifest Generator
 Automatically generates Scoop JSON manifests from software configuration.
 """
 
+import functools
 import json
 import re
+import threading
 import requests
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import urljoin, urlparse
 import hashlib
 from dataclasses import dataclass, asdict
 from version_detector import VersionDetector, SoftwareConfig, SoftwareVersionConfig, get_version_info
 
+# Optional C JSON parser for the config file; its decode errors subclass json.JSONDecodeError
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 # SoftwareConfig is now imported from version_detector.py
 
+GENERATE_WORKERS = 8  # concurrent manifest builds; each mostly waits on page fetches and download hashing
+
+
+def _with_version(value: Any, version: str) -> Any:
+    """Replace $version in a string or a (nested) list of strings; other values pass through.
+
+    Plain str.replace on purpose: install scripts carry PowerShell variables ($dir,
+    $persist_dir) that string.Template would reject or rewrite.
+    """
+    if isinstance(value, str):
+        return value.replace("$version", version) if "$version" in value else value
+    if isinstance(value, list):
+        return [_with_version(item, version) for item in value]
+    return value
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern:
+    """Compile a config-supplied regex once per pattern string (case-insensitive)."""
+    return re.compile(pattern, re.IGNORECASE)
+
 class ManifestGenerator:
     """Generate Scoop manifests from software configurations"""
     
     def __init__(self, bucket_dir: Path = None):
         self.bucket_dir = bucket_dir or Path(__file__).parent.parent / "bucket"
         self.detector = VersionDetector()  # Use shared detector with session
+        # get_version_info lookups for this generator, keyed by what the lookup reads (homepage,
+        # patterns, template). One Future per key: concurrent callers wait for the first lookup
+        self._version_info_cache: Dict[Tuple[str, Tuple[str, ...], str], Future] = {}
+        self._version_info_lock = threading.Lock()
 
     def fetch_version_info_legacy(self, config: SoftwareConfig) -> tuple[str, str]:
         """Legacy method for backward compatibility"""
@@ -31,7 +65,7 @@ class ManifestGenerator:
             content = response.text
             
             # Extract version using regex
-            version_match = re.search(config.version_regex, content, re.IGNORECASE)
+            version_match = _compile(config.version_regex).search(content)
             if not version_match:
                 raise ValueError(f"Version not found with regex: {config.version_regex}")
             
@@ -42,7 +76,7 @@ class ManifestGenerator:
                 download_url = config.download_url_template.replace("$version", version)
             else:
                 # Try to find download link in content
-                url_match = re.search(config.url_pattern, content, re.IGNORECASE)
+                url_match = _compile(config.url_pattern).search(content)
                 if url_match:
                     download_url = url_match.group(0)
                     if not download_url.startswith('http'):
@@ -55,8 +89,8 @@ class ManifestGenerator:
         except Exception as e:
             raise Exception(f"Failed to fetch version info: {e}")
 
-    def fetch_version_info(self, config: SoftwareConfig) -> tuple[str, str]:
-        """Fetch latest version and download URL using shared version detector"""
+    def _resolve_version(self, config: SoftwareConfig) -> Optional[Dict[str, Any]]:
+        """Run the shared version detector once; version, download_url and hash, or None."""
         try:
             # Convert SoftwareConfig to SoftwareVersionConfig
             version_patterns = [config.version_regex] if config.version_regex else []
@@ -72,18 +106,32 @@ class ManifestGenerator:
                 shortcuts=config.shortcuts or []
             )
             
-            # Use shared version detection
-            version_info = get_version_info(version_config)
-            if not version_info:
-                # Fall back to legacy method if shared method fails
-                print("⚠️  Shared version detection failed, falling back to legacy method")
-                return self.fetch_version_info_legacy(config)
-            
-            return version_info['version'], version_info['download_url']
+            key = (version_config.homepage, tuple(version_patterns), version_config.download_url_template)
+            with self._version_info_lock:
+                future = self._version_info_cache.get(key)
+                owner = future is None
+                if owner:
+                    future = self._version_info_cache[key] = Future()
+            if owner:
+                try:
+                    future.set_result(get_version_info(version_config, self.detector))
+                except Exception as e:
+                    future.set_exception(e)
+            return future.result()
             
         except Exception as e:
-            print(f"⚠️  Shared version detection error: {e}, falling back to legacy method")
+            print(f"⚠️  Shared version detection error: {e}")
+            return None
+
+    def fetch_version_info(self, config: SoftwareConfig) -> tuple[str, str]:
+        """Fetch latest version and download URL using shared version detector"""
+        version_info = self._resolve_version(config)
+        if not version_info:
+            # Fall back to legacy method if shared method fails
+            print("⚠️  Shared version detection failed, falling back to legacy method")
             return self.fetch_version_info_legacy(config)
+        
+        return version_info['version'], version_info['download_url']
 
     # validate_url and calculate_hash methods are now available in VersionDetector
 
@@ -91,32 +139,16 @@ class ManifestGenerator:
         """Generate complete Scoop manifest"""
         print(f"🔍 Generating manifest for {config.name}...")
         
-        # Try to use shared version detection first
-        try:
-            version_patterns = [config.version_regex] if config.version_regex else []
-            version_config = SoftwareVersionConfig(
-                name=config.name,
-                homepage=config.homepage,
-                version_patterns=version_patterns,
-                download_url_template=config.download_url_template,
-                description=config.description,
-                license=config.license,
-                bin_name=config.bin_name,
-                shortcuts=config.shortcuts or []
-            )
-            
-            version_info = get_version_info(version_config)
-            if version_info:
-                version = version_info['version']
-                download_url = version_info['download_url']
-                file_hash = version_info['hash']
-            else:
-                raise Exception("Shared version detection failed")
-                
-        except Exception as e:
-            print(f"⚠️  Using legacy method: {e}")
-            # Fall back to legacy method
-            version, download_url = self.fetch_version_info(config)
+        # Try to use shared version detection first; it runs once, the fallback goes
+        # straight to the legacy scraper
+        version_info = self._resolve_version(config)
+        if version_info:
+            version = version_info['version']
+            download_url = version_info['download_url']
+            file_hash = version_info['hash']
+        else:
+            print("⚠️  Shared version detection failed, using legacy method")
+            version, download_url = self.fetch_version_info_legacy(config)
             print(f"✅ Found version: {version}")
             print(f"📦 Download URL: {download_url}")
             
@@ -137,19 +169,7 @@ class ManifestGenerator:
         
         # Add binary name
         if config.bin_name:
-            if isinstance(config.bin_name, list):
-                processed_bin = []
-                for item in config.bin_name:
-                    if isinstance(item, list):
-                        processed_bin.append([str(s).replace("$version", version) for s in item])
-                    elif isinstance(item, str):
-                        processed_bin.append(item.replace("$version", version))
-                    else:
-                        processed_bin.append(item)
-                manifest["bin"] = processed_bin
-            else:
-                bin_name = config.bin_name.replace("$version", version)
-                manifest["bin"] = bin_name
+            manifest["bin"] = _with_version(config.bin_name, version)
         else:
             # Extract from URL
             filename = urlparse(download_url).path.split('/')[-1]
@@ -157,11 +177,7 @@ class ManifestGenerator:
         
         # Add shortcuts
         if config.shortcuts:
-            shortcuts = []
-            for shortcut in config.shortcuts:
-                processed_shortcut = [s.replace("$version", version) for s in shortcut]
-                shortcuts.append(processed_shortcut)
-            manifest["shortcuts"] = shortcuts
+            manifest["shortcuts"] = _with_version(config.shortcuts, version)
         
         # Add installer type
         if config.installer_type:
@@ -169,28 +185,23 @@ class ManifestGenerator:
         
         # Add extract directory
         if config.extract_dir:
-            manifest["extract_dir"] = config.extract_dir.replace("$version", version)
+            manifest["extract_dir"] = _with_version(config.extract_dir, version)
         
         # Add pre/post install scripts
         if config.pre_install:
-            manifest["pre_install"] = [cmd.replace("$version", version) for cmd in config.pre_install]
+            manifest["pre_install"] = _with_version(config.pre_install, version)
         
         if config.post_install:
-            manifest["post_install"] = [cmd.replace("$version", version) for cmd in config.post_install]
+            manifest["post_install"] = _with_version(config.post_install, version)
         # Add uninstaller script if provided
-        if getattr(config, "uninstaller_script", None):
+        if config.uninstaller_script:
             manifest["uninstaller"] = {
-                "script": [cmd.replace("$version", version) for cmd in config.uninstaller_script]
+                "script": _with_version(config.uninstaller_script, version)
             }
         
         # Add persist (string or list)
-        if getattr(config, "persist", None):
-            if isinstance(config.persist, list):
-                manifest["persist"] = [p.replace("$version", version) if isinstance(p, str) else p for p in config.persist]
-            elif isinstance(config.persist, str):
-                manifest["persist"] = config.persist.replace("$version", version)
-            else:
-                manifest["persist"] = config.persist
+        if config.persist:
+            manifest["persist"] = _with_version(config.persist, version)
         
         # Add architecture-specific configs
         if config.architecture:
@@ -199,7 +210,7 @@ class ManifestGenerator:
         # Add checkver and autoupdate
         manifest["checkver"] = {
             "url": config.homepage,
-            "regex": config.version_regex.replace("([\\d\\.]+)", "([\\d\\.]+)")
+            "regex": config.version_regex
         }
         
         if config.download_url_template:
@@ -209,21 +220,44 @@ class ManifestGenerator:
         
         return manifest
 
+    def generate_and_save_all(
+        self, configs: List[SoftwareConfig]
+    ) -> List[Tuple[SoftwareConfig, Optional[Path], Optional[Exception]]]:
+        """Generate and save manifests for configs concurrently.
+
+        Returns (config, saved path or None, error or None) per config, in config order.
+        """
+        def build(config: SoftwareConfig):
+            try:
+                return config, self.save_manifest(config, self.generate_manifest(config)), None
+            except Exception as e:
+                return config, None, e
+
+        if len(configs) <= 1:
+            return [build(config) for config in configs]
+        with ThreadPoolExecutor(max_workers=min(GENERATE_WORKERS, len(configs))) as executor:
+            return list(executor.map(build, configs))
+
     def save_manifest(self, config: SoftwareConfig, manifest: Dict[str, Any]) -> Path:
         """Save manifest to JSON file"""
         filename = f"{config.name}.json"
         filepath = self.bucket_dir / filename
         
+        # Bucket manifests use 4-space indents, which orjson cannot emit; serialize in one
+        # dumps() call and one write rather than json.dump's many small writes
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=4, ensure_ascii=False)
+            f.write(json.dumps(manifest, indent=4, ensure_ascii=False))
         
         print(f"💾 Saved manifest: {filepath}")
         return filepath
 
 def load_software_configs(config_file: Path) -> List[SoftwareConfig]:
     """Load software configurations from JSON file"""
-    with open(config_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if orjson is not None:
+        data = orjson.loads(Path(config_file).read_bytes())
+    else:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
     configs = []
     for item in data.get('software', []):
@@ -260,13 +294,11 @@ def main():
         configs = example_configs
     
     # Generate manifests
-    for config in configs:
-        try:
-            manifest = generator.generate_manifest(config)
-            generator.save_manifest(config, manifest)
+    for config, _, error in generator.generate_and_save_all(configs):
+        if error is None:
             print(f"✅ Successfully generated manifest for {config.name}")
-        except Exception as e:
-            print(f"❌ Failed to generate manifest for {config.name}: {e}")
+        else:
+            print(f"❌ Failed to generate manifest for {config.name}: {error}")
         print("-" * 50)
 
 if __name__ == "__main__":
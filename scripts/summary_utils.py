@@ -1,26 +1,20 @@
+from itertools import islice
 from typing import Dict, Any
 
+# Webhook type -> key that carries the message text
+_WEBHOOK_BODY_KEYS = {"slack": "text", "discord": "content"}
+
 def format_webhook_body(payload: Dict[str, Any], webhook_type: str) -> Dict[str, Any]:
-    if webhook_type == "slack":
-        counts = payload.get("counts", {})
-        updated = [r for r in payload.get("results", []) if r.get("updated")]
-        lines = [
-            "Scoop Update Summary",
-            f"Total: {counts.get('total', 0)} | Success: {counts.get('successful', 0)} | Failed: {counts.get('failed', 0)} | Updated: {counts.get('updated', 0)}",
-        ]
-        if updated:
-            first = ", ".join([f"{u.get('package','')} {u.get('version','')}".strip() for u in updated[:10]])
-            lines.append(f"Updated: {first}")
-        return {"text": "\n".join(lines)}
-    if webhook_type == "discord":
-        counts = payload.get("counts", {})
-        updated = [r for r in payload.get("results", []) if r.get("updated")]
-        lines = [
-            "Scoop Update Summary",
-            f"Total: {counts.get('total', 0)} | Success: {counts.get('successful', 0)} | Failed: {counts.get('failed', 0)} | Updated: {counts.get('updated', 0)}",
-        ]
-        if updated:
-            first = ", ".join([f"{u.get('package','')} {u.get('version','')}".strip() for u in updated[:10]])
-            lines.append(f"Updated: {first}")
-        return {"content": "\n".join(lines)}
-    return payload
+    key = _WEBHOOK_BODY_KEYS.get(webhook_type)
+    if key is None:
+        return payload
+    counts = payload.get("counts", {})
+    lines = [
+        "Scoop Update Summary",
+        f"Total: {counts.get('total', 0)} | Success: {counts.get('successful', 0)} | Failed: {counts.get('failed', 0)} | Updated: {counts.get('updated', 0)}",
+    ]
+    # Only the first 10 updated results are listed; stop scanning once they are found
+    updated = list(islice((r for r in payload.get("results", ()) if r.get("updated")), 10))
+    if updated:
+        lines.append("Updated: " + ", ".join([f"{u.get('package','')} {u.get('version','')}".strip() for u in updated]))
+    return {key: "\n".join(lines)}
@@ -7,9 +7,13 @@ Runs all update scripts for the scoop-alts bucket and provides a summary report.
 from __future__ import annotations
 
 import argparse
+import asyncio
+import atexit
 import codecs
 import concurrent.futures
+import contextlib
 import importlib.util
+import io
 import json
 import logging
 import os
@@ -18,18 +22,18 @@ import subprocess
 import sys
 import threading
 import time
-from collections import Counter
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set, Any
 
 from git_helpers import (
-    run_git_command,
     stage_bucket_changes,
     get_staged_bucket_changes,
     commit_with_message,
     push_changes,
+    stage_manifests,
     list_untracked_manifests,
 )
 
@@ -57,6 +61,8 @@ REPO_ROOT = SCRIPTS_DIR.parent
 DEFAULT_TIMEOUT = int(os.environ.get('SCOOP_UPDATE_TIMEOUT', '120'))
 DEFAULT_WORKERS = int(os.environ.get('SCOOP_UPDATE_WORKERS', '6'))
 DEFAULT_RETRY_ATTEMPTS = int(os.environ.get('SCOOP_RETRY_ATTEMPTS', '0'))
+OUTPUT_TAIL_LINES = 200  # lines kept per script stream; the structured JSON result comes last
+MAX_IO_BOUND_WORKERS = 32  # --fast ceiling for network-bound scripts; provider throttles still apply
 
 # Provider-specific rate limiting
 MAX_GITHUB_WORKERS = int(os.environ.get('MAX_GITHUB_WORKERS', '3'))
@@ -70,11 +76,13 @@ LOG_DATE_FORMAT = '%H:%M:%S'
 
 # File and directory constants
 BUCKET_DIR = REPO_ROOT / 'bucket'
-SCRIPTS_GLOB = 'update-*.py'
+SCRIPTS_PREFIX = 'update-'  # update scripts are update-*.py
+SCRIPTS_SUFFIX = '.py'
 MANIFEST_EXTENSION = '.json'
 MAX_MANIFEST_SIZE = 10 * 1024 * 1024  # 10MB max manifest file size
 
 # Cache configuration
+DURATIONS_FILE = SCRIPTS_DIR / '.cache' / 'update-durations.json'  # last run time per script, for scheduling
 CACHE_EXPIRY_SECONDS = int(os.environ.get('CACHE_EXPIRY_SECONDS', '1800'))
 
 # Provider Domain Constants
@@ -87,9 +95,19 @@ GOOGLE_DOMAINS = frozenset({
     'dl.google.com', 'cloudfront.net'
 })
 
+# Script output classification: the structured result line, then plain-text fallbacks.
+# Case-insensitive patterns scan the output in C without building a lowered copy.
+_STRUCTURED_RESULT_RE = re.compile(r'\{.*"updated"\s*:\s*(true|false|null).*\}', re.DOTALL)
+_UPDATED_RE = re.compile(r"update completed successfully|updated", re.IGNORECASE)
+_NO_UPDATE_RE = re.compile(r"no update needed|up to date", re.IGNORECASE)
+
 # Cache manifest versions in-memory
 MANIFEST_VERSION_CACHE: Dict[str, str] = {}
 PREFER_STRUCTURED_OUTPUT = False
+RUN_IN_PROCESS = False  # --in-process: import update scripts and call main() instead of spawning Python
+USE_PROCESS_POOL = False  # --process-pool: in-process runs go to persistent worker processes
+_PROCESS_POOL: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_CHILD_ENV: Optional[Dict[str, str]] = None  # shared by every script process once main() freezes it
 
 @dataclass
 class UpdateResult:
@@ -99,6 +117,7 @@ class UpdateResult:
     output: str
     duration: float
     updated: bool = False
+    abandoned: bool = False  # in-process timeout: main() may still be running, so never retried
 
 def get_manifest_version(app_name: str) -> str:
     """Return version string from bucket/<app_name>.json if available, using cache."""
@@ -127,40 +146,40 @@ def get_manifest_version(app_name: str) -> str:
         return ""
 
 def stage_and_commit_per_package(updated_results: List[UpdateResult]) -> None:
-    """Stage and commit changes per updated package manifest under bucket/."""
+    """Stage and commit changes per updated package manifest under bucket/.
+
+    All manifests are staged and checked with one git add and one git diff; each package
+    still gets its own commit, limited to its manifest.
+    """
+    packages = {}
     for r in updated_results:
         pkg = r.script_name.replace('update-', '').replace('.py', '')
         manifest_path = BUCKET_DIR / f"{pkg}{MANIFEST_EXTENSION}"
+        if manifest_path.exists():
+            packages[manifest_path] = (pkg, r.script_name)
 
-        if not manifest_path.exists():
-            continue
-
-        rc, out, err = run_git_command(["git", "add", str(manifest_path)])
-        if rc != 0:
-            print(f"⚠️  git add {manifest_path} failed: {err or out}")
-            continue
-
-        rc, ns_out, _ = run_git_command(["git", "diff", "--cached", "--name-status", "--", str(manifest_path)])
-        if not ns_out.strip():
+    staged = stage_manifests(list(packages))
+    for manifest_path, (pkg, script_name) in packages.items():
+        status_code = staged.get(manifest_path)
+        if status_code is None:
             print(f"ℹ️  No staged changes for {pkg}, skipping commit.")
             continue
-            
-        status_line = ns_out.strip().splitlines()[0]
-        status_code = status_line.split("\t", 1)[0] if "\t" in status_line else ""
-        new_file = status_code.startswith("A")
 
         version_str = get_manifest_version(pkg)
-        action = "Add" if new_file else "Update to"
-        msg = f"{pkg}: {action} version {version_str} (script: {r.script_name})" if version_str else f"{pkg}: {action} manifest (script: {r.script_name})"
-        commit_with_message(msg)
+        action = "Add" if status_code == "A" else "Update to"
+        msg = f"{pkg}: {action} version {version_str} (script: {script_name})" if version_str else f"{pkg}: {action} manifest (script: {script_name})"
+        commit_with_message(msg, [manifest_path])
 
 def discover_update_scripts() -> List[str]:
     """Automatically discover all update-*.py scripts in the scripts directory"""
-    scripts = sorted(
-        f.name for f in SCRIPTS_DIR.glob(SCRIPTS_GLOB)
-        if f.name not in {"update-all.py", "update-script-generator.py"} 
-        and not f.name.startswith("_")
-    )
+    # scandir yields names with their d_type; nothing is stat'ed or wrapped in Path
+    with os.scandir(SCRIPTS_DIR) as entries:
+        scripts = sorted(
+            e.name for e in entries
+            if e.name.startswith(SCRIPTS_PREFIX) and e.name.endswith(SCRIPTS_SUFFIX)
+            and e.name != "update-all.py"
+            and e.is_file()
+        )
     
     print(f"🔍 Discovered {len(scripts)} update scripts:")
     for script in scripts:
@@ -174,7 +193,7 @@ def parse_script_output(output: str, script_name: str) -> Tuple[bool, bool]:
     
     # Fast regex search for JSON result
     # Look for {"updated": true/false...} pattern
-    if match := re.search(r'\{.*"updated"\s*:\s*(true|false|null).*\}', output, re.DOTALL):
+    if match := _STRUCTURED_RESULT_RE.search(output):
         try:
             parsed = json.loads(match.group(0))
             if isinstance(parsed, dict) and 'updated' in parsed:
@@ -208,78 +227,330 @@ def parse_script_output(output: str, script_name: str) -> Tuple[bool, bool]:
     if PREFER_STRUCTURED_OUTPUT:
         return False, False
         
-    lower = output.lower()
-    updated = "update completed successfully" in lower or "updated" in lower
-    no_update_needed = "no update needed" in lower or "up to date" in lower
+    updated = _UPDATED_RE.search(output) is not None
+    no_update_needed = _NO_UPDATE_RE.search(output) is not None
 
     return updated, no_update_needed
 
+def _script_result(script_name: str, returncode: int, stdout: str, stderr: str, duration: float) -> UpdateResult:
+    """Report a finished update script and turn its exit code and output into an UpdateResult."""
+    output = stdout + stderr
+    updated, no_update_needed = parse_script_output(output, script_name)
+
+    if returncode == 0:
+        if updated:
+            print(f"✅ {script_name} - Updated successfully ({duration:.1f}s)")
+            logging.info(f"{script_name} updated successfully")
+        elif no_update_needed:
+            print(f"ℹ️  {script_name} - No update needed ({duration:.1f}s)")
+            logging.info(f"{script_name} no update needed")
+        else:
+            print(f"✅ {script_name} - Completed ({duration:.1f}s)")
+            logging.info(f"{script_name} completed without updates")
+
+        return UpdateResult(script_name, True, output, duration, updated)
+
+    error_msg = stderr.strip() or 'Unknown error'
+    stdout_msg = stdout.strip()
+    detailed_error = f"Exit code: {returncode}\nSTDERR: {error_msg}\nSTDOUT: {stdout_msg}"
+    logging.error(f"{script_name} failed: {detailed_error}")
+    print(f"❌ {script_name} - Failed ({duration:.1f}s)")
+    print(f"   Error details: {detailed_error}")
+    return UpdateResult(script_name, False, detailed_error, duration, False)
+
+def _child_env() -> Dict[str, str]:
+    """Environment for update script processes: the frozen shared dict, or a fresh snapshot."""
+    if _CHILD_ENV is not None:
+        return _CHILD_ENV
+    return {**os.environ, 'PYTHONIOENCODING': 'utf-8'}
+
+def _timeout_result(script_name: str, timeout: int, duration: float, abandoned: bool = False) -> UpdateResult:
+    logging.error(f"{script_name} timed out after {timeout}s")
+    print(f"⏰ {script_name} - Timeout after {timeout}s")
+    return UpdateResult(script_name, False, f"Script timed out after {timeout} seconds", duration, False, abandoned)
+
 def run_update_script(script_path: Path, timeout: int = 300) -> UpdateResult:
     """Run a single update script and return the result."""
+    if RUN_IN_PROCESS:
+        return run_update_script_in_process(script_path, timeout)
+
     script_name = script_path.name
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
         logging.info(f"Running {script_name}...")
         print(f"🚀 Running {script_name}...")
 
-        env = os.environ.copy()
-        env['PYTHONIOENCODING'] = 'utf-8'
-
-        result = subprocess.run(
+        # Stream both pipes line by line and keep only their tails, so a chatty script
+        # never sits in memory whole. Lines stay bytes: only the kept tail is ever decoded
+        out_tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+        err_tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+        with subprocess.Popen(
             [sys.executable, str(script_path)],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             cwd=SCRIPTS_DIR.parent,
-            encoding='utf-8',
-            errors='replace',
-            env=env
+            env=_child_env()
+        ) as proc:
+            readers = [
+                threading.Thread(target=tail.extend, args=(stream,), daemon=True)
+                for stream, tail in ((proc.stdout, out_tail), (proc.stderr, err_tail))
+            ]
+            for reader in readers:
+                reader.start()
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise
+            finally:
+                for reader in readers:
+                    reader.join(5)
+
+        return _script_result(
+            script_name, proc.returncode,
+            b''.join(out_tail).decode('utf-8', 'replace'), b''.join(err_tail).decode('utf-8', 'replace'),
+            time.perf_counter() - start_time
         )
 
-        duration = time.time() - start_time
-        output = result.stdout + result.stderr
-        updated, no_update_needed = parse_script_output(output, script_name)
-
-        if result.returncode == 0:
-            if updated:
-                print(f"✅ {script_name} - Updated successfully ({duration:.1f}s)")
-                logging.info(f"{script_name} updated successfully")
-            elif no_update_needed:
-                print(f"ℹ️  {script_name} - No update needed ({duration:.1f}s)")
-                logging.info(f"{script_name} no update needed")
-            else:
-                print(f"✅ {script_name} - Completed ({duration:.1f}s)")
-                logging.info(f"{script_name} completed without updates")
+    except subprocess.TimeoutExpired:
+        return _timeout_result(script_name, timeout, time.perf_counter() - start_time)
 
-            return UpdateResult(script_name, True, output, duration, updated)
-        else:
-            error_msg = result.stderr.strip() if result.stderr else 'Unknown error'
-            stdout_msg = result.stdout.strip() if result.stdout else ''
-            detailed_error = f"Exit code: {result.returncode}\nSTDERR: {error_msg}\nSTDOUT: {stdout_msg}"
-            logging.error(f"{script_name} failed: {detailed_error}")
-            print(f"❌ {script_name} - Failed ({duration:.1f}s)")
-            print(f"   Error details: {detailed_error}")
-            return UpdateResult(script_name, False, detailed_error, duration, False)
+    except Exception as e:
+        duration = time.perf_counter() - start_time
+        logging.error(f"{script_name} error: {e}")
+        print(f"💥 {script_name} - Error: {e}")
+        return UpdateResult(script_name, False, str(e), duration, False)
 
-    except subprocess.TimeoutExpired:
-        duration = time.time() - start_time
-        logging.error(f"{script_name} timed out after {timeout}s")
-        print(f"⏰ {script_name} - Timeout after {timeout}s")
-        return UpdateResult(script_name, False, f"Script timed out after {timeout} seconds", duration, False)
+async def run_update_script_async(script_path: Path, timeout: int = 300) -> UpdateResult:
+    """run_update_script on asyncio.create_subprocess_exec; the event loop drains every pipe."""
+    if RUN_IN_PROCESS:
+        if _PROCESS_POOL is not None:
+            result = await asyncio.get_running_loop().run_in_executor(
+                _PROCESS_POOL, run_update_script_in_process, script_path, timeout
+            )
+            # The worker filled its own version cache; record the version here too
+            parse_script_output(result.output, result.script_name)
+            return result
+        return await asyncio.to_thread(run_update_script_in_process, script_path, timeout)
+
+    script_name = script_path.name
+    start_time = time.perf_counter()
+    proc = None
+
+    try:
+        logging.info(f"Running {script_name}...")
+        print(f"🚀 Running {script_name}...")
+
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, str(script_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(SCRIPTS_DIR.parent),
+            env=_child_env(),
+            limit=1 << 20  # longest line the readers accept
+        )
+        # Keep only the last lines of each stream instead of buffering everything
+        out_tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+        err_tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+
+        async def _drain(stream, tail: deque) -> None:
+            overlong = False
+            while True:
+                try:
+                    line = await stream.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial  # last line without a newline, or b"" at EOF
+                except asyncio.LimitOverrunError as e:
+                    # Over the reader limit: discard the buffered part; the next read ends the line
+                    await stream.readexactly(e.consumed)
+                    overlong = True
+                    continue
+                if not line:
+                    return
+                if overlong:
+                    overlong = False
+                    tail.append(b"[line too long, dropped]\n")
+                else:
+                    tail.append(line)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(_drain(proc.stdout, out_tail), _drain(proc.stderr, err_tail), proc.wait()),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            return _timeout_result(script_name, timeout, time.perf_counter() - start_time)
+
+        # Decode once, after the process has exited
+        return _script_result(
+            script_name, proc.returncode,
+            b''.join(out_tail).decode('utf-8', 'replace'), b''.join(err_tail).decode('utf-8', 'replace'),
+            time.perf_counter() - start_time
+        )
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         logging.error(f"{script_name} error: {e}")
         print(f"💥 {script_name} - Error: {e}")
         return UpdateResult(script_name, False, str(e), duration, False)
+    finally:
+        # Any exit before the child finished, timeout, error or cancellation, must not orphan it
+        if proc is not None and proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+class _ThreadLocalStream:
+    """Stand-in for sys.stdout/sys.stderr that sends a capturing thread's writes to its own buffer.
+
+    contextlib.redirect_stdout swaps the process-wide stream, which parallel workers would
+    clobber; this routes per thread and passes every other thread through untouched.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, 'buffer', None) or self._stream
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+_CAPTURE_LOCK = threading.Lock()
+_CAPTURE_STREAMS: Optional[Tuple[_ThreadLocalStream, _ThreadLocalStream]] = None
+_CAPTURE_USERS = 0
+_SCRIPT_MODULES: Dict[Path, Any] = {}
+_SCRIPT_MODULES_LOCK = threading.Lock()
+_ABANDONED_WORKERS: List[threading.Thread] = []  # in-process scripts that outlived their timeout
+
+def abandoned_scripts_running() -> List[str]:
+    """Names of in-process scripts that timed out in this process and are still running."""
+    return [t.name.removeprefix("update:") for t in _ABANDONED_WORKERS if t.is_alive()]
+
+@contextlib.contextmanager
+def _thread_local_streams():
+    """Install the per-thread capturing streams while in-process runs are active; yield (stdout, stderr).
+
+    Concurrent runs share one pair; the original streams are put back when the last run leaves.
+    """
+    global _CAPTURE_STREAMS, _CAPTURE_USERS
+    with _CAPTURE_LOCK:
+        if _CAPTURE_USERS == 0:
+            _CAPTURE_STREAMS = _ThreadLocalStream(sys.stdout), _ThreadLocalStream(sys.stderr)
+            sys.stdout, sys.stderr = _CAPTURE_STREAMS
+        _CAPTURE_USERS += 1
+        streams = _CAPTURE_STREAMS
+    try:
+        yield streams
+    finally:
+        with _CAPTURE_LOCK:
+            _CAPTURE_USERS -= 1
+            if _CAPTURE_USERS == 0:
+                out_stream, err_stream = _CAPTURE_STREAMS
+                # Leave alone a stream someone else swapped in meanwhile
+                if sys.stdout is out_stream:
+                    sys.stdout = out_stream._stream
+                if sys.stderr is err_stream:
+                    sys.stderr = err_stream._stream
+                _CAPTURE_STREAMS = None
+
+def _load_update_script(script_path: Path):
+    """Import an update-*.py file once per run; later calls (retries) reuse the module."""
+    with _SCRIPT_MODULES_LOCK:
+        module = _SCRIPT_MODULES.get(script_path)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(script_path.stem.replace('-', '_'), script_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _SCRIPT_MODULES[script_path] = module
+    return module
+
+def run_update_script_in_process(script_path: Path, timeout: int = 300) -> UpdateResult:
+    """Run an update script's main() in this interpreter, capturing what it prints.
+
+    Saves an interpreter start per script and shares the imported modules (and the shared
+    version detector's connection pool). Exit status comes from SystemExit, as it would from
+    the process. A timed-out script cannot be killed; it is reported and left running on
+    its daemon thread: the result is marked abandoned so it is not retried, and main() skips
+    the git step while abandoned_scripts_running() is non-empty. Whatever it prints after
+    the streams are restored goes to the console.
+    """
+    script_name = script_path.name
+    start_time = time.perf_counter()
+    logging.info(f"Running {script_name} in-process...")
+    print(f"🚀 Running {script_name}...")
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    outcome: Dict[str, Any] = {'returncode': 1}
+
+    def _call_main():
+        out_stream._local.buffer, err_stream._local.buffer = stdout, stderr
+        try:
+            _load_update_script(script_path).main()
+            outcome['returncode'] = 0
+        except SystemExit as e:
+            code = e.code
+            outcome['returncode'] = code if isinstance(code, int) else (0 if code is None else 1)
+            if code is not None and not isinstance(code, int):
+                stderr.write(f"{code}\n")
+        except Exception as e:
+            stderr.write(f"{type(e).__name__}: {e}\n")
+        finally:
+            out_stream._local.buffer = err_stream._local.buffer = None
+
+    with _thread_local_streams() as (out_stream, err_stream):
+        worker = threading.Thread(target=_call_main, name=f"update:{script_name}", daemon=True)
+        worker.start()
+        worker.join(timeout)
+    duration = time.perf_counter() - start_time
+    if worker.is_alive():
+        _ABANDONED_WORKERS.append(worker)
+        return _timeout_result(script_name, timeout, duration, abandoned=True)
+    return _script_result(script_name, outcome['returncode'], stdout.getvalue(), stderr.getvalue(), duration)
+
+def _init_worker(prefer_structured_output: bool) -> None:
+    """Process pool initializer: carry main()'s flags into the worker and import the shared modules once.
+
+    Spawned workers (Windows, and forkserver on newer Linux Pythons) re-import this module and
+    would otherwise see the defaults instead of what main() set.
+    """
+    global PREFER_STRUCTURED_OUTPUT
+    PREFER_STRUCTURED_OUTPUT = prefer_structured_output
+    import requests  # noqa: F401
+    import version_detector  # noqa: F401
+    try:
+        import bs4  # noqa: F401
+    except ImportError:
+        pass
+
+def _get_process_pool(max_workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Create the worker pool on first use; later runs and retries reuse the same processes."""
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(PREFER_STRUCTURED_OUTPUT,)
+        )
+        atexit.register(_PROCESS_POOL.shutdown, wait=True)
+    return _PROCESS_POOL
 
 def run_update_script_with_retry(script_path: Path, timeout: int = 300, retries: int = 0) -> UpdateResult:
     attempt = 0
     last_result: Optional[UpdateResult] = None
     while attempt <= retries:
         result = run_update_script(script_path, timeout)
-        if result.success:
+        # An abandoned in-process run may still be writing its manifest; a retry would race it
+        if result.success or result.abandoned:
             return result
         last_result = result
         attempt += 1
@@ -290,6 +561,23 @@ def run_update_script_with_retry(script_path: Path, timeout: int = 300, retries:
     # last_result is guaranteed to be set because loop runs at least once (0 <= 0)
     return last_result # type: ignore
 
+async def run_update_script_with_retry_async(script_path: Path, timeout: int = 300, retries: int = 0) -> UpdateResult:
+    """run_update_script_with_retry for the event loop; the backoff sleeps without holding a thread."""
+    attempt = 0
+    last_result: Optional[UpdateResult] = None
+    while attempt <= retries:
+        result = await run_update_script_async(script_path, timeout)
+        # An abandoned in-process run may still be writing its manifest; a retry would race it
+        if result.success or result.abandoned:
+            return result
+        last_result = result
+        attempt += 1
+        if attempt <= retries:
+            backoff = min(30, 2 ** attempt)
+            print(f"🔁 Retrying {script_path.name} in {backoff}s (attempt {attempt}/{retries})")
+            await asyncio.sleep(backoff)
+    return last_result # type: ignore
+
 def classify_provider(path: Path, provider_map: Dict[str, str]) -> str:
     """Classify the provider for a given script path."""
     name = path.name
@@ -344,6 +632,12 @@ def run_parallel(scripts: List[Path], timeout: int, max_workers: int, *, github_
 
     # Cap workers
     max_workers = max(1, min(max_workers, len(scripts)))
+    if RUN_IN_PROCESS and USE_PROCESS_POOL:
+        _get_process_pool(max_workers)
+
+    # Start slow scripts first so a long one does not begin last and stretch the run;
+    # the semaphores hand out slots in this order
+    scripts = order_longest_first(scripts, load_script_durations())
 
     # Classify providers
     prov_map = {p: classify_provider(p, provider_map) for p in scripts}
@@ -352,27 +646,56 @@ def run_parallel(scripts: List[Path], timeout: int, max_workers: int, *, github_
     for k in ['github', 'microsoft', 'google', 'other']:
         counts.setdefault(k, 0)
     
-    sems = {
-        'github': threading.BoundedSemaphore(max(1, min(github_workers, max_workers))),
-        'microsoft': threading.BoundedSemaphore(max(1, min(microsoft_workers, max_workers))),
-        'google': threading.BoundedSemaphore(max(1, min(google_workers, max_workers))),
-        'other': threading.BoundedSemaphore(max(1, max_workers)),
+    limits = {
+        'github': max(1, min(github_workers, max_workers)),
+        'microsoft': max(1, min(microsoft_workers, max_workers)),
+        'google': max(1, min(google_workers, max_workers)),
+        'other': max(1, max_workers),
     }
     
     print(f"🔗 Provider-aware throttling: GitHub={counts['github']} (max {github_workers}), Microsoft={counts['microsoft']} (max {microsoft_workers}), Google={counts['google']} (max {google_workers}), Other={counts['other']}")
 
     prov_paused_until: Dict[str, float] = {k: 0.0 for k in ['github', 'microsoft', 'google', 'other']}
     prov_failures: Dict[str, int] = {k: 0 for k in ['github', 'microsoft', 'google', 'other']}
-    lock = threading.Lock()
 
-    def _task(script_path: Path, timeout: int) -> UpdateResult:
+    # One event loop runs every script: subprocesses are awaited and their pipes drained by
+    # the selector, so no thread is parked per in-flight script
+    async def _task(script_path: Path, workers: asyncio.Semaphore, sems: Dict[str, asyncio.BoundedSemaphore], notify) -> UpdateResult:
         prov = prov_map.get(script_path, 'other')
-        now = time.time()
-        if (until := prov_paused_until.get(prov, 0.0)) and now < until:
-            time.sleep(min(circuit_sleep, until - now))
-            
-        with sems.get(prov, sems['other']):
-            return run_update_script_with_retry(script_path, timeout, retries)
+        try:
+            async with workers:
+                now = time.perf_counter()
+                if (until := prov_paused_until.get(prov, 0.0)) and now < until:
+                    await asyncio.sleep(min(circuit_sleep, until - now))
+
+                async with sems.get(prov, sems['other']):
+                    result = await run_update_script_with_retry_async(script_path, timeout, retries)
+        except Exception as e:
+            notify(f"💥 {script_path.name} - Unexpected error: {e}", "red")
+            return UpdateResult(script_path.name, False, str(e), 0, False)
+
+        if not result.success:
+            # Single-threaded loop: no lock needed around the circuit breaker state
+            prov_failures[prov] = prov_failures.get(prov, 0) + 1
+            if circuit_threshold > 0 and prov_failures[prov] >= circuit_threshold:
+                prov_paused_until[prov] = time.perf_counter() + circuit_sleep
+                prov_failures[prov] = 0
+                notify(f"⏸️  Pausing {prov} tasks for {circuit_sleep:.1f}s due to failures", "yellow")
+        return result
+
+    async def _run_all(notify, advance=None) -> None:
+        workers = asyncio.Semaphore(max_workers)
+        sems = {k: asyncio.BoundedSemaphore(n) for k, n in limits.items()}
+
+        async def _tracked(script_path: Path) -> UpdateResult:
+            result = await _task(script_path, workers, sems, notify)
+            if advance:
+                advance()
+            return result
+
+        # One gather over the whole batch: results come back in script order, without the
+        # per-task completion queue and wrapper futures that as_completed adds
+        results.extend(await asyncio.gather(*map(_tracked, scripts)))
 
     # Check for Rich
     try:
@@ -381,58 +704,21 @@ def run_parallel(scripts: List[Path], timeout: int, max_workers: int, *, github_
     except ImportError:
         rich_available = False
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_script = {
-            executor.submit(_task, script_path, timeout): script_path
-            for script_path in scripts
-        }
-
-        if rich_available:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                TimeRemainingColumn(),
-            ) as progress:
-                task_id = progress.add_task(f"[cyan]Running {len(scripts)} scripts...", total=len(scripts))
-                
-                for future in concurrent.futures.as_completed(future_to_script):
-                    script_path = future_to_script[future]
-                    try:
-                        result = future.result()
-                        results.append(result)
-                        progress.advance(task_id)
-                        
-                        if not result.success:
-                            prov = prov_map.get(script_path, 'other')
-                            with lock:
-                                prov_failures[prov] = prov_failures.get(prov, 0) + 1
-                                if circuit_threshold > 0 and prov_failures[prov] >= circuit_threshold:
-                                    prov_paused_until[prov] = time.time() + circuit_sleep
-                                    prov_failures[prov] = 0
-                                    progress.console.print(f"[yellow]⏸️  Pausing {prov} tasks for {circuit_sleep:.1f}s due to failures[/yellow]")
-                    except Exception as e:
-                        progress.console.print(f"[red]💥 {script_path.name} - Unexpected error: {e}[/red]")
-                        results.append(UpdateResult(script_path.name, False, str(e), 0, False))
-                        progress.advance(task_id)
-        else:
-            for future in concurrent.futures.as_completed(future_to_script):
-                script_path = future_to_script[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    if not result.success:
-                        prov = prov_map.get(script_path, 'other')
-                        with lock:
-                            prov_failures[prov] = prov_failures.get(prov, 0) + 1
-                            if circuit_threshold > 0 and prov_failures[prov] >= circuit_threshold:
-                                prov_paused_until[prov] = time.time() + circuit_sleep
-                                prov_failures[prov] = 0
-                                print(f"⏸️  Pausing {prov} tasks for {circuit_sleep:.1f}s due to failures")
-                except Exception as e:
-                    print(f"💥 {script_path.name} - Unexpected error: {e}")
-                    results.append(UpdateResult(script_path.name, False, str(e), 0, False))
+    if rich_available:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TimeRemainingColumn(),
+        ) as progress:
+            task_id = progress.add_task(f"[cyan]Running {len(scripts)} scripts...", total=len(scripts))
+            asyncio.run(_run_all(
+                lambda msg, style: progress.console.print(f"[{style}]{msg}[/{style}]"),
+                lambda: progress.advance(task_id),
+            ))
+    else:
+        asyncio.run(_run_all(lambda msg, style: print(msg)))
 
     results.sort(key=lambda x: x.script_name)
     return results
@@ -442,11 +728,13 @@ def print_summary(results: List[UpdateResult], total_duration: float):
     print("📊 UPDATE SUMMARY")
     print("="*80)
     
-    successful, failed, updated = [], [], []
+    successful, failed, updated, no_updates = [], [], [], []
     for r in results:
         (successful if r.success else failed).append(r)
         if r.updated:
             updated.append(r)
+        elif r.success:
+            no_updates.append(r)
     
     print(f"📈 Total Scripts: {len(results)}")
     print(f"✅ Successful: {len(successful)}")
@@ -472,7 +760,7 @@ def print_summary(results: List[UpdateResult], total_duration: float):
                 if line.strip():
                     print(f"     {line.strip()}")
                     
-    if no_updates := [r for r in successful if not r.updated]:
+    if no_updates:
         print(f"\nℹ️  NO UPDATES NEEDED:")
         for result in no_updates:
             pkg = result.script_name.replace('update-', '').replace('.py', '')
@@ -546,12 +834,10 @@ def write_md_summary(results: List[UpdateResult], total_duration: float, args, m
         out_path = Path(args.md_summary)
         out_path.parent.mkdir(parents=True, exist_ok=True)
         
-        counts = {
-            "total": len(results),
-            "success": len([r for r in results if r.success]),
-            "failed": len([r for r in results if not r.success]),
-            "updated": len([r for r in results if r.updated])
-        }
+        counts = {"total": len(results), "success": 0, "failed": 0, "updated": 0}
+        for r in results:
+            counts["success" if r.success else "failed"] += 1
+            counts["updated"] += r.updated
         
         lines = [
             "# Update Health Dashboard", "",
@@ -615,6 +901,30 @@ def send_webhook_if_configured(args) -> None:
     except Exception as e:
         print(f"⚠️  Webhook error: {e}")
 
+def load_script_durations() -> Dict[str, float]:
+    """Last observed run time per script name; empty when there is no usable history."""
+    try:
+        with open(DURATIONS_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {k: float(v) for k, v in data.items()} if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+def save_script_durations(results: List[UpdateResult]) -> None:
+    """Merge this run's durations into DURATIONS_FILE; scripts that did not run keep their entry."""
+    durations = load_script_durations()
+    durations.update((r.script_name, round(r.duration, 2)) for r in results if r.duration > 0)
+    try:
+        DURATIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(DURATIONS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(durations, f, indent=2, sort_keys=True)
+    except OSError as e:
+        logging.warning(f"Could not save script durations: {e}")
+
+def order_longest_first(scripts: List[Path], durations: Dict[str, float]) -> List[Path]:
+    """Longest-processing-time order: slowest known scripts start first, unknown ones before them."""
+    return sorted(scripts, key=lambda p: -durations.get(p.name, float('inf')))
+
 def filter_resume_paths(script_paths: List[Path], resume_path: Path) -> List[Path]:
     try:
         with open(resume_path, 'r', encoding='utf-8') as f:
@@ -646,14 +956,15 @@ def install_playwright_browsers() -> bool:
         return False
 
 def check_dependencies() -> bool:
-    """Check if required dependencies are installed."""
+    """Check if required dependencies are installed.
+
+    Uses importlib.util.find_spec: the finders locate each package without executing it.
+    """
     missing = []
     if not requests:
         missing.append("requests")
     
-    try:
-        import packaging
-    except ImportError:
+    if importlib.util.find_spec("packaging") is None:
         missing.append("packaging")
 
     if missing:
@@ -661,20 +972,14 @@ def check_dependencies() -> bool:
         print(f"pip install {' '.join(missing)}")
         return False
 
-    try:
-        import bs4
-    except ImportError:
+    if importlib.util.find_spec("bs4") is None:
         print("⚠️  Warning: Optional 'beautifulsoup4' not found. Some features may be limited.")
         print("pip install beautifulsoup4")
 
-    try:
-        import rich
-    except ImportError:
+    if importlib.util.find_spec("rich") is None:
         print("ℹ️  Tip: Install 'rich' for nicer progress bars: pip install rich")
 
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
+    if importlib.util.find_spec("playwright") is None:
         print("ℹ️  Tip: Install 'playwright' for advanced scraping: pip install playwright")
         
     return True
@@ -719,6 +1024,8 @@ Examples:
     exe_grp.add_argument("--parallel", "-p", action="store_true", default=True, help="Run scripts in parallel (default)")
     exe_grp.add_argument("--sequential", action="store_true", help="Force sequential execution")
     exe_grp.add_argument("--fast", "-f", action="store_true", help="Enable fast mode with optimized worker count")
+    exe_grp.add_argument("--in-process", action="store_true", help="Import update scripts and call main() instead of starting a Python process per script")
+    exe_grp.add_argument("--process-pool", action="store_true", help="With --in-process, run scripts on a persistent pool of worker processes (parallel mode)")
     exe_grp.add_argument("--install-browsers", action="store_true", help="Install Playwright browsers before running")
 
     # Performance tuning
@@ -726,6 +1033,10 @@ Examples:
     perf_grp.add_argument("--workers", "-w", type=int, default=DEFAULT_WORKERS, help=f"Number of parallel workers (default: {DEFAULT_WORKERS})")
     perf_grp.add_argument("--timeout", "-t", type=int, default=DEFAULT_TIMEOUT, help=f"Timeout per script in seconds (default: {DEFAULT_TIMEOUT})")
     perf_grp.add_argument("--delay", "-D", type=float, default=0.0, help="Delay (seconds) between scripts in sequential mode")
+    workload = perf_grp.add_mutually_exclusive_group()
+    workload.add_argument("--io-bound", dest="cpu_bound", action="store_false", help=f"--fast sizes workers for network-bound scripts, up to {MAX_IO_BOUND_WORKERS} (default)")
+    workload.add_argument("--cpu-bound", dest="cpu_bound", action="store_true", help="--fast sizes workers to the CPU count")
+    parser.set_defaults(cpu_bound=False)
 
     # Provider-specific throttling
     throttle_grp = parser.add_argument_group('Provider Throttling')
@@ -780,10 +1091,13 @@ Examples:
     if args.git_remote: os.environ["SCOOP_GIT_REMOTE"] = args.git_remote
     if args.git_branch: os.environ["SCOOP_GIT_BRANCH"] = args.git_branch
 
-    global PREFER_STRUCTURED_OUTPUT
+    global PREFER_STRUCTURED_OUTPUT, RUN_IN_PROCESS, USE_PROCESS_POOL, _CHILD_ENV
     PREFER_STRUCTURED_OUTPUT = bool(args.structured_output)
+    USE_PROCESS_POOL = bool(args.process_pool)
+    RUN_IN_PROCESS = bool(args.in_process) or USE_PROCESS_POOL
 
-    if not check_dependencies():
+    # A dry run executes nothing, so it needs no dependency check
+    if not args.dry_run and not check_dependencies():
         sys.exit(1)
 
     if args.install_browsers:
@@ -882,7 +1196,7 @@ Examples:
         return
 
     print("\n" + "="*80)
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     if args.http_cache:
         os.environ['AUTOMATION_HTTP_CACHE'] = '1'
@@ -890,10 +1204,14 @@ Examples:
     if args.structured_output:
         os.environ['STRUCTURED_ONLY'] = '1'
 
+    # Every environment variable for the scripts is set by now; build their env once
+    _CHILD_ENV = _child_env()
+
     if args.fast:
         args.parallel = True
-        recommended = min(6, max(3, (os.cpu_count() or 4)))
-        args.workers = min(recommended, len(script_paths))
+        # Scripts mostly wait on the network, so more workers than cores pays off unless told otherwise
+        recommended = (os.cpu_count() or 4) if args.cpu_bound else MAX_IO_BOUND_WORKERS
+        args.workers = max(1, min(recommended, len(script_paths)))
         print(f"⚡ Fast mode enabled: workers set to {args.workers}")
 
     if args.parallel:
@@ -914,8 +1232,9 @@ Examples:
             max_fail=int(args.max_fail or 0)
         )
 
-    total_duration = time.time() - start_time
+    total_duration = time.perf_counter() - start_time
     print_summary(results, total_duration)
+    save_script_durations(results)
     
     mode_label = 'Parallel' if args.parallel else 'Sequential'
     write_json_summary(results, total_duration, args, mode_label)
@@ -927,7 +1246,13 @@ Examples:
         print(f"\n⚠️  {failed_count} script(s) failed")
         sys.exit(1)
     
-    if not args.skip_git:
+    # Pool workers exit here, taking any abandoned in-process script with them; abandoned
+    # threads in this process cannot be stopped, so git must not stage behind them
+    if _PROCESS_POOL is not None:
+        _PROCESS_POOL.shutdown(wait=True)
+    if not args.skip_git and (still_running := abandoned_scripts_running()):
+        print(f"\n⚠️  Skipping git: timed-out scripts still running in-process: {', '.join(still_running)}")
+    elif not args.skip_git:
         print("\n" + "-"*80)
         print("🧩 Git integration: staging and committing changes...")
         try:
@@ -936,15 +1261,12 @@ Examples:
                 if updated_results:
                     stage_and_commit_per_package(updated_results)
                     
-                for app_name, path in list_untracked_manifests():
-                    rc, out, err = run_git_command(["git", "add", str(path)])
-                    if rc != 0:
-                        print(f"⚠️  git add {path} failed: {err or out}")
-                        continue
-                    
+                untracked = dict((path, app_name) for app_name, path in list_untracked_manifests())
+                for path in stage_manifests(list(untracked)):
+                    app_name = untracked[path]
                     version_str = get_manifest_version(app_name)
                     msg = f"{app_name}: Add version {version_str}" if version_str else f"{app_name}: Add manifest"
-                    commit_with_message(msg)
+                    commit_with_message(msg, [path])
                 
                 push_changes()
             else:
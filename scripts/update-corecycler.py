@@ -10,18 +10,63 @@ import os
 from pathlib import Path
 from version_detector import SoftwareVersionConfig, get_version_info
 
+# Optional C JSON codec for the manifest; its decode errors subclass json.JSONDecodeError
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 # Configuration
 SOFTWARE_NAME = "corecycler"
 HOMEPAGE_URL = "https://github.com/sp00n/corecycler"
 DOWNLOAD_URL_TEMPLATE = "https://github.com/sp00n/CoreCycler/releases/download/v$version/CoreCycler-v$version.7z"
 BUCKET_FILE = Path(__file__).parent.parent / "bucket" / "corecycler.json"
 
+def load_bucket() -> dict:
+    """Read and parse the bucket manifest once; raises FileNotFoundError/JSONDecodeError."""
+    data = BUCKET_FILE.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def update_bucket_json(manifest: dict, version: str, download_url: str, hash_value: str) -> None:
+    """Apply the new version, URL and hash to an already loaded manifest and save it."""
+    # Prefer architecture-specific update when manifest uses architecture blocks;
+    # fall back to top-level if the architecture entry is missing or not a dict
+    target = manifest
+    arch = manifest.get('architecture')
+    if isinstance(arch, dict) and arch:
+        # Choose preferred architecture key
+        arch_key = '64bit' if '64bit' in arch else ('arm64' if 'arm64' in arch else ('32bit' if '32bit' in arch else next(iter(arch.keys()))))
+        if isinstance(arch.get(arch_key), dict):
+            target = arch[arch_key]
+
+    manifest['version'] = version
+    target['url'] = download_url
+    target['hash'] = f"sha256:{hash_value}"
+
+    # Text mode keeps the platform's line endings, as json.dump did
+    with open(BUCKET_FILE, 'w', encoding='utf-8') as f:
+        if orjson is not None:
+            f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2).decode('utf-8'))
+        else:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
 def update_manifest():
     """Update the Scoop manifest using shared version detection"""
     structured_only = os.environ.get('STRUCTURED_ONLY') == '1'
     if not structured_only:
         print(f"🔄 Updating {SOFTWARE_NAME}...")
     
+    # Load existing manifest once; it is reused for the version check and the update
+    try:
+        manifest = load_bucket()
+    except FileNotFoundError:
+        print(f"❌ Manifest file not found: {BUCKET_FILE}")
+        return False
+    except json.JSONDecodeError as e:
+        print(f"❌ Invalid JSON in manifest: {e}")
+        return False
+    current_version = manifest.get('version', '')
+    
     # Configure software version detection
     config = SoftwareVersionConfig(
         name=SOFTWARE_NAME,
@@ -32,8 +77,8 @@ def update_manifest():
         license="MIT"
     )
     
-    # Get version information using shared detector
-    version_info = get_version_info(config)
+    # Get version information using shared detector; an unchanged version skips the download hash
+    version_info = get_version_info(config, current_version=current_version)
     if not version_info:
         if not structured_only:
             print(f"❌ Failed to get version info for {SOFTWARE_NAME}")
@@ -44,49 +89,16 @@ def update_manifest():
     download_url = version_info['download_url']
     hash_value = version_info['hash']
     
-    # Load existing manifest
-    try:
-        with open(BUCKET_FILE, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
-    except FileNotFoundError:
-        print(f"❌ Manifest file not found: {BUCKET_FILE}")
-        return False
-    except json.JSONDecodeError as e:
-        print(f"❌ Invalid JSON in manifest: {e}")
-        return False
-    
     # Check if update is needed
-    current_version = manifest.get('version', '')
     if current_version == version:
         if not structured_only:
             print(f"✅ {SOFTWARE_NAME} is already up to date (v{version})")
         print(json.dumps({"updated": False, "name": SOFTWARE_NAME, "version": version}))
         return True
     
-    # Update manifest
-    manifest['version'] = version
-    # Prefer architecture-specific update when manifest uses architecture blocks
-    arch = manifest.get('architecture')
-    if isinstance(arch, dict) and arch:
-        # Choose preferred architecture key
-        arch_key = '64bit' if '64bit' in arch else ('arm64' if 'arm64' in arch else ('32bit' if '32bit' in arch else next(iter(arch.keys()))))
-        if isinstance(arch.get(arch_key), dict):
-            arch_entry = arch[arch_key]
-            arch_entry['url'] = download_url
-            arch_entry['hash'] = f"sha256:{hash_value}"
-            manifest['architecture'][arch_key] = arch_entry
-        else:
-            # Fallback to top-level if architecture entry is not a dict
-            manifest['url'] = download_url
-            manifest['hash'] = f"sha256:{hash_value}"
-    else:
-        manifest['url'] = download_url
-        manifest['hash'] = f"sha256:{hash_value}"
-    
-    # Save updated manifest
+    # Update and save manifest
     try:
-        with open(BUCKET_FILE, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        update_bucket_json(manifest, version, download_url, hash_value)
         
         if not structured_only:
             print(f"✅ Updated {SOFTWARE_NAME}: {current_version} → {version}")
@@ -13,22 +13,34 @@ from version_detector import get_session
 # Configuration
 SOFTWARE_NAME = "thorium-avx2"
 RELEASES_API_URL = "https://api.github.com/repos/gz83/thorium/releases"
+RELEASES_PAGE_SIZE = 5  # the newest release usually has the asset; stop paging as soon as one does
+RELEASES_MAX = 30  # same depth as the API's default single page
 BUCKET_FILE = Path(__file__).parent.parent / "bucket" / "thorium-avx2.json"
 
 
+def _iter_releases(session):
+    """Yield releases newest first, fetching small pages only until the caller stops."""
+    url = RELEASES_API_URL
+    params = {"per_page": RELEASES_PAGE_SIZE}
+    seen = 0
+    while url and seen < RELEASES_MAX:
+        response = session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        for release in json.loads(response.content):
+            yield release
+            seen += 1
+        # The next link already carries the query string
+        url, params = response.links.get("next", {}).get("url"), None
+
 def get_release_info():
     """Return the newest release that actually ships a Windows AVX2 ZIP asset."""
     session = get_session()
-    response = session.get(RELEASES_API_URL, timeout=30)
-    response.raise_for_status()
-
-    releases = response.json()
     asset_names = [
         "Thorium_AVX2_{version}.zip",
         "thorium-browser_{version}_AVX2.zip",
     ]
 
-    for release in releases:
+    for release in _iter_releases(session):
         tag_name = release.get("tag_name", "")
         version = tag_name[1:] if tag_name.startswith("M") else tag_name
         assets = release.get("assets", [])
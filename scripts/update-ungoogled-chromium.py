@@ -9,13 +9,21 @@ import sys
 import os
 import re
 from pathlib import Path
-from version_detector import SoftwareVersionConfig, get_version_info
+from version_detector import SoftwareVersionConfig, get_shared_detector, get_version_info
+
+# Optional C JSON codec for the manifest; its decode errors subclass json.JSONDecodeError
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 # Configuration
 SOFTWARE_NAME = "ungoogled-chromium"
 HOMEPAGE_URL = "https://api.github.com/repos/ungoogled-software/ungoogled-chromium-windows/releases/latest"
 DOWNLOAD_URL_TEMPLATE = "https://github.com/ungoogled-software/ungoogled-chromium-windows/releases/download/$version/ungoogled-chromium_$version_windows_x64.zip"
 BUCKET_FILE = Path(__file__).parent.parent / "bucket" / "ungoogled-chromium.json"
+ASSET_PATTERN = re.compile(r"ungoogled-chromium_.*_windows_x64\.zip", re.IGNORECASE)
+VERSION_PATTERN = re.compile(r"[0-9]+\.[0-9]+\.[0-9]+\.[0-9]+-[0-9]+\.[0-9]+")  # e.g. 131.0.6778.85-1.1
 
 def update_manifest():
     """Update the Scoop manifest using shared version detection"""
@@ -23,54 +31,71 @@ def update_manifest():
     if not structured_only:
         print(f"🔄 Updating {SOFTWARE_NAME}...")
     
+    # Load existing manifest first: an unchanged version needs no download hash
+    try:
+        if orjson is not None:
+            manifest = orjson.loads(BUCKET_FILE.read_bytes())
+        else:
+            with open(BUCKET_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Manifest file not found: {BUCKET_FILE}")
+        return False
+    except json.JSONDecodeError as e:
+        print(f"❌ Invalid JSON in manifest: {e}")
+        return False
+    
+    current_version = manifest.get('version', '')
+    
     # Configure software version detection
     config = SoftwareVersionConfig(
         name=SOFTWARE_NAME,
         homepage=HOMEPAGE_URL,
-        version_patterns=['"tag_name":\\s*"([0-9]+\\.[0-9]+\\.[0-9]+\\.[0-9]+-[0-9]+\\.[0-9]+)"'],
+        version_patterns=[f'"tag_name":\\s*"({VERSION_PATTERN.pattern})"'],
         download_url_template=DOWNLOAD_URL_TEMPLATE,
         description="Ungoogled Chromium - Google Chromium without Google's integration",
         license="BSD-3-Clause"
     )
     
     # Get version information using shared detector
-    version_info = get_version_info(config)
+    version_info = get_version_info(config, current_version=current_version)
     
     # Fallback for ungoogled-chromium where asset suffix may differ from tag version
     if not version_info:
         if not structured_only:
             print(f"⚠️  Shared version detection failed, trying GitHub API fallback...")
         try:
-            from version_detector import VersionDetector
-            import requests
+            # Same pooled session get_version_info just used, so the API call and the
+            # asset download reuse its connections
+            detector = get_shared_detector()
             
-            # Fetch latest release from GitHub API
-            response = requests.get(HOMEPAGE_URL, timeout=15)
-            response.raise_for_status()
-            release = response.json()
+            # Fetch latest release from GitHub API (conditional on the stored ETag)
+            release = detector.fetch_json(HOMEPAGE_URL, headers={"Accept": "application/vnd.github+json"})
             version = release['tag_name']
             
-            # Find matching asset (ungoogled-chromium_*_windows_x64.zip)
-            asset_pattern = f"ungoogled-chromium_.*_windows_x64.zip"
-            matching_assets = [a for a in release.get('assets', []) 
-                               if re.match(asset_pattern, a['name'], re.IGNORECASE)]
+            # Find matching asset (ungoogled-chromium_*_windows_x64.zip); stop at the first hit
+            assets = release.get('assets', ())
+            asset = next((a for a in assets if ASSET_PATTERN.match(a['name'])), None)
             
-            if not matching_assets:
-                # Fallback to first zip asset
-                zip_assets = [a for a in release.get('assets', []) 
-                              if a['name'].endswith('.zip')]
-                if not zip_assets:
+            if asset is None:
+                # Fallback to first zip asset, but say so: the asset naming may have changed
+                asset = next((a for a in assets if a['name'].endswith('.zip')), None)
+                if asset is None:
                     raise ValueError("No zip assets found in release")
-                asset = zip_assets[0]
-            else:
-                asset = matching_assets[0]
+                if not structured_only:
+                    print(f"⚠️  No asset matches {ASSET_PATTERN.pattern}; using {asset['name']}")
             
             download_url = asset['browser_download_url']
             
-            # Calculate hash using VersionDetector
-            detector = VersionDetector()
-            hash_value = detector.calculate_hash(download_url)
-            if not hash_value:
+            # Recent releases publish the asset's SHA256 as "digest"; only download to hash without it
+            digest = asset.get('digest') or ''
+            if version == current_version:
+                hash_value = None  # up to date; nothing to hash
+            elif digest.startswith('sha256:'):
+                hash_value = digest.removeprefix('sha256:')
+            else:
+                hash_value = detector.calculate_hash(download_url)
+            if not hash_value and version != current_version:
                 raise ValueError(f"URL not accessible: {download_url}")
             
             version_info = {
@@ -97,19 +122,7 @@ def update_manifest():
     download_url = version_info['download_url']
     hash_value = version_info['hash']
     
-    # Load existing manifest
-    try:
-        with open(BUCKET_FILE, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
-    except FileNotFoundError:
-        print(f"❌ Manifest file not found: {BUCKET_FILE}")
-        return False
-    except json.JSONDecodeError as e:
-        print(f"❌ Invalid JSON in manifest: {e}")
-        return False
-    
     # Check if update is needed
-    current_version = manifest.get('version', '')
     if current_version == version:
         if not structured_only:
             print(f"✅ {SOFTWARE_NAME} is already up to date (v{version})")
@@ -138,8 +151,12 @@ def update_manifest():
     
     # Save updated manifest
     try:
+        # Text mode keeps the platform's line endings, as json.dump did
         with open(BUCKET_FILE, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2).decode('utf-8'))
+            else:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
         
         if not structured_only:
             print(f"✅ Updated {SOFTWARE_NAME}: {current_version} → {version}")
@@ -9,8 +9,11 @@ import os
 import sys
 import requests
 import hashlib
+import io
+import json
 import tempfile
 import subprocess
+import threading
 import logging
 import shutil
 import zipfile
@@ -39,6 +42,12 @@ except Exception:  # pragma: no cover - environment may not have urllib3
     HTTPAdapter = None
     Retry = None
 
+# Optional C JSON parser for API bodies
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 # Optional caching support; used only if available and enabled by caller
 try:
     import requests_cache  # type: ignore
@@ -46,6 +55,14 @@ except Exception:  # pragma: no cover
     requests_cache = None
 
 DEFAULT_TIMEOUT = 15  # seconds
+HASH_CHUNK_SIZE = 1 << 20  # bytes per read when hashing (without hashlib.file_digest) or saving downloads
+# Conditional-request caches, one JSON file per key so parallel update scripts never write
+# the same file; unchanged downloads and release pages come back as bodiless 304s
+HASH_CACHE_DIR = Path(__file__).parent / ".cache" / "hashes"  # validators + SHA256 per download URL
+VERSION_CACHE_DIR = Path(__file__).parent / ".cache" / "versions"  # validators + version per page and patterns
+API_CACHE_DIR = Path(__file__).parent / ".cache" / "api"  # ETag + parsed body per JSON API URL
+DISK_CACHE_MAX_ENTRIES = 256  # per cache directory; least recently used entries are dropped
+_VERSION_SEPARATORS = re.compile(r"[._-]")  # splits versions into numeric sort keys
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -64,6 +81,8 @@ def get_session(
     pool_maxsize: int = 20,
     use_cache: bool = False,
     cache_expire_seconds: int = 1800,
+    cache_name: str = 'version-detector-cache',
+    cache_control: bool = False,
 ) -> requests.Session:
     """Create a configured HTTP session with pooling, retries, and optional caching.
 
@@ -74,15 +93,19 @@ def get_session(
         pool_maxsize: Max pooled connections
         use_cache: Enable requests-cache if available
         cache_expire_seconds: Cache TTL when using requests-cache
+        cache_name: SQLite cache file name when using requests-cache
+        cache_control: Let Cache-Control/ETag response headers override the TTL
 
     Returns:
         Configured requests.Session (or CachedSession if caching enabled)
     """
     if use_cache and requests_cache is not None:
         session: requests.Session = requests_cache.CachedSession(
-            cache_name='version-detector-cache',
+            cache_name=cache_name,
             backend='sqlite',
             expire_after=cache_expire_seconds,
+            cache_control=cache_control,
+            allowable_methods=('GET', 'HEAD'),
         )
     else:
         session = requests.Session()
@@ -134,6 +157,89 @@ class VersionResult:
     version: str
     match_groups: Dict[str, str] = field(default_factory=dict)
 
+def sha256_of_response(response: requests.Response) -> str:
+    """SHA256 hex digest of a streamed response body.
+
+    Uses hashlib.file_digest (Python 3.11+) on the decoded raw stream, which reads and
+    hashes in C; otherwise iterates the body in HASH_CHUNK_SIZE chunks.
+    """
+    raw = getattr(response, 'raw', None)
+    if not isinstance(raw, io.IOBase):
+        sha256_hash = hashlib.sha256()
+        for chunk in response.iter_content(chunk_size=HASH_CHUNK_SIZE):
+            sha256_hash.update(chunk)
+        return sha256_hash.hexdigest()
+
+    raw.decode_content = True  # match iter_content: undo any Content-Encoding
+    if hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(raw, 'sha256').hexdigest()
+
+    # Pre-3.11: read into one reusable buffer instead of allocating a bytes per chunk
+    sha256_hash = hashlib.sha256()
+    view = memoryview(bytearray(HASH_CHUNK_SIZE))
+    while n := raw.readinto(view):
+        sha256_hash.update(view[:n])
+    return sha256_hash.hexdigest()
+
+
+def _download_to_tempfile(response: requests.Response, suffix: str) -> Path:
+    """Stream a response body into a named temp file in HASH_CHUNK_SIZE blocks; the caller deletes it."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        raw = getattr(response, 'raw', None)
+        if isinstance(raw, io.IOBase):
+            raw.decode_content = True
+            shutil.copyfileobj(raw, temp_file, HASH_CHUNK_SIZE)
+        else:
+            for chunk in response.iter_content(chunk_size=HASH_CHUNK_SIZE):
+                temp_file.write(chunk)
+    return Path(temp_file.name)
+
+
+def _disk_cache_path(directory: Path, key: str) -> Path:
+    return directory / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def _load_disk_cache(directory: Path, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        path = _disk_cache_path(directory, key)
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        if entry.get('key') != key:
+            return None
+        os.utime(path)  # mark as recently used for _prune_disk_cache
+        return entry
+    except Exception:
+        return None
+
+
+def _prune_disk_cache(directory: Path) -> None:
+    """Keep the DISK_CACHE_MAX_ENTRIES most recently used entries in directory."""
+    with os.scandir(directory) as it:
+        entries = [e for e in it if e.name.endswith('.json')]
+    if len(entries) <= DISK_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime_ns, reverse=True)
+    for e in entries[DISK_CACHE_MAX_ENTRIES:]:
+        try:
+            os.unlink(e.path)
+        except OSError:
+            pass
+
+
+def _save_disk_cache(directory: Path, key: str, entry: Dict[str, Any]) -> None:
+    try:
+        path = _disk_cache_path(directory, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer, so concurrent threads or processes never share a temp file
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, **entry}, f)
+        os.replace(tmp, path)
+        _prune_disk_cache(path.parent)
+    except Exception as e:
+        logger.debug(f"Could not write cache entry for {key}: {e}")
+
+
 class VersionDetector:
     """Shared class for version detection and URL construction"""
 
@@ -187,9 +293,11 @@ class VersionDetector:
             logger.info(f"Scraping version from: {homepage_url}")
             print(f"🔍 Scraping version from: {homepage_url}")
             
-            # Use conditional headers when we have prior metadata
+            # Use conditional headers when we have prior metadata, from this detector or an
+            # earlier run; the result depends on the patterns, so they are part of the key
             headers: Dict[str, str] = {}
-            cached = self._version_cache.get(homepage_url)
+            cache_key = "\n".join([homepage_url, *version_patterns])
+            cached = self._version_cache.get(cache_key) or _load_disk_cache(VERSION_CACHE_DIR, cache_key)
             if cached:
                 if cached.get('etag'):
                     headers['If-None-Match'] = cached['etag']
@@ -244,7 +352,7 @@ class VersionDetector:
 
                 # Fallback key
                 def version_key(res: VersionResult) -> List[int]:
-                    parts = re.split(r"[._-]", res.version)
+                    parts = _VERSION_SEPARATORS.split(res.version)
                     key: List[int] = []
                     for p in parts:
                         try:
@@ -267,12 +375,10 @@ class VersionDetector:
                 print(f"✅ Found version: {best_result.version}")
                 
                 # Store conditional metadata and parsed version
-                self._version_cache[homepage_url] = {
-                    'etag': response.headers.get('ETag', ''),
-                    'last_modified': response.headers.get('Last-Modified', ''),
+                self._remember_version(cache_key, response, {
                     'version': best_result.version,
                     'match_groups': best_result.match_groups
-                }
+                })
                 return best_result
 
             logger.warning("No version found with any pattern using requests")
@@ -300,7 +406,7 @@ class VersionDetector:
                     if all_results:
                          # Reuse sorting logic (simplified here or extracted later)
                         def version_key_pw(res: VersionResult) -> List[int]:
-                            parts = re.split(r"[._-]", res.version)
+                            parts = _VERSION_SEPARATORS.split(res.version)
                             key: List[int] = []
                             for p in parts:
                                 try:
@@ -324,11 +430,7 @@ class VersionDetector:
 
             print("❌ No version found with any pattern")
             # Cache response metadata even when not found, to enable future 304
-            self._version_cache[homepage_url] = {
-                'etag': response.headers.get('ETag', ''),
-                'last_modified': response.headers.get('Last-Modified', ''),
-                'version': '',
-            }
+            self._remember_version(cache_key, response, {'version': ''})
             return None
 
         except requests.RequestException as e:
@@ -340,6 +442,17 @@ class VersionDetector:
             print(f"❌ Error during version detection: {e}")
             return None
 
+    def _remember_version(self, cache_key: str, response: requests.Response, result: Dict[str, Any]) -> None:
+        """Keep a page's validators and detected version in memory and, when revalidatable, on disk."""
+        entry = {
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+            **result,
+        }
+        self._version_cache[cache_key] = entry
+        if entry['etag'] or entry['last_modified']:
+            _save_disk_cache(VERSION_CACHE_DIR, cache_key, entry)
+
     def construct_download_url(self, url_template: str, version: str, match_groups: Optional[Dict[str, str]] = None) -> str:
         """
         Construct download URL from template and version
@@ -367,19 +480,47 @@ class VersionDetector:
         print(f"📦 Download URL: {download_url}")
         return download_url
 
+    def fetch_json(self, url: str, headers: Optional[Dict[str, str]] = None) -> Any:
+        """GET a JSON document (e.g. a GitHub API release), revalidating the stored copy.
+
+        Sends If-None-Match with the last ETag; a 304 returns the stored body without a
+        transfer and, on GitHub, without counting against the rate limit.
+        """
+        request_headers = dict(headers or {})
+        cached = _load_disk_cache(API_CACHE_DIR, url)
+        if cached and cached.get('etag'):
+            request_headers['If-None-Match'] = cached['etag']
+
+        response = self.session.get(url, timeout=DEFAULT_TIMEOUT, headers=request_headers)
+        if response.status_code == 304 and cached:
+            return cached['body']
+        response.raise_for_status()
+
+        # Parse the raw bytes; both parsers decode UTF-8 themselves, no intermediate str
+        body = orjson.loads(response.content) if orjson is not None else json.loads(response.content)
+        etag = response.headers.get('ETag')
+        if etag:
+            _save_disk_cache(API_CACHE_DIR, url, {'etag': etag, 'body': body})
+        return body
+
     def validate_url(self, url: str) -> bool:
         """Validate if URL is accessible without downloading the full file"""
+        return self._probe_url(url) is not None
+
+    def _probe_url(self, url: str) -> Optional[Dict[str, str]]:
+        """Check a URL without downloading it. Returns the HEAD response headers, or {}
+        when only the ranged GET fallback answered; None if the URL is not accessible."""
         try:
             response = self.session.head(url, timeout=DEFAULT_TIMEOUT, allow_redirects=True)
-            return response.status_code == 200
+            return response.headers if response.status_code == 200 else None
         except Exception:
             # If HEAD fails, try GET with range to check first byte
             try:
                 headers = {'Range': 'bytes=0-0'}
                 response = self.session.get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
-                return response.status_code in [200, 206]  # 206 = Partial Content
+                return {} if response.status_code in [200, 206] else None  # 206 = Partial Content
             except Exception:
-                return False
+                return None
 
     def calculate_hash(self, url: str) -> Optional[str]:
         """
@@ -395,26 +536,52 @@ class VersionDetector:
         clean_url = url.split('#', 1)[0]
 
         # First validate the URL is accessible
-        if not self.validate_url(clean_url):
+        probe = self._probe_url(clean_url)
+        if probe is None:
             print(f"❌ URL not accessible: {clean_url}")
             return None
 
         try:
             print("🔍 Calculating hash...")
-            response = self.session.get(clean_url, timeout=max(30, DEFAULT_TIMEOUT), stream=True)
+            headers: Dict[str, str] = {}
+            cached = _load_disk_cache(HASH_CACHE_DIR, clean_url)
+            if cached and not cached.get('sha256'):
+                cached = None
+            # The validation HEAD already carries the validators: a matching ETag (and length)
+            # answers from the cache without even a conditional GET
+            if (cached and cached.get('etag') and cached['etag'] == probe.get('ETag')
+                    and cached.get('length') in (None, probe.get('Content-Length'))):
+                print(f"ℹ️  Unchanged (ETag), using cached hash: {cached['sha256']}")
+                return cached['sha256']
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+
+            response = self.session.get(clean_url, timeout=max(30, DEFAULT_TIMEOUT), stream=True, headers=headers)
+            if response.status_code == 304 and cached:
+                response.close()
+                print(f"ℹ️  Not modified (304), using cached hash: {cached['sha256']}")
+                return cached['sha256']
             response.raise_for_status()
 
-            sha256_hash = hashlib.sha256()
-            total_bytes = 0
             content_len = int(response.headers.get('Content-Length', '0') or '0')
             if content_len:
                 print(f"⬇️  Content-Length: {content_len} bytes")
-            for chunk in response.iter_content(chunk_size=8192):
-                sha256_hash.update(chunk)
-                total_bytes += len(chunk)
 
-            hash_value = sha256_hash.hexdigest()
+            hash_value = sha256_of_response(response)
             print(f"✅ Hash: {hash_value}")
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                _save_disk_cache(HASH_CACHE_DIR, clean_url, {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'length': response.headers.get('Content-Length'),
+                    'sha256': hash_value,
+                })
             return hash_value
 
         except requests.RequestException as e:
@@ -458,10 +625,7 @@ class VersionDetector:
             response = self.session.get(download_url, stream=True, timeout=max(30, DEFAULT_TIMEOUT))
             response.raise_for_status()
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.exe') as temp_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    temp_file.write(chunk)
-                temp_path = Path(temp_file.name)
+            temp_path = _download_to_tempfile(response, '.exe')
 
             try:
                 version = self._extract_version_powershell(temp_path)
@@ -601,10 +765,7 @@ class VersionDetector:
             response = self.session.get(msi_url, stream=True, timeout=60)
             response.raise_for_status()
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.msi') as temp_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    temp_file.write(chunk)
-                temp_path = Path(temp_file.name)
+            temp_path = _download_to_tempfile(response, '.msi')
 
             try:
                 # Use msiexec to query MSI properties
@@ -648,10 +809,7 @@ class VersionDetector:
             response = self.session.get(archive_url, stream=True, timeout=60)
             response.raise_for_status()
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    temp_file.write(chunk)
-                temp_path = Path(temp_file.name)
+            temp_path = _download_to_tempfile(response, '.zip')
 
             try:
                 if not zipfile.is_zipfile(temp_path):
@@ -821,17 +979,35 @@ class SoftwareConfig:
 # Keep old class name for backward compatibility
 SoftwareVersionConfig = SoftwareConfig
 
-def get_version_info(config: SoftwareVersionConfig) -> Optional[Dict[str, Any]]:
+_shared_detector: Optional[VersionDetector] = None
+
+
+def get_shared_detector() -> VersionDetector:
+    """Return a process-wide VersionDetector so repeated lookups reuse pooled connections."""
+    global _shared_detector
+    if _shared_detector is None:
+        _shared_detector = VersionDetector()
+    return _shared_detector
+
+
+def get_version_info(
+    config: SoftwareVersionConfig,
+    detector: Optional[VersionDetector] = None,
+    current_version: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
     """
     Get complete version information for a software package
 
     Args:
         config: Software configuration object
+        detector: Detector to use; defaults to the shared one
+        current_version: Version already in the manifest; when it is still the latest,
+            the download is not hashed and 'hash' is None
 
     Returns:
         Dictionary with version, download_url, and hash if successful
     """
-    detector = VersionDetector()
+    detector = detector or get_shared_detector()
 
     # Get latest version
     result = detector.fetch_latest_version(config.homepage, config.version_patterns)
@@ -849,6 +1025,9 @@ def get_version_info(config: SoftwareVersionConfig) -> Optional[Dict[str, Any]]:
     else:
         return None
 
+    if current_version and version == current_version:
+        return {'version': version, 'download_url': download_url, 'hash': None}
+
     # Calculate hash
     hash_value = detector.calculate_hash(download_url)
     if not hash_value:
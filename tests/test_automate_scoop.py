@@ -0,0 +1,433 @@
+"""Tests for automate-scoop module."""
+import importlib.util
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def load_automate_scoop():
+    """Load automate-scoop module dynamically."""
+    as_path = Path(__file__).parent.parent / "scripts" / "automate-scoop.py"
+    spec = importlib.util.spec_from_file_location("automate_scoop", str(as_path))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+@pytest.fixture
+def automate_scoop():
+    """Provide automate-scoop module for testing."""
+    return load_automate_scoop()
+
+
+SAMPLE_PAGE = """
+<html><body>
+<h2 class="title">Release notes for MyApp v2.4.1</h2>
+<p>Version 2.4.1 is out. Download 2.4.1 below.</p>
+<a href="/files/2.4.1/myapp-2.4.1.exe">Installer</a>
+<div data-version="2.4.1"></div>
+<p>Previous release: v2.3.0</p>
+</body></html>
+"""
+
+
+class TestWizardVersionPatterns:
+    """Tests for ConfigWizard._suggest_version_patterns."""
+
+    def test_suggests_patterns_with_first_match(self, automate_scoop):
+        wizard = automate_scoop.ConfigWizard()
+        suggestions = wizard._suggest_version_patterns(SAMPLE_PAGE)
+        assert suggestions[0] == (r'Version\s+([0-9]+\.[0-9]+(?:\.[0-9]+)?)', "Version X.Y.Z → 2.4.1")
+        assert len(suggestions) <= 5
+
+    def test_no_patterns_on_plain_text(self, automate_scoop):
+        wizard = automate_scoop.ConfigWizard()
+        assert wizard._suggest_version_patterns("nothing to see here") == []
+
+
+class TestSuggestVersionPatterns:
+    """Tests for ScoopAutomation.suggest_version_patterns."""
+
+    @pytest.fixture
+    def suggest(self, automate_scoop, monkeypatch, tmp_path):
+        def _suggest(content):
+            response = MagicMock(text=content, status_code=200)
+            automation = automate_scoop.ScoopAutomation(bucket_dir=tmp_path)
+            monkeypatch.setattr(automation.http, "get", lambda *a, **kw: response)
+            return automation.suggest_version_patterns("https://example.com")
+        return _suggest
+
+    def test_reports_highest_version_per_pattern(self, suggest):
+        suggestions = dict(suggest(SAMPLE_PAGE))
+        assert suggestions[r'Version\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)'] == "Version prefix → 2.4.1"
+        assert suggestions[r'data-version="v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)"'] == "Version in data attribute → 2.4.1"
+        assert any(desc.startswith("Version in heading → 2.4.1") for desc in suggestions.values())
+
+    def test_highest_version_compares_numerically(self, suggest):
+        suggestions = dict(suggest("Version 1.9.0 Version 1.10.0 Version 1.2"))
+        assert suggestions[r'Version\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)'] == "Version prefix → 1.10.0"
+
+    def test_only_first_matches_are_considered(self, automate_scoop, suggest, monkeypatch):
+        monkeypatch.setattr(automate_scoop, "SUGGEST_MATCH_LIMIT", 2)
+        suggestions = dict(suggest("Version 1.0 Version 1.5 Version 3.0"))
+        assert suggestions[r'Version\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)'] == "Version prefix → 1.5"
+
+    def test_large_page_is_scanned_around_landmark(self, automate_scoop, suggest):
+        filler = "<script>var build = '9.9.9';</script>" * 2000
+        page = filler + '<main><p>Version 2.0.1</p></main>' + filler
+        relevant = automate_scoop._extract_relevant(page)
+        assert len(relevant) <= 2 * automate_scoop.RELEVANT_WINDOW and "Version 2.0.1" in relevant
+        assert dict(suggest(page))[r'Version\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)'] == "Version prefix → 2.0.1"
+
+    def test_falls_back_to_full_page_when_slice_has_nothing(self, suggest):
+        page = "<main></main>" + " " * 64 * 1024 + "Version 4.2"
+        assert dict(suggest(page))[r'Version\s+v?([0-9]+\.[0-9]+(?:\.[0-9]+)?)'] == "Version prefix → 4.2"
+
+    def test_no_suggestions_for_versionless_page(self, suggest):
+        assert suggest("<html><body>Hello</body></html>") == []
+
+    def test_anchor_prefilter_skips_impossible_patterns(self, automate_scoop):
+        present = automate_scoop._present_anchors('<div data-version="1.2"></div>')
+        assert present == {"data", "version"}
+        runnable = [d for _, _, d, anchors in automate_scoop._SUGGEST_VERSION_PATTERNS if anchors <= present]
+        assert runnable == ["Version prefix", "Version in data attribute"]
+
+    def test_scan_patterns_fall_back_to_re_without_re2(self, automate_scoop, monkeypatch):
+        monkeypatch.setattr(automate_scoop, "_re2", None)
+        compiled = automate_scoop._compile_scan_pattern(r"version\s+([0-9.]+)")
+        assert compiled.findall("VERSION 1.2") == ["1.2"]
+
+    def test_heading_scan_reads_only_heading_text(self, automate_scoop):
+        scan = automate_scoop._HeadingVersionScan()
+        content = "<h1>MyApp 3.1.4 released</h1><p>2.0</p><h3 id='x'>Changelog</h3><h2>v10.2</h2>"
+        assert scan.findall(content) == ["3.1.4", "10.2"]
+        assert automate_scoop.re.findall(scan.pattern, content, automate_scoop.re.I) == ["3.1.4", "10.2"]
+
+
+class TestDiscoverGithubTrending:
+    """Tests for ScoopAutomation._discover_github_trending."""
+
+    def test_keeps_repo_order_and_filters_repos_without_releases(self, automate_scoop, monkeypatch, tmp_path):
+        repos = [
+            {"name": f"tool_{i}", "full_name": f"owner/tool_{i}", "description": None, "license": {"spdx_id": "MIT"}}
+            for i in range(6)
+        ]
+
+        def fake_get(url, **kwargs):
+            if url.endswith("/search/repositories"):
+                return MagicMock(status_code=200, json=lambda: {"items": repos})
+            index = int(url.split("tool_")[1].split("/")[0])
+            assert kwargs["params"] == {"per_page": 1}
+            return MagicMock(status_code=200, json=lambda: [{"tag_name": "v1.0"}] if index % 2 == 0 else [])
+
+        automation = automate_scoop.ScoopAutomation(bucket_dir=tmp_path)
+        monkeypatch.delitem(automation.http.headers, "Authorization", raising=False)
+        monkeypatch.setattr(automation.http, "get", fake_get)
+        discovered = automation._discover_github_trending()
+        assert [d["name"] for d in discovered] == ["tool-0", "tool-2", "tool-4"]
+
+    def test_authenticated_discovery_uses_single_graphql_query(self, automate_scoop, monkeypatch, tmp_path):
+        nodes = [
+            {"name": "Tool_A", "nameWithOwner": "o/Tool_A", "description": "A", "licenseInfo": {"spdxId": "MIT"},
+             "latestRelease": {"tagName": "v1"}},
+            {"name": "tool_b", "nameWithOwner": "o/tool_b", "description": None, "licenseInfo": None,
+             "latestRelease": None},
+            {"name": "tool_c", "nameWithOwner": "o/tool_c", "description": None, "licenseInfo": None,
+             "latestRelease": {"tagName": "2.0"}},
+        ]
+        posts = []
+
+        def fake_post(url, json, timeout):
+            posts.append(json)
+            return MagicMock(status_code=200, json=lambda: {"data": {"search": {"nodes": nodes}}})
+
+        automation = automate_scoop.ScoopAutomation(bucket_dir=tmp_path)
+        monkeypatch.setitem(automation.http.headers, "Authorization", "Bearer t")
+        monkeypatch.setattr(automation.http, "post", fake_post)
+        monkeypatch.setattr(automation.http, "get", MagicMock(side_effect=AssertionError("no REST calls")))
+
+        discovered = automation._discover_github_trending()
+        assert len(posts) == 1
+        assert posts[0]["variables"]["q"].endswith("sort:stars-desc")
+        assert [(d["name"], d["license"]) for d in discovered] == [("tool-a", "MIT"), ("tool-c", "Unknown")]
+        assert discovered[1]["description"] == "tool_c - GitHub project"
+
+
+def streamed_response(chunks, status_code=200, headers=None):
+    """Build a fake streamed response yielding the given byte chunks."""
+    consumed = []
+
+    def iter_content(chunk_size=1):
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    response = MagicMock(status_code=status_code, headers=headers or {}, encoding="utf-8")
+    response.iter_content.side_effect = iter_content
+    response.consumed = consumed
+    return response
+
+
+class TestFetchHomepageText:
+    """Tests for fetch_homepage_text conditional polling."""
+
+    def test_304_reuses_stored_body(self, automate_scoop, monkeypatch, tmp_path):
+        monkeypatch.setattr(automate_scoop, "HOMEPAGE_CACHE_DIR", tmp_path / "homepages")
+        sent = []
+        responses = [
+            streamed_response([b"Version 1.2.3"], headers={"ETag": '"abc"', "Last-Modified": "Mon"}),
+            streamed_response([], status_code=304),
+        ]
+        http = MagicMock()
+        http.get.side_effect = lambda url, timeout, headers, stream: sent.append(headers) or responses.pop(0)
+
+        assert automate_scoop.fetch_homepage_text(http, "https://example.com") == "Version 1.2.3"
+        assert automate_scoop.fetch_homepage_text(http, "https://example.com") == "Version 1.2.3"
+        assert sent == [{}, {"If-None-Match": '"abc"', "If-Modified-Since": "Mon"}]
+
+    def test_stops_reading_after_settled_match(self, automate_scoop, monkeypatch, tmp_path):
+        monkeypatch.setattr(automate_scoop, "HOMEPAGE_CACHE_DIR", tmp_path / "homepages")
+        response = streamed_response([b"<p>Version 2.", b"5.1 is out</p>", b"<p>old</p>" * 100, b"tail"])
+        http = MagicMock()
+        http.get.return_value = response
+        pattern = automate_scoop.re.compile(r"Version\s+([0-9.]+)")
+        text = automate_scoop.fetch_homepage_text(http, "https://example.com", stop_at=pattern)
+        assert pattern.search(text).group(1) == "2.5.1"
+        assert len(response.consumed) == 2
+        response.close.assert_called_once()
+
+    def test_oversized_body_is_not_stored(self, automate_scoop, monkeypatch, tmp_path):
+        monkeypatch.setattr(automate_scoop, "HOMEPAGE_CACHE_DIR", tmp_path / "homepages")
+        monkeypatch.setattr(automate_scoop, "HOMEPAGE_CACHE_MAX_BODY", 8)
+        http = MagicMock()
+        http.get.side_effect = lambda url, timeout, headers, stream: streamed_response(
+            [b"Version 1.2.3 and more"], headers={"ETag": '"abc"'}
+        )
+
+        automate_scoop.fetch_homepage_text(http, "https://example.com/big")
+        automate_scoop.fetch_homepage_text(http, "https://example.com/big")
+
+        assert not (tmp_path / "homepages").exists()
+        assert http.get.call_args.kwargs["headers"] == {}
+
+    def test_homepage_session_bypasses_http_cache(self, automate_scoop, monkeypatch, tmp_path):
+        calls = []
+        monkeypatch.setattr(automate_scoop, "get_session", lambda **kw: calls.append(kw) or MagicMock(), raising=False)
+        automation = automate_scoop.ScoopAutomation(bucket_dir=tmp_path)
+        assert automation.homepage_http is not automation.http
+        assert [kw.get("use_cache", False) for kw in calls] == [False, True]
+
+
+class TestLoadSoftwareConfigsCached:
+    """Tests for load_software_configs_cached."""
+
+    def test_reparses_only_when_file_changes(self, automate_scoop, monkeypatch, tmp_path):
+        config_file = tmp_path / "software-configs.json"
+        config_file.write_text('{"software": []}', encoding="utf-8")
+        calls = []
+        real_load = automate_scoop.load_software_configs
+        monkeypatch.setattr(automate_scoop, "load_software_configs", lambda p: calls.append(p) or real_load(p))
+
+        assert automate_scoop.load_software_configs_cached(config_file) == []
+        assert automate_scoop.load_software_configs_cached(config_file) == []
+        assert len(calls) == 1
+
+        config_file.write_text('{"software": [], "version": 2}', encoding="utf-8")
+        automate_scoop.load_software_configs_cached(config_file)
+        assert len(calls) == 2
+
+
+class TestJsonHelpers:
+    """Tests for the _read_json/_write_json manifest helpers."""
+
+    @pytest.mark.parametrize("use_orjson", [False, True])
+    def test_round_trip_matches_stdlib_layout(self, automate_scoop, monkeypatch, tmp_path, use_orjson):
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(automate_scoop, "orjson", None)
+        data = {"software": [{"name": "café", "shortcuts": [["a.exe", "A"]]}]}
+        path = tmp_path / "configs.json"
+        automate_scoop._write_json(path, data)
+        assert path.read_text(encoding="utf-8") == automate_scoop.json.dumps(data, indent=2, ensure_ascii=False)
+        assert automate_scoop._read_json(path) == data
+
+    def test_decode_errors_are_json_decode_errors(self, automate_scoop, tmp_path):
+        path = tmp_path / "broken.json"
+        path.write_text("{", encoding="utf-8")
+        with pytest.raises(automate_scoop.json.JSONDecodeError):
+            automate_scoop._read_json(path)
+
+
+class TestValidateManifests:
+    """Tests for ScoopAutomation.validate_manifests."""
+
+    def test_reports_in_input_order_and_aggregates(self, automate_scoop, tmp_path, capsys):
+        good = {"version": "1.0", "description": "d", "homepage": "https://x", "url": "https://x/a.zip", "hash": "0" * 64}
+        paths = []
+        for i in range(12):
+            path = tmp_path / f"app-{i:02d}.json"
+            path.write_text("{" if i == 5 else automate_scoop.json.dumps(good), encoding="utf-8")
+            paths.append(path)
+
+        # no manifest_schema.json in scripts_dir: basic validation
+        automation = automate_scoop.ScoopAutomation(bucket_dir=tmp_path, scripts_dir=tmp_path)
+        assert automation.validate_manifests(paths) is False
+
+        lines = capsys.readouterr().out.splitlines()
+        assert [line.split()[1].rstrip(":") for line in lines] == [p.name for p in paths]
+        assert lines[5].startswith("❌ app-05.json: Invalid JSON")
+
+    def test_schema_validator_is_built_once_per_schema_revision(self, automate_scoop, tmp_path):
+        pytest.importorskip("jsonschema")
+        schema_path = tmp_path / "manifest_schema.json"
+        schema_path.write_text('{"type": "object", "required": ["version"]}', encoding="utf-8")
+
+        validator = automate_scoop.load_manifest_validator(schema_path)
+        assert validator is not None
+        assert automate_scoop.load_manifest_validator(schema_path) is validator
+
+        automation = automate_scoop.ScoopAutomation(bucket_dir=tmp_path, scripts_dir=tmp_path)
+        manifest = tmp_path / "app.json"
+        manifest.write_text("{}", encoding="utf-8")
+        assert automation.validate_manifests([manifest]) is False
+
+        schema_path.write_text('{"type": "object"}', encoding="utf-8")
+        os.utime(schema_path, ns=(0, 0))
+        assert automate_scoop.load_manifest_validator(schema_path) is not validator
+        assert automation.validate_manifests([manifest]) is True
+
+    def test_unchanged_passing_manifests_are_not_revalidated(self, automate_scoop, monkeypatch, tmp_path, capsys):
+        good = {"version": "1.0", "description": "d", "homepage": "https://x", "url": "https://x/a.zip", "hash": "0" * 64}
+        ok_path, bad_path = tmp_path / "ok.json", tmp_path / "bad.json"
+        ok_path.write_text(automate_scoop.json.dumps(good), encoding="utf-8")
+        bad_path.write_text("{}", encoding="utf-8")
+        automation = automate_scoop.ScoopAutomation(bucket_dir=tmp_path, scripts_dir=tmp_path)
+        assert automation.validate_manifests([ok_path, bad_path]) is False
+
+        parsed = []
+        real_loads = automate_scoop._loads_json
+        monkeypatch.setattr(automate_scoop, "_loads_json", lambda data: parsed.append(data) or real_loads(data))
+        assert automation.validate_manifests([ok_path, bad_path]) is False
+        assert b"{}" in parsed and ok_path.read_bytes() not in parsed
+        assert "✅ ok.json: Valid" in capsys.readouterr().out
+
+        ok_path.write_text(automate_scoop.json.dumps({**good, "version": "1.1"}), encoding="utf-8")
+        bad_path.write_text(automate_scoop.json.dumps(good), encoding="utf-8")
+        parsed.clear()
+        assert automation.validate_manifests([ok_path, bad_path]) is True
+        assert ok_path.read_bytes() in parsed and bad_path.read_bytes() in parsed
+        cache = automate_scoop._read_json(tmp_path / automate_scoop.VALIDATION_CACHE_NAME)
+        assert set(cache) == {str(ok_path), str(bad_path)}
+
+    def test_missing_schema_has_no_validator(self, automate_scoop, tmp_path):
+        assert automate_scoop.load_manifest_validator(tmp_path / "missing.json") is None
+
+
+class TestSaveConfiguration:
+    """Tests for ConfigWizard._save_configuration."""
+
+    def test_overwrites_existing_entry_in_place(self, automate_scoop, monkeypatch, tmp_path):
+        wizard = automate_scoop.ConfigWizard()
+        wizard.config_file = tmp_path / "software-configs.json"
+        wizard.config_file.write_text(automate_scoop.json.dumps({"software": [
+            {"name": "a", "description": "old a"}, {"name": "b", "description": "old b"},
+        ]}), encoding="utf-8")
+        monkeypatch.setattr("builtins.input", lambda prompt: "y")
+
+        def config(name, description):
+            return automate_scoop.SoftwareConfig(
+                name=name, description=description, homepage="https://x", license="MIT", version_regex="v(.+)",
+            )
+
+        wizard._save_configuration(config("b", "new b"))
+        wizard._save_configuration(config("c", "new c"))
+
+        saved = automate_scoop._read_json(wizard.config_file)["software"]
+        assert [(s["name"], s["description"]) for s in saved] == [("a", "old a"), ("b", "new b"), ("c", "new c")]
+
+
+class TestUpdateScripts:
+    """Tests for ScoopAutomation.update_scripts."""
+
+    def test_lists_once_until_scripts_are_generated(self, automate_scoop, monkeypatch, tmp_path):
+        for name in ["update-b.py", "update-a.py", "update-all.py", "update-notes.txt", "other.py"]:
+            (tmp_path / name).write_text("", encoding="utf-8")
+        automation = automate_scoop.ScoopAutomation(bucket_dir=tmp_path, scripts_dir=tmp_path)
+        assert [p.name for p in automation.update_scripts] == ["update-a.py", "update-b.py"]
+
+        (tmp_path / "update-c.py").write_text("", encoding="utf-8")
+        assert len(automation.update_scripts) == 2
+
+        monkeypatch.setattr(automation.script_generator, "generate_all_scripts", lambda: [])
+        automation.generate_update_scripts()
+        assert [p.name for p in automation.update_scripts] == ["update-a.py", "update-b.py", "update-c.py"]
+
+
+class TestFileContains:
+    """Tests for _file_contains."""
+
+    def test_finds_needle_and_handles_empty_files(self, automate_scoop, tmp_path):
+        path = tmp_path / "update-all.py"
+        path.write_bytes("# ✓\ndef discover_update_scripts():\n    pass\n".encode("utf-8"))
+        assert automate_scoop._file_contains(path, b"discover_update_scripts")
+        assert not automate_scoop._file_contains(path, b"run_in_process")
+
+        path.write_bytes(b"")
+        assert not automate_scoop._file_contains(path, b"discover_update_scripts")
+
+
+class TestClassifyProvider:
+    """Tests for the audit-providers marker scan."""
+
+    @pytest.mark.parametrize("content, provider", [
+        (b"see https://api.github.com/repos/x/y", "github"),
+        (b"https://download.microsoft.com/a then https://github.com/x", "github"),
+        (b"https://dl.google.com/x and https://go.microsoft.com/fwlink", "microsoft"),
+        (b"https://storage.googleapis.com/bucket", "google"),
+        (b"https://d1.cloudfront.net/x", "google"),
+        (b"https://example.com/download", "other"),
+    ])
+    def test_priority_matches_marker_order(self, automate_scoop, content, provider):
+        assert automate_scoop._classify_provider(content) == provider
+
+
+class TestAuditProviders:
+    """Tests for the audit-providers command."""
+
+    def test_unchanged_scripts_reuse_cached_classification(self, automate_scoop, monkeypatch, tmp_path, capsys):
+        (tmp_path / "providers.json").write_text('{"update-mapped.py": "google"}', encoding="utf-8")
+        (tmp_path / "update-mapped.py").write_text("", encoding="utf-8")
+        (tmp_path / "update-gh.py").write_text("URL = 'https://api.github.com/repos/a/b'", encoding="utf-8")
+        (tmp_path / "update-ms.py").write_text("URL = 'https://go.microsoft.com/fwlink'", encoding="utf-8")
+        scanned = []
+        real_classify = automate_scoop._classify_provider
+        monkeypatch.setattr(automate_scoop, "_classify_provider", lambda head: scanned.append(head) or real_classify(head))
+        argv = ["automate-scoop.py", "audit-providers", "--scripts-dir", str(tmp_path), "--bucket-dir", str(tmp_path)]
+        monkeypatch.setattr(automate_scoop.sys, "argv", argv)
+
+        automate_scoop.main()
+        assert len(scanned) == 2
+        automate_scoop.main()
+        assert len(scanned) == 2
+
+        (tmp_path / "update-ms.py").write_text("URL = 'https://github.com/a/b'", encoding="utf-8")
+        automate_scoop.main()
+        assert len(scanned) == 3
+        out = capsys.readouterr().out.split("🔎")[-1]
+        assert "update-ms.py: github" in out and "update-mapped.py: google" in out
+        assert "Scanned: 1 / Cached: 2" in out
+
+        monkeypatch.setattr(automate_scoop.sys, "argv", argv + ["--refresh"])
+        automate_scoop.main()
+        assert len(scanned) == 5
+        assert "Scanned: 2 / Cached: 1" in capsys.readouterr().out
+
+
+def test_fingerprint_is_128_bit_blake2b_without_blake3(automate_scoop, monkeypatch):
+    monkeypatch.setattr(automate_scoop, "_blake3", None)
+    digest = automate_scoop._fingerprint(b"manifest")
+    assert digest == automate_scoop.hashlib.blake2b(b"manifest", digest_size=16).hexdigest()
+    assert len(digest) == 32
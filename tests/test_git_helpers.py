@@ -82,6 +82,12 @@ class TestRunGitCommand:
         
         assert returncode != 0
     
+    def test_run_git_command_discard_stdout(self, git_helpers):
+        """Discarded stdout comes back empty; the return code is unaffected."""
+        returncode, stdout, stderr = git_helpers.run_git_command(["git", "--version"], discard_stdout=True)
+        assert returncode == 0
+        assert stdout == ""
+
     def test_run_git_command_with_cwd(self, git_helpers, tmp_path):
         """Test git command with custom working directory."""
         returncode, stdout, stderr = git_helpers.run_git_command(
@@ -176,6 +182,78 @@ class TestCommitManifestChange:
             # Should return False because there are no changes
             assert result is False
 
+    def test_commit_message_tells_add_from_update(self, git_helpers, temp_git_repo):
+        """New manifests are committed as Add, changed ones as Update."""
+        manifest = temp_git_repo / "app.json"
+        with patch.object(git_helpers, 'REPO_ROOT', temp_git_repo):
+            manifest.write_text(json.dumps({"version": "1.0"}), encoding="utf-8")
+            assert git_helpers.commit_manifest_change("app", str(manifest)) is True
+            _, subject, _ = git_helpers.run_git_command(["git", "log", "-1", "--format=%s"])
+            assert subject.strip() == "app: Add version 1.0"
+
+            manifest.write_text(json.dumps({"version": "1.1"}), encoding="utf-8")
+            assert git_helpers.commit_manifest_change("app", str(manifest)) is True
+            _, subject, _ = git_helpers.run_git_command(["git", "log", "-1", "--format=%s"])
+            assert subject.strip() == "app: Update to version 1.1"
+
+
+class TestPorcelainStatus:
+    """Tests for _porcelain_status."""
+
+    @pytest.mark.parametrize("out, expected", [
+        ("", None),
+        ("? bucket/new.json", "?"),
+        ("1 A. N... 000000 100644 100644 0 abc bucket/new.json", "A"),
+        ("1 .M N... 100644 100644 100644 abc abc bucket/app.json", "M"),
+        ("1 M. N... 100644 100644 100644 abc def bucket/app.json", "M"),
+    ])
+    def test_status_codes(self, git_helpers, out, expected):
+        assert git_helpers._porcelain_status(out) == expected
+
+
+class TestCommitMany:
+    """Tests for stage_manifests and commit_many."""
+
+    def _write_manifests(self, repo_dir, versions):
+        bucket = repo_dir / "bucket"
+        bucket.mkdir(exist_ok=True)
+        paths = []
+        for name, version in versions.items():
+            path = bucket / f"{name}.json"
+            path.write_text(json.dumps({"version": version}), encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def test_stage_manifests_reports_status(self, git_helpers, temp_git_repo):
+        """Staged manifests are reported with their status; unchanged ones are left out."""
+        with patch.object(git_helpers, 'REPO_ROOT', temp_git_repo):
+            old, = self._write_manifests(temp_git_repo, {"old": "1.0"})
+            git_helpers.commit_many([("old", old, "1.0")])
+            new, unchanged = self._write_manifests(temp_git_repo, {"new": "2.0", "old": "1.0"})
+
+            assert git_helpers.stage_manifests([new, unchanged]) == {new: "A"}
+
+    def test_commit_many_single_commit(self, git_helpers, temp_git_repo):
+        """Several manifests end up in one commit with one line per app."""
+        with patch.object(git_helpers, 'REPO_ROOT', temp_git_repo):
+            a, b = self._write_manifests(temp_git_repo, {"alpha": "1.0", "beta": "2.0"})
+
+            assert git_helpers.commit_many([("alpha", a, ""), ("beta", b, "2.0")]) is True
+
+            rc, out, _ = git_helpers.run_git_command(["git", "log", "-1", "--format=%B%x00", "--name-only"])
+            message, files = out.split("\x00")
+            assert rc == 0
+            assert message.splitlines()[0] == "update (2): alpha, beta"
+            assert "alpha: Add version 1.0" in message
+            assert "beta: Add version 2.0" in message
+            assert files.split() == ["bucket/alpha.json", "bucket/beta.json"]
+
+    def test_commit_many_nothing_to_commit(self, git_helpers, temp_git_repo, capsys):
+        """Returns False when none of the manifests changed."""
+        with patch.object(git_helpers, 'REPO_ROOT', temp_git_repo):
+            assert git_helpers.commit_many([("ghost", temp_git_repo / "test.txt", "1.0")]) is False
+            assert "No staged manifest changes" in capsys.readouterr().out
+
 
 class TestPushChanges:
     """Tests for push_changes function."""
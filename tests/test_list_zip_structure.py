@@ -0,0 +1,389 @@
+"""Tests for list_zip_structure module."""
+import importlib.util
+import io
+import os
+import struct
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+
+def load_list_zip_structure():
+    """Load list_zip_structure module dynamically."""
+    lz_path = Path(__file__).parent.parent / "list_zip_structure.py"
+    spec = importlib.util.spec_from_file_location("list_zip_structure", str(lz_path))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+@pytest.fixture
+def lzs():
+    """Provide list_zip_structure module for testing."""
+    return load_list_zip_structure()
+
+
+def make_zip(members, comment=b""):
+    """Build an in-memory ZIP archive from a {name: data} mapping."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+        archive.comment = comment
+    return buf.getvalue()
+
+
+def make_zip64_tail(lzs, name=b"huge.bin", file_size=5 * 2**32):
+    """Build a central directory plus zip64 end records for one >4 GiB member."""
+    extra = struct.pack("<HHQQ", lzs.ZIP64_EXTRA_ID, 16, file_size, file_size)
+    cd = lzs.CD_STRUCT.pack(
+        lzs.CD_SIGNATURE, 45, 45, 0, 0, 0, 0, 0, lzs.ZIP64_MARKER, lzs.ZIP64_MARKER,
+        len(name), len(extra), 0, 0, 0, 0, 0,
+    ) + name + extra
+    zip64_eocd = lzs.ZIP64_EOCD_STRUCT.pack(lzs.ZIP64_EOCD_SIGNATURE, 44, 45, 45, 0, 0, 1, 1, len(cd), 0)
+    locator = lzs.ZIP64_LOCATOR_STRUCT.pack(lzs.ZIP64_LOCATOR_SIGNATURE, 0, len(cd), 1)
+    eocd = lzs.EOCD_STRUCT.pack(lzs.EOCD_SIGNATURE, 0, 0, 0xFFFF, 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF, 0)
+    return cd + zip64_eocd + locator + eocd
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+    def close(self):
+        pass
+
+
+class FakeServer:
+    """Serve a byte blob over fake ranged GET calls, recording requests."""
+
+    def __init__(self, blob, etag='"v1"', multirange=True, ranges=True):
+        self.blob = blob
+        self.etag = etag
+        self.multirange = multirange
+        self.ranges = ranges
+        self.calls = []
+
+    def get(self, url, headers=None, **kwargs):
+        headers = headers or {}
+        rng = headers.get("Range")
+        self.calls.append(("GET", rng))
+        if headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304, b"", {"ETag": self.etag})
+        if not self.ranges:
+            return FakeResponse(200, self.blob, {"ETag": self.etag, "Content-Length": str(len(self.blob))})
+        spans = []
+        for part in rng.split("=", 1)[1].split(","):
+            start, end = part.split("-")
+            if not start:  # suffix range: last N bytes
+                start, end = max(0, len(self.blob) - int(end)), len(self.blob) - 1
+            spans.append((int(start), min(int(end), len(self.blob) - 1)))
+        if len(spans) > 1:
+            if not self.multirange:
+                return FakeResponse(200, self.blob, {"ETag": self.etag})
+            body = b""
+            for start, end in spans:
+                body += b"--SEP\r\nContent-Type: application/zip\r\n"
+                body += f"Content-Range: bytes {start}-{end}/{len(self.blob)}\r\n\r\n".encode()
+                body += self.blob[start:end + 1] + b"\r\n"
+            body += b"--SEP--\r\n"
+            return FakeResponse(206, body, {"Content-Type": "multipart/byteranges; boundary=SEP", "ETag": self.etag})
+        start, end = spans[0]
+        headers = {"Content-Range": f"bytes {start}-{end}/{len(self.blob)}", "ETag": self.etag}
+        return FakeResponse(206, self.blob[start:end + 1], headers)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(lzs, tmp_path, monkeypatch):
+    """Keep the zip metadata and Scoop caches inside the test's temporary directory."""
+    monkeypatch.setattr(lzs, "CACHE_DIR", tmp_path / "zipmeta")
+    monkeypatch.setattr(lzs, "SCOOP_CACHE_DIR", tmp_path / "scoop-cache")
+
+
+@pytest.fixture
+def serve(lzs, monkeypatch):
+    """Patch HTTP access in list_zip_structure to serve the given blob."""
+    def _serve(blob, **kwargs):
+        server = FakeServer(blob, **kwargs)
+        monkeypatch.setattr(lzs, "get_session", lambda: server)
+        return server
+    return _serve
+
+
+class TestFindEocd:
+    """Tests for find_eocd function."""
+
+    def test_find_eocd_locates_central_directory(self, lzs):
+        blob = make_zip({"a.txt": b"hello", "dir/b.txt": b"world"})
+        eocd_index, cd_offset, cd_size = lzs.find_eocd(blob)
+        assert blob[eocd_index:eocd_index + 4] == lzs.EOCD_SIGNATURE
+        assert blob[cd_offset:cd_offset + 4] == b"PK\x01\x02"
+        assert cd_offset + cd_size == eocd_index
+
+    def test_find_eocd_with_comment(self, lzs):
+        blob = make_zip({"a.txt": b"hello"}, comment=b"release notes")
+        eocd_index, _, _ = lzs.find_eocd(blob)
+        assert eocd_index == len(blob) - lzs.EOCD_STRUCT.size - len(b"release notes")
+
+    def test_find_eocd_skips_signature_inside_comment(self, lzs):
+        comment = b"see PK\x05\x06" + b"\x00" * 30
+        blob = make_zip({"a.txt": b"hello"}, comment=comment)
+        eocd_index, _, _ = lzs.find_eocd(blob)
+        assert eocd_index == len(blob) - lzs.EOCD_STRUCT.size - len(comment)
+
+    def test_find_eocd_missing(self, lzs):
+        with pytest.raises(ValueError):
+            lzs.find_eocd(b"not a zip archive")
+
+
+class TestIterCentralDirectory:
+    """Tests for iter_central_directory function."""
+
+    def test_matches_zipfile_listing(self, lzs):
+        blob = make_zip({"a.txt": b"hello", "sub/dir/b.bin": b"\x00" * 300, "ünïcode.txt": b"u"})
+        _, cd_offset, cd_size = lzs.find_eocd(blob)
+        entries = list(lzs.iter_central_directory(blob[cd_offset:cd_offset + cd_size]))
+        with zipfile.ZipFile(io.BytesIO(blob)) as archive:
+            expected = [(i.filename, i.file_size) for i in archive.infolist()]
+        assert entries == expected
+
+    def test_zip64_sizes_read_from_extra_field(self, lzs):
+        blob = make_zip64_tail(lzs)
+        eocd_index, cd_offset, cd_size = lzs.find_eocd(blob)
+        assert blob[eocd_index:eocd_index + 4] == lzs.ZIP64_EOCD_SIGNATURE
+        entries = list(lzs.iter_central_directory(blob[cd_offset:cd_offset + cd_size], zip64=True))
+        with zipfile.ZipFile(io.BytesIO(blob)) as archive:
+            expected = [(i.filename, i.file_size) for i in archive.infolist()]
+        assert entries == expected == [("huge.bin", 5 * 2**32)]
+
+    def test_zip64_entry_without_zip64_end_records(self, lzs):
+        """Per-entry 0xFFFFFFFF sizes resolve on the fast walker too."""
+        blob = make_zip64_tail(lzs)
+        eocd_index, cd_offset, cd_size = lzs.find_eocd(blob)
+        cd_bytes = blob[cd_offset:cd_offset + cd_size]
+        assert list(lzs.iter_central_directory(cd_bytes)) == [("huge.bin", 5 * 2**32)]
+        # The marker with no extra block to back it is refused, not reported as 4294967295
+        bare = cd_bytes[:30] + b"\x00\x00" + cd_bytes[32:46] + b"huge.bin"
+        with pytest.raises(ValueError):
+            list(lzs.iter_central_directory(bare))
+
+    def test_entry_count_bounds_walk(self, lzs):
+        blob = make_zip({"a.txt": b"hello", "b.txt": b"world"})
+        eocd_index, cd_offset, cd_size = lzs.find_eocd(blob)
+        cd_bytes = blob[cd_offset:cd_offset + cd_size]
+        count = lzs.entry_count(blob[eocd_index:])
+        assert count == 2
+        assert len(list(lzs.iter_central_directory(cd_bytes + b"\x00" * 64, count=count))) == 2
+        with pytest.raises(ValueError):
+            list(lzs.iter_central_directory(cd_bytes[:60], count=count))
+
+    def test_rejects_corrupt_record(self, lzs):
+        with pytest.raises(ValueError):
+            list(lzs.iter_central_directory(b"\x00" * 64))
+
+
+class TestSession:
+    """Tests for the shared HTTP session."""
+
+    def test_https_adapter_uses_aead_tls_context(self, lzs):
+        import ssl
+
+        adapter = lzs._make_session().get_adapter("https://github.com")
+        context = adapter.poolmanager.connection_pool_kw["ssl_context"]
+        assert context.minimum_version == ssl.TLSVersion.TLSv1_2
+        tls12 = [c for c in context.get_ciphers() if c["protocol"] == "TLSv1.2"]
+        assert tls12 and all(c["aead"] for c in tls12)
+
+
+class TestListZipContents:
+    """Tests for list_zip_contents function."""
+
+    def test_small_archive_uses_single_range(self, lzs, serve):
+        server = serve(make_zip({"a.txt": b"hello", "dir/b.txt": b"world!"}))
+        entries = lzs.list_zip_contents("https://example.com/app.zip")
+        assert entries == [("a.txt", 5), ("dir/b.txt", 6)]
+        assert server.calls == [("GET", f"bytes=-{lzs.TAIL_SIZE}")]
+
+    def test_large_central_directory_fetched_separately(self, lzs, serve):
+        members = {f"chrome/locales/{i:05d}/" + "x" * 80 + ".pak": b"" for i in range(1000)}
+        blob = make_zip(members)
+        server = serve(blob)
+        entries = lzs.list_zip_contents("https://example.com/app.zip")
+        assert len(entries) == 1000
+        assert entries[0] == (next(iter(members)), 0)
+        assert [c[0] for c in server.calls] == ["GET", "GET"]
+
+    def test_cached_central_directory_reused_on_304(self, lzs, serve):
+        server = serve(make_zip({"a.txt": b"hello"}))
+        first = lzs.list_zip_contents("https://example.com/app.zip")
+        server.calls.clear()
+        assert lzs.list_zip_contents("https://example.com/app.zip") == first
+        assert server.calls == [("GET", f"bytes=-{lzs.TAIL_SIZE}")]
+
+    def test_cache_refreshed_when_etag_changes(self, lzs, serve):
+        server = serve(make_zip({"a.txt": b"hello"}))
+        lzs.list_zip_contents("https://example.com/app.zip")
+        server.blob = make_zip({"b.txt": b"changed"})
+        server.etag = '"v2"'
+        assert lzs.list_zip_contents("https://example.com/app.zip") == [("b.txt", 7)]
+        assert lzs.load_cached_meta("https://example.com/app.zip")["etag"] == '"v2"'
+
+    def test_parsed_listing_reused_on_304(self, lzs, serve, monkeypatch):
+        pytest.importorskip("msgpack")
+        pytest.importorskip("zstandard")
+        serve(make_zip({"a.txt": b"hello", "b.txt": b"hi"}))
+        first = lzs.list_zip_contents("https://example.com/app.zip")
+
+        def fail(*_):
+            raise AssertionError("central directory re-parsed")
+
+        monkeypatch.setattr(lzs, "iter_central_directory", fail)
+        assert lzs.list_zip_contents("https://example.com/app.zip") == first
+
+    def test_changed_asset_with_same_layout_uses_multi_range(self, lzs, serve):
+        names = [f"chrome/locales/{i:05d}/" + "x" * 80 + ".pak" for i in range(1000)]
+        server = serve(make_zip({name: b"a" for name in names}))
+        lzs.list_zip_contents("https://example.com/app.zip")
+        server.blob = make_zip({name: b"b" for name in names})
+        server.etag = '"v2"'
+        server.calls.clear()
+        entries = lzs.list_zip_contents("https://example.com/app.zip")
+        assert [name for name, _ in entries] == names
+        assert len(server.calls) == 1
+        assert "," in server.calls[0][1]
+
+    def test_multi_range_refused_retries_single_ranges(self, lzs, serve):
+        names = [f"chrome/locales/{i:05d}/" + "x" * 80 + ".pak" for i in range(1000)]
+        server = serve(make_zip({name: b"a" for name in names}), multirange=False)
+        lzs.list_zip_contents("https://example.com/app.zip")
+        server.blob = make_zip({name: b"b" for name in names})
+        server.etag = '"v2"'
+        server.calls.clear()
+        assert len(lzs.list_zip_contents("https://example.com/app.zip")) == 1000
+        assert [c[0] for c in server.calls] == ["GET", "GET", "GET"]
+        assert "," in server.calls[0][1] and "," not in server.calls[1][1]
+
+    def test_server_without_range_support_is_refused(self, lzs, serve):
+        blob = make_zip({"a.bin": os.urandom(2 * lzs.TAIL_SIZE)})
+        assert len(blob) > lzs.TAIL_SIZE
+        serve(blob, ranges=False)
+        with pytest.raises(lzs.RangeNotSupportedError):
+            lzs.list_zip_contents("https://example.com/app.zip")
+
+    def test_small_archive_served_whole_is_listed(self, lzs, serve):
+        server = serve(make_zip({"a.txt": b"hello"}), ranges=False)
+        assert lzs.list_zip_contents("https://example.com/app.zip") == [("a.txt", 5)]
+        assert server.calls == [("GET", f"bytes=-{lzs.TAIL_SIZE}")]
+
+    def test_zip64_archive_dispatches_to_zip64_walker(self, lzs, serve):
+        serve(make_zip64_tail(lzs))
+        assert lzs.list_zip_contents("https://example.com/huge.zip") == [("huge.bin", 5 * 2**32)]
+
+    def test_iter_zip_contents_is_lazy(self, lzs, serve):
+        server = serve(make_zip({"a.txt": b"hello", "b.txt": b"hi"}))
+        entries = lzs.iter_zip_contents("https://example.com/app.zip")
+        assert server.calls == []
+        assert next(entries) == ("a.txt", 5)
+        assert list(entries) == [("b.txt", 2)]
+
+
+class TestScoopCache:
+    """Tests for the local Scoop cache fast path."""
+
+    @pytest.mark.parametrize("entries", [1, 1000])
+    def test_cached_download_read_without_network(self, lzs, serve, entries):
+        url = "https://github.com/owner/app/releases/download/v1.0/app-1.0.zip"
+        members = {f"dir/{i:05d}/" + "x" * 80 + ".txt": b"data" for i in range(entries)}
+        blob = make_zip(members)
+        lzs.SCOOP_CACHE_DIR.mkdir()
+        (lzs.SCOOP_CACHE_DIR / ("app#1.0" + lzs._cache_suffixes(url)[0])).write_bytes(blob)
+        server = serve(b"")
+        entries_listed = lzs.list_zip_contents(url)
+        assert entries_listed == [(name, 4) for name in members]
+        assert server.calls == []
+
+    def test_module_import_does_not_load_requests(self):
+        lz_path = Path(__file__).parent.parent / "list_zip_structure.py"
+        code = (
+            "import importlib.util, sys\n"
+            f"spec = importlib.util.spec_from_file_location('lzs', {str(lz_path)!r})\n"
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+            "print('requests' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
+
+    def test_tail_buffer_reused_across_archives(self, lzs, tmp_path):
+        big = tmp_path / "big.zip"
+        small = tmp_path / "small.zip"
+        big.write_bytes(make_zip({"a.bin": bytes(range(256)) * 400}, comment=b"c" * 1000))
+        small.write_bytes(make_zip({"b.txt": b"hi"}))
+        lzs.read_local_central_directory(big)
+        buffer_id = id(lzs._tail_buffer())
+        cd_bytes, eocd_bytes = lzs.read_local_central_directory(small)
+        assert id(lzs._tail_buffer()) == buffer_id
+        assert list(lzs.iter_central_directory(cd_bytes)) == [("b.txt", 2)]
+        assert eocd_bytes.startswith(lzs.EOCD_SIGNATURE) and len(eocd_bytes) == lzs.EOCD_STRUCT.size
+
+    def test_hashed_cache_name_is_found(self, lzs):
+        url = "https://example.com/app.zip"
+        lzs.SCOOP_CACHE_DIR.mkdir()
+        cached = lzs.SCOOP_CACHE_DIR / ("app#1.0" + lzs._cache_suffixes(url)[1])
+        cached.write_bytes(b"")
+        assert cached.name.endswith(".zip")
+        assert lzs.find_cached_download(url) == cached
+
+    def test_cache_directory_scanned_once(self, lzs, monkeypatch):
+        lzs.SCOOP_CACHE_DIR.mkdir()
+        urls = [f"https://example.com/app-{i}.zip" for i in range(20)]
+        for i, url in enumerate(urls):
+            (lzs.SCOOP_CACHE_DIR / (f"app#{i}" + lzs._cache_suffixes(url)[0])).write_bytes(b"")
+        scans = []
+        real_scandir = lzs.os.scandir
+        monkeypatch.setattr(lzs.os, "scandir", lambda p: scans.append(p) or real_scandir(p))
+        assert all(lzs.find_cached_download(url) is not None for url in urls)
+        assert lzs.find_cached_download("https://example.com/missing.zip") is None
+        assert len(scans) == 1
+
+
+class TestListMany:
+    """Tests for list_many function."""
+
+    def test_lists_urls_in_order_and_reports_failures(self, lzs, monkeypatch):
+        def fake_list(url):
+            if url.endswith("bad.zip"):
+                raise ValueError("End of Central Directory record not found")
+            return [(url.rsplit("/", 1)[1], 1)]
+
+        monkeypatch.setattr(lzs, "list_zip_contents", fake_list)
+        urls = [f"https://example.com/{i}.zip" for i in range(5)] + ["https://example.com/bad.zip"]
+        results = lzs.list_many(urls)
+        assert [url for url, _ in results] == urls
+        assert results[0][1] == [("0.zip", 1)]
+        assert isinstance(results[-1][1], ValueError)
+
+
+class TestWriteListing:
+    """Tests for write_listing function."""
+
+    def test_writes_chunks_to_stdout_fd(self, lzs, capfd):
+        entries = [(f"dir/{i:05d}.txt", i) for i in range(10000)]
+        lzs.write_listing(entries)
+        lines = capfd.readouterr().out.splitlines()
+        assert lines[0] == "0\tdir/00000.txt"
+        assert len(lines) == 10000
+
+    def test_falls_back_without_real_fd(self, lzs, capsys):
+        lzs.write_listing([("ünïcode.txt", 3)])
+        assert capsys.readouterr().out == "3\tünïcode.txt\n"
@@ -1,6 +1,8 @@
 """Tests for manifest_generator module."""
 import importlib.util
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -9,7 +11,7 @@ import pytest
 
 def load_manifest_generator():
     """Load manifest_generator module dynamically."""
-    mg_path = Path(__file__).parent.parent / "scripts" / "manifest-generator.py"
+    mg_path = Path(__file__).parent.parent / "scripts" / "manifest_generator.py"
     spec = importlib.util.spec_from_file_location("manifest_generator", str(mg_path))
     mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(mod)  # type: ignore
@@ -116,6 +118,20 @@ class TestFetchVersionInfoLegacy:
             
             assert "Version not found" in str(exc_info.value)
     
+    def test_fetch_version_info_legacy_reuses_compiled_patterns(self, manifest_generator, sample_config):
+        """Config regexes are compiled once and matched case-insensitively."""
+        mg = manifest_generator.ManifestGenerator()
+        mock_response = MagicMock()
+        mock_response.text = '{"TAG_NAME": "v1.2.3"}'
+        manifest_generator._compile.cache_clear()
+
+        with patch.object(mg.detector.session, 'get', return_value=mock_response):
+            assert mg.fetch_version_info_legacy(sample_config)[0] == "1.2.3"
+            assert mg.fetch_version_info_legacy(sample_config)[0] == "1.2.3"
+
+        info = manifest_generator._compile.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
     def test_fetch_version_info_legacy_network_error(self, manifest_generator, version_detector, sample_config):
         """Test version fetch when network request fails."""
         mg = manifest_generator.ManifestGenerator()
@@ -238,6 +254,98 @@ class TestGenerateManifest:
             assert '1.2.3' in manifest['post_install'][0]
 
 
+class TestWithVersion:
+    """Tests for the $version substitution helper."""
+
+    def test_substitutes_nested_lists_and_keeps_other_variables(self, manifest_generator):
+        value = [["app-$version.exe", "App $version"], "Move-Item \"$dir\\$version\" $persist_dir", 3]
+        assert manifest_generator._with_version(value, "1.2") == [
+            ["app-1.2.exe", "App 1.2"], "Move-Item \"$dir\\1.2\" $persist_dir", 3
+        ]
+
+
+class TestGenerateAndSaveAll:
+    """Tests for generate_and_save_all method."""
+
+    def test_results_keep_config_order_and_errors(self, manifest_generator, version_detector, temp_bucket_dir):
+        """Each config gets its saved path or its error, in input order."""
+        mg = manifest_generator.ManifestGenerator(bucket_dir=temp_bucket_dir)
+        configs = [
+            version_detector.SoftwareConfig(
+                name=name, description=name, homepage=f"https://example.com/{name}", license="MIT",
+                version_regex=r"([0-9.]+)", download_url_template="https://example.com/$version.zip",
+            )
+            for name in ("one", "broken", "three")
+        ]
+
+        def fake_version_info(config, detector=None):
+            if config.name == "broken":
+                return None
+            return {"version": "1.0", "download_url": "https://example.com/1.0.zip", "hash": "abc"}
+
+        with patch.object(manifest_generator, 'get_version_info', side_effect=fake_version_info), \
+             patch.object(mg, 'fetch_version_info_legacy', side_effect=Exception("no version")):
+            results = mg.generate_and_save_all(configs)
+
+        assert [config.name for config, _, _ in results] == ["one", "broken", "three"]
+        assert results[0][1] == temp_bucket_dir / "one.json" and results[0][2] is None
+        assert results[1][1] is None and isinstance(results[1][2], Exception)
+        assert json.loads((temp_bucket_dir / "three.json").read_text(encoding="utf-8"))["version"] == "1.0"
+
+
+class TestGenerateManifestFallback:
+    """Tests for the legacy fallback in generate_manifest."""
+
+    def test_shared_detector_runs_once_before_legacy(self, manifest_generator, sample_config, temp_bucket_dir):
+        mg = manifest_generator.ManifestGenerator(bucket_dir=temp_bucket_dir)
+
+        with patch.object(manifest_generator, 'get_version_info', return_value=None) as shared, \
+             patch.object(mg, 'fetch_version_info_legacy', return_value=("2.0", "https://example.com/2.0.exe")), \
+             patch.object(mg.detector, 'calculate_hash', return_value="abc"):
+            manifest = mg.generate_manifest(sample_config)
+
+        assert shared.call_count == 1
+        assert manifest["version"] == "2.0"
+        assert manifest["hash"] == "sha256:abc"
+
+
+class TestResolveVersion:
+    """Tests for the per-generator get_version_info memo."""
+
+    def test_identical_version_configs_resolve_once(self, manifest_generator, sample_config, temp_bucket_dir):
+        mg = manifest_generator.ManifestGenerator(bucket_dir=temp_bucket_dir)
+        info = {"version": "1.0", "download_url": "https://example.com/1.0.exe", "hash": "abc"}
+
+        with patch.object(manifest_generator, 'get_version_info', return_value=info) as shared:
+            assert mg._resolve_version(sample_config) == info
+            assert mg._resolve_version(sample_config) == info
+            sample_config.homepage = "https://example.com/other"
+            assert mg._resolve_version(sample_config) == info
+
+        assert shared.call_count == 2
+
+    def test_concurrent_callers_share_one_lookup(self, manifest_generator, sample_config, temp_bucket_dir):
+        mg = manifest_generator.ManifestGenerator(bucket_dir=temp_bucket_dir)
+        info = {"version": "1.0", "download_url": "https://example.com/1.0.exe", "hash": "abc"}
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_lookup(config, detector):
+            started.set()
+            release.wait(5)
+            return info
+
+        with patch.object(manifest_generator, 'get_version_info', side_effect=slow_lookup) as shared:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [pool.submit(mg._resolve_version, sample_config) for _ in range(4)]
+                started.wait(5)
+                release.set()
+                results = [f.result() for f in futures]
+
+        assert results == [info] * 4
+        assert shared.call_count == 1
+
+
 class TestSaveManifest:
     """Tests for save_manifest method."""
     
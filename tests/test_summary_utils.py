@@ -37,3 +37,13 @@ def test_format_webhook_body_discord_basic():
     body = su.format_webhook_body(payload, "discord")
     assert "Scoop Update Summary" in body.get("content", "")
     assert "Total: 1" in body.get("content", "")
+
+def test_format_webhook_body_lists_first_ten_updates_and_passes_others_through():
+    payload = {
+        "counts": {"total": 12, "successful": 12, "failed": 0, "updated": 12},
+        "results": [{"package": f"p{i}", "version": "1.0", "updated": True} for i in range(12)],
+    }
+    su = load_summary_utils()
+    text = su.format_webhook_body(payload, "slack")["text"]
+    assert text.splitlines()[-1] == "Updated: " + ", ".join(f"p{i} 1.0" for i in range(10))
+    assert su.format_webhook_body(payload, "teams") is payload
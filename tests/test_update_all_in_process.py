@@ -0,0 +1,143 @@
+import concurrent.futures
+import functools
+import importlib
+import importlib.util
+import multiprocessing
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def load_update_all_module():
+    root = Path(__file__).parent.parent / "scripts" / "update-all.py"
+    spec = importlib.util.spec_from_file_location("update_all", str(root))
+    mod = importlib.util.module_from_spec(spec)
+    # Registered first: the dataclasses in update-all resolve their module through sys.modules
+    sys.modules["update_all"] = mod
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+def write_script(path: Path, body: str) -> Path:
+    path.write_text("import json, sys, time\n\ndef main():\n" + body, encoding="utf-8")
+    return path
+
+
+def test_in_process_captures_structured_output(tmp_path):
+    mod = load_update_all_module()
+    script = write_script(tmp_path / "update-demo.py",
+                          '    print(json.dumps({"updated": True, "name": "demo", "version": "2.0"}))\n')
+
+    result = mod.run_update_script_in_process(script, timeout=10)
+
+    assert result.success is True
+    assert result.updated is True
+    assert '"version": "2.0"' in result.output
+    assert mod.get_manifest_version("demo") == "2.0"
+
+
+def test_in_process_restores_sys_streams(tmp_path):
+    mod = load_update_all_module()
+    script = write_script(tmp_path / "update-demo.py", '    print("hello")\n')
+    before = sys.stdout, sys.stderr
+
+    result = mod.run_update_script_in_process(script, timeout=10)
+
+    assert "hello" in result.output
+    assert (sys.stdout, sys.stderr) == before
+
+
+def test_in_process_maps_sys_exit_to_failure(tmp_path):
+    mod = load_update_all_module()
+    script = write_script(tmp_path / "update-broken.py",
+                          '    print("boom", file=sys.stderr)\n    sys.exit(1)\n')
+
+    result = mod.run_update_script_in_process(script, timeout=10)
+
+    assert result.success is False
+    assert "Exit code: 1" in result.output
+    assert "boom" in result.output
+
+
+def test_in_process_timeout(tmp_path):
+    mod = load_update_all_module()
+    script = write_script(tmp_path / "update-slow.py", '    time.sleep(5)\n')
+
+    result = mod.run_update_script_in_process(script, timeout=0.2)
+
+    assert result.success is False
+    assert "timed out" in result.output
+    assert result.abandoned is True
+    assert mod.abandoned_scripts_running() == ["update-slow.py"]
+
+
+def test_in_process_timeout_is_not_retried(tmp_path, monkeypatch):
+    """A second main() would race the abandoned one on the same manifest."""
+    mod = load_update_all_module()
+    monkeypatch.setattr(mod, "RUN_IN_PROCESS", True)
+    script = write_script(tmp_path / "update-stuck.py", '    time.sleep(5)\n')
+    calls = []
+    real = mod.run_update_script_in_process
+    monkeypatch.setattr(mod, "run_update_script_in_process", lambda p, t: calls.append(p) or real(p, t))
+
+    result = mod.run_update_script_with_retry(script, timeout=0.2, retries=2)
+
+    assert result.abandoned is True
+    assert len(calls) == 1
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork start method")
+def test_process_pool_runs_scripts_in_workers(tmp_path, monkeypatch):
+    mod = load_update_all_module()
+    monkeypatch.setattr(mod, "RUN_IN_PROCESS", True)
+    monkeypatch.setattr(mod, "USE_PROCESS_POOL", True)
+    # Forked workers inherit this test's module; spawned ones could not import "update_all"
+    pool = concurrent.futures.ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("fork"))
+    monkeypatch.setattr(mod, "_PROCESS_POOL", pool)
+    scripts = [
+        write_script(tmp_path / f"update-pool{i}.py",
+                     f'    print(json.dumps({{"updated": True, "name": "pool{i}", "version": "{i}.0"}}))\n')
+        for i in range(2)
+    ]
+
+    try:
+        results = mod.run_parallel(scripts, timeout=30, max_workers=2, circuit_threshold=0)
+    finally:
+        pool.shutdown(wait=True)
+
+    assert all(r.success and r.updated for r in results)
+    # Versions reported inside the workers still reach this process's cache
+    assert mod.get_manifest_version("pool1") == "1.0"
+
+
+def test_process_pool_spawned_workers_get_main_flags(tmp_path, monkeypatch):
+    """Spawned workers re-import update-all, so its flags must arrive through the initializer."""
+    # An importable name for update-all.py, so spawned workers can unpickle its functions
+    real = Path(__file__).parent.parent / "scripts" / "update-all.py"
+    (tmp_path / "update_all_spawned.py").write_text(
+        f"__file__ = {str(real)!r}\n"
+        "exec(compile(open(__file__, encoding='utf-8').read(), __file__, 'exec'))\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    mod = importlib.import_module("update_all_spawned")
+    monkeypatch.setattr(mod, "RUN_IN_PROCESS", True)
+    monkeypatch.setattr(mod, "USE_PROCESS_POOL", True)
+    monkeypatch.setattr(mod, "PREFER_STRUCTURED_OUTPUT", True)
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(mod.concurrent.futures, "ProcessPoolExecutor",
+                        functools.partial(concurrent.futures.ProcessPoolExecutor, mp_context=spawn))
+    # Plain text only: with structured output preferred it must not count as an update
+    script = write_script(tmp_path / "update-plain.py", '    print("Update completed successfully")\n')
+
+    try:
+        results = mod.run_parallel([script], timeout=60, max_workers=1, circuit_threshold=0)
+    finally:
+        if mod._PROCESS_POOL is not None:
+            mod._PROCESS_POOL.shutdown(wait=True)
+        monkeypatch.setattr(mod, "_PROCESS_POOL", None)
+        sys.modules.pop("update_all_spawned", None)
+
+    assert results[0].success is True
+    assert results[0].updated is False
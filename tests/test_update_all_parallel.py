@@ -0,0 +1,83 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+
+def load_update_all_module():
+    root = Path(__file__).parent.parent / "scripts" / "update-all.py"
+    spec = importlib.util.spec_from_file_location("update_all", str(root))
+    mod = importlib.util.module_from_spec(spec)
+    # Registered first: the dataclasses in update-all resolve their module through sys.modules
+    sys.modules["update_all"] = mod
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+def test_run_parallel_collects_subprocess_results(tmp_path):
+    mod = load_update_all_module()
+    ok = tmp_path / "update-ok.py"
+    ok.write_text('print(\'{"updated": true, "name": "ok", "version": "1.0"}\')\n', encoding="utf-8")
+    fail = tmp_path / "update-fail.py"
+    fail.write_text("import sys\nsys.exit('broken')\n", encoding="utf-8")
+    slow = tmp_path / "update-slow.py"
+    slow.write_text("import time\ntime.sleep(10)\n", encoding="utf-8")
+
+    results = mod.run_parallel([slow, ok, fail], timeout=2, max_workers=3, circuit_threshold=0)
+
+    assert [r.script_name for r in results] == ["update-fail.py", "update-ok.py", "update-slow.py"]
+    failed, updated, timed_out = results
+    assert updated.success and updated.updated
+    assert not failed.success and "broken" in failed.output
+    assert not timed_out.success and "timed out" in timed_out.output
+
+
+def test_output_keeps_tail_of_chatty_script(tmp_path, monkeypatch):
+    mod = load_update_all_module()
+    monkeypatch.setattr(mod, "OUTPUT_TAIL_LINES", 5)
+    chatty = tmp_path / "update-chatty.py"
+    chatty.write_text(
+        "for i in range(1000):\n"
+        "    print(f'line {i}')\n"
+        "print('{\"updated\": false, \"name\": \"chatty\", \"version\": \"3.0\"}')\n",
+        encoding="utf-8",
+    )
+
+    for result in (mod.run_update_script(chatty, timeout=30), mod.run_parallel([chatty], timeout=30, max_workers=1)[0]):
+        assert result.success and not result.updated
+        lines = result.output.splitlines()
+        assert len(lines) == 5
+        assert lines[0] == "line 996"
+
+
+def test_order_longest_first_puts_unknown_then_slowest_first(tmp_path, monkeypatch):
+    mod = load_update_all_module()
+    monkeypatch.setattr(mod, "DURATIONS_FILE", tmp_path / "durations.json")
+    paths = [Path(n) for n in ("update-a.py", "update-b.py", "update-c.py", "update-new.py")]
+
+    mod.save_script_durations([
+        mod.UpdateResult("update-a.py", True, "", 1.0),
+        mod.UpdateResult("update-b.py", True, "", 9.0),
+        mod.UpdateResult("update-c.py", False, "", 4.0),
+    ])
+    durations = mod.load_script_durations()
+
+    assert durations == {"update-a.py": 1.0, "update-b.py": 9.0, "update-c.py": 4.0}
+    assert [p.name for p in mod.order_longest_first(paths, durations)] == [
+        "update-new.py", "update-b.py", "update-c.py", "update-a.py"
+    ]
+
+
+def test_overlong_output_line_does_not_fail_the_script(tmp_path, monkeypatch):
+    mod = load_update_all_module()
+    monkeypatch.setattr(mod, "RUN_IN_PROCESS", False)
+    noisy = tmp_path / "update-noisy.py"
+    noisy.write_text(
+        "print('x' * (3 << 20))\n"
+        "print('{\"updated\": true, \"name\": \"noisy\", \"version\": \"2.0\"}')\n",
+        encoding="utf-8",
+    )
+
+    result = mod.run_parallel([noisy], timeout=30, max_workers=1)[0]
+
+    assert result.success and result.updated
+    assert "xxxx" not in result.output
@@ -1,9 +1,21 @@
 from io import BytesIO
+import json
 import zipfile
 
+import pytest
+
+import version_detector
 from version_detector import SoftwareVersionConfig, VersionDetector, get_version_info
 
 
+@pytest.fixture(autouse=True)
+def isolated_disk_caches(monkeypatch, tmp_path):
+    """Keep conditional-request caches out of the real scripts/.cache."""
+    monkeypatch.setattr(version_detector, "HASH_CACHE_DIR", tmp_path / "hashes")
+    monkeypatch.setattr(version_detector, "VERSION_CACHE_DIR", tmp_path / "versions")
+    monkeypatch.setattr(version_detector, "API_CACHE_DIR", tmp_path / "api")
+
+
 def test_guess_version_from_url_basic():
     vd = VersionDetector()
     assert vd.guess_version_from_url("https://example.com/app-1.2.3.exe") == "1.2.3"
@@ -139,6 +151,59 @@ def test_get_version_info_falls_back_to_direct_download(monkeypatch):
     }
 
 
+def test_get_version_info_reuses_shared_detector(monkeypatch):
+    config = SoftwareVersionConfig(
+        name="shared",
+        homepage="https://example.com/download",
+        version_patterns=[r"Version:\s*([\d.]+)"],
+        download_url_template="https://example.com/tool-$version.zip",
+        description="Test app",
+        license="MIT",
+    )
+    monkeypatch.setattr(version_detector, "_shared_detector", None)
+    seen = []
+
+    def fake_fetch(self, homepage, patterns):
+        seen.append(self)
+        return None
+
+    monkeypatch.setattr(VersionDetector, "fetch_latest_version", fake_fetch)
+
+    get_version_info(config)
+    get_version_info(config)
+    own = VersionDetector()
+    get_version_info(config, own)
+
+    assert seen[0] is seen[1] is version_detector.get_shared_detector()
+    assert seen[2] is own
+
+
+def test_get_version_info_skips_hash_for_current_version(monkeypatch):
+    config = SoftwareVersionConfig(
+        name="current",
+        homepage="https://example.com/download",
+        version_patterns=[r"Version:\s*([\d.]+)"],
+        download_url_template="https://example.com/tool-$version.zip",
+        description="Test app",
+        license="MIT",
+    )
+    monkeypatch.setattr(
+        VersionDetector,
+        "fetch_latest_version",
+        lambda self, homepage, patterns: version_detector.VersionResult(version="1.2.3"),
+    )
+    hashed = []
+    monkeypatch.setattr(VersionDetector, "calculate_hash", lambda self, url: hashed.append(url) or "abc123")
+
+    assert get_version_info(config, current_version="1.2.3") == {
+        "version": "1.2.3",
+        "download_url": "https://example.com/tool-1.2.3.zip",
+        "hash": None,
+    }
+    assert hashed == []
+    assert get_version_info(config, current_version="1.2.2")["hash"] == "abc123"
+
+
 def test_get_version_info_skips_direct_download_fallback_for_templates(monkeypatch):
     config = SoftwareVersionConfig(
         name="templated-download",
@@ -152,3 +217,199 @@ def test_get_version_info_skips_direct_download_fallback_for_templates(monkeypat
     monkeypatch.setattr(VersionDetector, "fetch_latest_version", lambda self, homepage, patterns: None)
 
     assert get_version_info(config) is None
+
+
+def test_get_session_passes_cache_options(monkeypatch):
+    import requests
+    import version_detector
+
+    captured = {}
+
+    class FakeRequestsCache:
+        @staticmethod
+        def CachedSession(**kwargs):
+            captured.update(kwargs)
+            return requests.Session()
+
+    monkeypatch.setattr(version_detector, "requests_cache", FakeRequestsCache)
+    version_detector.get_session(use_cache=True, cache_expire_seconds=600, cache_name=".http", cache_control=True)
+    assert captured == {
+        "cache_name": ".http",
+        "backend": "sqlite",
+        "expire_after": 600,
+        "cache_control": True,
+        "allowable_methods": ("GET", "HEAD"),
+    }
+
+
+def test_sha256_of_response_decodes_raw_stream_and_falls_back_to_chunks():
+    import gzip
+    import hashlib
+    from urllib3.response import HTTPResponse
+    from version_detector import sha256_of_response
+
+    payload = b"scoop" * 300000
+    expected = hashlib.sha256(payload).hexdigest()
+
+    class RawResp:
+        raw = HTTPResponse(body=BytesIO(gzip.compress(payload)), headers={"Content-Encoding": "gzip"},
+                           preload_content=False, decode_content=False)
+
+    class ChunkedResp:
+        raw = None
+
+        def iter_content(self, chunk_size=8192):
+            for i in range(0, len(payload), chunk_size):
+                yield payload[i:i + chunk_size]
+
+    assert sha256_of_response(RawResp()) == expected
+    assert sha256_of_response(ChunkedResp()) == expected
+
+
+def test_download_to_tempfile_decodes_raw_stream():
+    import gzip
+    from urllib3.response import HTTPResponse
+
+    payload = b"scoop" * 300000
+
+    class RawResp:
+        raw = HTTPResponse(body=BytesIO(gzip.compress(payload)), headers={"Content-Encoding": "gzip"},
+                           preload_content=False, decode_content=False)
+
+    path = version_detector._download_to_tempfile(RawResp(), ".zip")
+    try:
+        assert path.suffix == ".zip"
+        assert path.read_bytes() == payload
+    finally:
+        path.unlink()
+
+
+def test_calculate_hash_reuses_cached_hash_on_304(monkeypatch, tmp_path):
+    import hashlib
+
+    vd = VersionDetector()
+    vd._probe_url = lambda url: {}  # type: ignore  # HEAD gave no validators
+    sent = []
+
+    class FakeResp:
+        raw = None
+
+        def __init__(self, status_code, body=b"", headers=None):
+            self.status_code = status_code
+            self.body = body
+            self.headers = headers or {}
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size=8192):
+            yield self.body
+
+        def close(self):
+            return None
+
+    responses = [FakeResp(200, b"archive", {"ETag": '"v1"'}), FakeResp(304)]
+    monkeypatch.setattr(vd.session, "get", lambda url, timeout, stream, headers: sent.append(headers) or responses.pop(0))
+
+    expected = hashlib.sha256(b"archive").hexdigest()
+    assert vd.calculate_hash("https://example.com/app.7z#/dl.7z") == expected
+    assert vd.calculate_hash("https://example.com/app.7z") == expected
+    assert sent == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_calculate_hash_skips_download_when_head_etag_matches(monkeypatch):
+    import hashlib
+
+    vd = VersionDetector()
+    head = {"ETag": '"v1"', "Content-Length": "7"}
+    vd._probe_url = lambda url: head  # type: ignore
+    gets = []
+
+    class FakeResp:
+        raw = None
+        status_code = 200
+        headers = {"ETag": '"v1"', "Content-Length": "7"}
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size=8192):
+            yield b"archive"
+
+    monkeypatch.setattr(vd.session, "get", lambda url, **kwargs: gets.append(url) or FakeResp())
+
+    expected = hashlib.sha256(b"archive").hexdigest()
+    assert vd.calculate_hash("https://example.com/app.7z") == expected
+    assert vd.calculate_hash("https://example.com/app.7z") == expected
+    assert len(gets) == 1
+
+    head["ETag"] = '"v2"'
+    assert vd.calculate_hash("https://example.com/app.7z") == expected
+    assert len(gets) == 2
+
+
+def test_fetch_json_returns_stored_body_on_304(monkeypatch):
+    vd = VersionDetector()
+    sent = []
+
+    class FakeResp:
+        def __init__(self, status_code, body=None, headers=None):
+            self.status_code = status_code
+            self.body = body
+            self.headers = headers or {}
+
+        def raise_for_status(self):
+            return None
+
+        @property
+        def content(self):
+            return json.dumps(self.body).encode("utf-8")
+
+    responses = [FakeResp(200, {"tag_name": "1.0"}, {"ETag": 'W/"r1"'}), FakeResp(304)]
+    monkeypatch.setattr(vd.session, "get", lambda url, timeout, headers: sent.append(headers) or responses.pop(0))
+
+    url = "https://api.github.com/repos/o/r/releases/latest"
+    assert vd.fetch_json(url) == {"tag_name": "1.0"}
+    assert vd.fetch_json(url) == {"tag_name": "1.0"}
+    assert sent == [{}, {"If-None-Match": 'W/"r1"'}]
+
+
+def test_disk_cache_keeps_most_recent_entries(monkeypatch, tmp_path):
+    monkeypatch.setattr(version_detector, "DISK_CACHE_MAX_ENTRIES", 2)
+    for key in ("a", "b", "c"):
+        version_detector._save_disk_cache(tmp_path, key, {"sha256": key})
+
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert version_detector._load_disk_cache(tmp_path, "c") == {"key": "c", "sha256": "c"}
+
+
+def test_fetch_latest_version_revalidates_across_detectors(monkeypatch):
+    sent = []
+
+    class FakeResp:
+        def __init__(self, status_code, text="", headers=None):
+            self.status_code = status_code
+            self.text = text
+            self.headers = headers or {}
+
+        def raise_for_status(self):
+            return None
+
+    responses = [
+        FakeResp(200, '"tag_name": "v1.4.0"', {"ETag": '"rel"'}),
+        FakeResp(304),
+        FakeResp(200, '"tag_name": "v1.4.0"'),
+    ]
+
+    def fake_get(self, url, timeout, headers):
+        sent.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(version_detector.requests.Session, "get", fake_get)
+    patterns = [r'tag_name":\s*"v?([0-9.]+)"']
+    url = "https://api.github.com/repos/o/r/releases"
+
+    assert VersionDetector().fetch_latest_version(url, patterns).version == "1.4.0"
+    assert VersionDetector().fetch_latest_version(url, patterns).version == "1.4.0"
+    VersionDetector().fetch_latest_version(url, [r'v([0-9.]+)'])
+    assert sent == [{}, {"If-None-Match": '"rel"'}, {}]